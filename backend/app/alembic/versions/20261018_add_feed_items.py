@@ -0,0 +1,51 @@
+"""Add materialized feed items and fan-out exemption flag
+
+Revision ID: 20261018_feed_items
+Revises: feaaa16caba8
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_feed_items'
+down_revision = 'feaaa16caba8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Flag accounts whose posts are read at query time instead of fanned out
+    op.add_column('user', sa.Column('fanout_exempt', sa.Boolean(), nullable=False, server_default='false'))
+    op.create_index(op.f('ix_user_fanout_exempt'), 'user', ['fanout_exempt'], unique=False)
+
+    # Create FeedItem table
+    op.create_table(
+        'feeditem',
+        sa.Column('owner_id', postgresql.UUID(), nullable=False),
+        sa.Column('post_id', postgresql.UUID(), nullable=False),
+        sa.Column('author_id', postgresql.UUID(), nullable=False),
+        sa.Column('is_public', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['post_id'], ['workoutpost.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['author_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('owner_id', 'post_id')
+    )
+    op.create_index('ix_feeditem_owner_id_created_at', 'feeditem', ['owner_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_feeditem_post_id'), 'feeditem', ['post_id'], unique=False)
+    op.create_index(op.f('ix_feeditem_author_id'), 'feeditem', ['author_id'], unique=False)
+
+    # Existing posts are fanned out with `python -m app.backfill_feed`
+
+
+def downgrade():
+    op.drop_index(op.f('ix_feeditem_author_id'), table_name='feeditem')
+    op.drop_index(op.f('ix_feeditem_post_id'), table_name='feeditem')
+    op.drop_index('ix_feeditem_owner_id_created_at', table_name='feeditem')
+    op.drop_table('feeditem')
+    op.drop_index(op.f('ix_user_fanout_exempt'), table_name='user')
+    op.drop_column('user', 'fanout_exempt')
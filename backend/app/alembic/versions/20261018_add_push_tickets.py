@@ -0,0 +1,37 @@
+"""Add push tickets for Expo receipt checks
+
+Revision ID: 20261018_push_tickets
+Revises: 20261018_workout_stats
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_push_tickets'
+down_revision = '20261018_workout_stats'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'push_tickets',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('expo_token', sa.String(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('checked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('receipt_status', sa.String(), nullable=True),
+        sa.Column('receipt_error', sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_push_tickets_expo_token'), 'push_tickets', ['expo_token'], unique=False)
+    op.create_index(op.f('ix_push_tickets_created_at'), 'push_tickets', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_push_tickets_created_at'), table_name='push_tickets')
+    op.drop_index(op.f('ix_push_tickets_expo_token'), table_name='push_tickets')
+    op.drop_table('push_tickets')
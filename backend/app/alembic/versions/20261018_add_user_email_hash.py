@@ -0,0 +1,33 @@
+"""Add a hashed email to user for contact imports
+
+Revision ID: 20261018_user_email_hash
+Revises: 20261018_user_search
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_user_email_hash'
+down_revision = '20261018_user_search'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('email_hash', sa.String(length=64), nullable=True))
+    # Same as app.models.user.hash_email
+    op.execute(
+        """
+        UPDATE "user"
+        SET email_hash = encode(sha256(convert_to(lower(trim(email)), 'UTF8')), 'hex')
+        """
+    )
+    op.create_index(op.f('ix_user_email_hash'), 'user', ['email_hash'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_user_email_hash'), table_name='user')
+    op.drop_column('user', 'email_hash')
@@ -0,0 +1,39 @@
+"""Add denormalized follower and following counters to user
+
+Revision ID: 20261018_follow_counters
+Revises: 20261018_feed_items
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_follow_counters'
+down_revision = '20261018_feed_items'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('follower_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('user', sa.Column('following_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Populate the counters from the existing follow graph
+    op.execute(
+        """
+        UPDATE "user" SET
+            follower_count = (
+                SELECT count(*) FROM userfollow WHERE userfollow.followed_id = "user".id
+            ),
+            following_count = (
+                SELECT count(*) FROM userfollow WHERE userfollow.follower_id = "user".id
+            )
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('user', 'following_count')
+    op.drop_column('user', 'follower_count')
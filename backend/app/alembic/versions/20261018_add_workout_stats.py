@@ -0,0 +1,51 @@
+"""Add per-user workout stats rollup
+
+Revision ID: 20261018_workout_stats
+Revises: 20261018_pb_unique_key
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_workout_stats'
+down_revision = '20261018_pb_unique_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'workoutstats',
+        sa.Column('user_id', postgresql.UUID(), nullable=False),
+        sa.Column('total_workouts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('completed_workouts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_duration_minutes', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('timed_workouts', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Populate the rollup from the existing workouts
+    op.execute(
+        """
+        INSERT INTO workoutstats (
+            user_id, total_workouts, completed_workouts, total_duration_minutes, timed_workouts
+        )
+        SELECT
+            user_id,
+            count(*),
+            count(*) FILTER (WHERE is_completed),
+            coalesce(sum(duration_minutes), 0),
+            count(duration_minutes)
+        FROM workout
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('workoutstats')
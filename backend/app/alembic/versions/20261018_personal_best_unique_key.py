@@ -0,0 +1,56 @@
+"""Add a unique (user, exercise, metric) key to personal bests
+
+Revision ID: 20261018_pb_unique_key
+Revises: 20261018_follow_counters
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_pb_unique_key'
+down_revision = '20261018_follow_counters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Older deployments got this table from create_all at startup, not from a migration
+    if not sa.inspect(op.get_bind()).has_table('personalbest'):
+        op.create_table(
+            'personalbest',
+            sa.Column('id', postgresql.UUID(), nullable=False),
+            sa.Column('user_id', postgresql.UUID(), nullable=False),
+            sa.Column('exercise_name', sa.String(), nullable=False),
+            sa.Column('metric_type', sa.String(), nullable=False),
+            sa.Column('metric_value', sa.Float(), nullable=False),
+            sa.Column('date_achieved', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+    else:
+        # Keep only the best row per key before enforcing uniqueness
+        op.execute(
+            """
+            DELETE FROM personalbest p
+            USING personalbest q
+            WHERE p.user_id = q.user_id
+              AND p.exercise_name = q.exercise_name
+              AND p.metric_type = q.metric_type
+              AND (p.metric_value < q.metric_value
+                   OR (p.metric_value = q.metric_value AND p.id < q.id))
+            """
+        )
+
+    op.create_unique_constraint(
+        'uq_personalbest_user_exercise_metric',
+        'personalbest',
+        ['user_id', 'exercise_name', 'metric_type'],
+    )
+
+
+def downgrade():
+    op.drop_constraint('uq_personalbest_user_exercise_metric', 'personalbest', type_='unique')
@@ -0,0 +1,49 @@
+"""Add a partial index on the due time of unsent reminders
+
+Revision ID: 20261018_reminder_due_index
+Revises: 20261018_push_tickets
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_reminder_due_index'
+down_revision = '20261018_push_tickets'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Older deployments got this table from create_all at startup, not from a migration
+    if not sa.inspect(op.get_bind()).has_table('custom_reminders'):
+        op.create_table(
+            'custom_reminders',
+            sa.Column('id', postgresql.UUID(), nullable=False),
+            sa.Column('user_id', postgresql.UUID(), nullable=False),
+            sa.Column('expo_token', sa.String(), nullable=False),
+            sa.Column('remind_time', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('message', sa.String(length=255), nullable=False),
+            sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_custom_reminders_user_id'), 'custom_reminders', ['user_id'], unique=False)
+
+    op.create_index(
+        'ix_custom_reminders_unsent_remind_time',
+        'custom_reminders',
+        ['remind_time'],
+        unique=False,
+        postgresql_where=sa.text('sent_at IS NULL'),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_custom_reminders_unsent_remind_time', table_name='custom_reminders')
+    # The custom_reminders table is left in place: upgrade() only creates it
+    # when create_all hadn't, and there is no telling the two cases apart here
+    # without dropping reminders that existed before this revision.
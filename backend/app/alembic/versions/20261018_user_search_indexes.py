@@ -0,0 +1,40 @@
+"""Add trigram and prefix indexes for user search
+
+Revision ID: 20261018_user_search
+Revises: 20261018_reminder_due_index
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261018_user_search'
+down_revision = '20261018_reminder_due_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Substring matches (lower(col) LIKE '%q%') and similarity ranking
+    op.execute(
+        'CREATE INDEX ix_user_full_name_trgm ON "user" USING gin (lower(full_name) gin_trgm_ops)'
+    )
+    op.execute(
+        'CREATE INDEX ix_user_email_trgm ON "user" USING gin (lower(email) gin_trgm_ops)'
+    )
+    # Prefix matches (lower(col) LIKE 'q%') for queries too short for trigrams
+    op.execute(
+        'CREATE INDEX ix_user_full_name_prefix ON "user" (lower(full_name) text_pattern_ops)'
+    )
+    op.execute(
+        'CREATE INDEX ix_user_email_prefix ON "user" (lower(email) text_pattern_ops)'
+    )
+
+
+def downgrade():
+    op.drop_index('ix_user_email_prefix', table_name='user')
+    op.drop_index('ix_user_full_name_prefix', table_name='user')
+    op.drop_index('ix_user_email_trgm', table_name='user')
+    op.drop_index('ix_user_full_name_trgm', table_name='user')
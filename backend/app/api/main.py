@@ -1,16 +1,51 @@
 from fastapi import APIRouter
+from fastapi.routing import APIRoute
 
 from app.api.routes import items, login, private, social, users, utils, workouts, notifications
 from app.core.config import settings
 from app.api.routes import p_bests
+from app.api.routes import social_async, workouts_async
+
+
+def without_routes_of(router: APIRouter, replacement: APIRouter) -> APIRouter:
+    """
+    Copy of `router` without the routes `replacement` serves (same path and
+    method), so each path has one handler and one operation ID.
+    """
+    served = {
+        (route.path, method)
+        for route in replacement.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    trimmed = APIRouter()
+    trimmed.routes = [
+        route
+        for route in router.routes
+        if not (
+            isinstance(route, APIRoute)
+            and any((route.path, method) in served for method in route.methods)
+        )
+    ]
+    return trimmed
+
+
+social_router = social.router
+workouts_router = workouts.router
 
 api_router = APIRouter()
+if settings.ASYNC_DB_ENABLED:
+    # The async handlers replace their sync twins
+    api_router.include_router(social_async.router)
+    api_router.include_router(workouts_async.router)
+    social_router = without_routes_of(social.router, social_async.router)
+    workouts_router = without_routes_of(workouts.router, workouts_async.router)
 api_router.include_router(login.router)
 api_router.include_router(users.router)
 api_router.include_router(utils.router)
 api_router.include_router(items.router)
-api_router.include_router(social.router)
-api_router.include_router(workouts.router)
+api_router.include_router(social_router)
+api_router.include_router(workouts_router)
 api_router.include_router(p_bests.router)
 api_router.include_router(notifications.router, prefix="/notifications")
 
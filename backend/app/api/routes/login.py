@@ -145,6 +145,7 @@ def reset_password(session: SessionDep, body: NewPassword) -> Message:
     user.hashed_password = hashed_password
     session.add(user)
     session.commit()
+    crud.invalidate_cached_user(user.id)
     return Message(message="Password updated successfully")
 
 
@@ -5,11 +5,21 @@ from fastapi import APIRouter, HTTPException, status
 from sqlmodel import Session, select
 
 from app import crud
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import CurrentUser, CursorDep, SessionDep
+from app.core.config import settings
+from app.crud.pagination import next_cursor
 from app.models.social import (
+    BulkFollowRequest,
+    BulkFollowResult,
+    BulkFollowResultsPublic,
+    BulkUnfollowRequest,
+    FollowSuggestion,
+    FollowSuggestionsPublic,
     UserFollow,
     UserSearchResult,
     UserSearchResultsPublic,
+    UserTypeaheadPublic,
+    UserTypeaheadResult,
     WorkoutPost,
     WorkoutPostCreate,
     WorkoutPostPublic,
@@ -17,13 +27,97 @@ from app.models.social import (
     WorkoutPostUpdate,
 )
 from app.models.token import Message
-from app.models.user import User, UserPublic, UserPublicExtended, UsersPublic
+from app.models.user import User, UserPublicExtended, UsersPublic
 
 router = APIRouter(prefix="/social", tags=["social"])
 
 
 # User Follow Endpoints
 
+@router.post("/follow/bulk", response_model=BulkFollowResultsPublic)
+def follow_users_bulk(
+    body: BulkFollowRequest,
+    session: SessionDep,
+    current_user: CurrentUser
+) -> Any:
+    """
+    Follow many users at once, e.g. suggested accounts during onboarding or
+    matches from a contact import.
+
+    Users can be given by id and/or by hashed email: the hex SHA-256 of the
+    trimmed, lowercased address, so contacts' addresses aren't uploaded.
+    All follows are created in one transaction.
+
+    Returns one result per requested id and hash, with a status of
+    followed, already_following, not_found or self, and the number of
+    follows created.
+
+    Raises:
+    - 400: If more than BULK_FOLLOW_MAX_ITEMS (default 500) ids and hashes are sent
+    """
+    if len(body.user_ids) + len(body.email_hashes) > settings.BULK_FOLLOW_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_FOLLOW_MAX_ITEMS} users can be followed at once",
+        )
+
+    ids_by_hash = crud.get_user_ids_by_email_hash(
+        session=session, email_hashes=body.email_hashes
+    )
+    statuses = crud.follow_users(
+        session=session,
+        follower_id=current_user.id,
+        followed_ids=[*body.user_ids, *ids_by_hash.values()],
+    )
+
+    results = [
+        BulkFollowResult(user_id=user_id, status=statuses[user_id])
+        for user_id in dict.fromkeys(body.user_ids)
+    ]
+    for email_hash in dict.fromkeys(h.lower() for h in body.email_hashes):
+        user_id = ids_by_hash.get(email_hash)
+        results.append(
+            BulkFollowResult(
+                user_id=user_id,
+                email_hash=email_hash,
+                status=statuses[user_id] if user_id else "not_found",
+            )
+        )
+    count = sum(1 for status_ in statuses.values() if status_ == "followed")
+    return BulkFollowResultsPublic(data=results, count=count)
+
+
+@router.post("/unfollow/bulk", response_model=BulkFollowResultsPublic)
+def unfollow_users_bulk(
+    body: BulkUnfollowRequest,
+    session: SessionDep,
+    current_user: CurrentUser
+) -> Any:
+    """
+    Unfollow many users at once, in one transaction.
+
+    Returns one result per requested id, with a status of unfollowed or
+    not_following, and the number of follows removed.
+
+    Raises:
+    - 400: If more than BULK_FOLLOW_MAX_ITEMS (default 500) ids are sent
+    """
+    if len(body.user_ids) > settings.BULK_FOLLOW_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_FOLLOW_MAX_ITEMS} users can be unfollowed at once",
+        )
+    statuses = crud.unfollow_users(
+        session=session, follower_id=current_user.id, followed_ids=body.user_ids
+    )
+    results = [
+        BulkFollowResult(user_id=user_id, status=status_)
+        for user_id, status_ in statuses.items()
+    ]
+    count = sum(1 for status_ in statuses.values() if status_ == "unfollowed")
+    return BulkFollowResultsPublic(data=results, count=count)
+
+
 @router.post("/follow/{user_id}", response_model=Message)
 def follow_user(
     user_id: uuid.UUID,
@@ -121,38 +215,16 @@ def get_followers(
     """
     Get users who follow the current user.
     """
-    followers, count = crud.get_followers(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+    followers, count = crud.get_followers_with_stats(
+        session=session,
+        user_id=current_user.id,
+        viewer_id=current_user.id,
+        skip=skip,
+        limit=limit,
     )
     
-    # Convert to UserSearchResult with proper is_following status and social stats
-    followers_with_status = []
-    for user in followers:
-        # Get follower and following counts
-        follower_count = crud.get_follower_count(session=session, user_id=user.id)
-        following_count = crud.get_following_count(session=session, user_id=user.id)
-        
-        # Check if current user is following this follower back
-        is_following_back = crud.is_following(
-            session=session, follower_id=current_user.id, followed_id=user.id
-        )
-        
-        # Create UserSearchResult with all required fields
-        user_result = UserSearchResult(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            is_active=user.is_active,
-            is_superuser=user.is_superuser,
-            gender=user.gender,
-            date_of_birth=user.date_of_birth,
-            weight=user.weight,
-            height=user.height,
-            follower_count=follower_count,
-            following_count=following_count,
-            is_following=is_following_back  # True if current user follows this follower back
-        )
-        followers_with_status.append(user_result)
+    # is_following is True if current user follows this follower back
+    followers_with_status = [UserSearchResult(**user) for user in followers]
     
     return UserSearchResultsPublic(data=followers_with_status, count=count)
 
@@ -164,33 +236,14 @@ def get_following(
     """
     Get users that the current user follows.
     """
-    following, count = crud.get_following(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+    following, count = crud.get_following_with_stats(
+        session=session,
+        user_id=current_user.id,
+        viewer_id=current_user.id,
+        skip=skip,
+        limit=limit,
     )
-    
-    # Convert to UserSearchResult with is_following always true and social stats
-    following_with_status = []
-    for user in following:
-        # Get follower and following counts
-        follower_count = crud.get_follower_count(session=session, user_id=user.id)
-        following_count = crud.get_following_count(session=session, user_id=user.id)
-        
-        # Create UserSearchResult with all required fields
-        user_result = UserSearchResult(
-            id=user.id,
-            email=user.email,
-            full_name=user.full_name,
-            is_active=user.is_active,
-            is_superuser=user.is_superuser,
-            gender=user.gender,
-            date_of_birth=user.date_of_birth,
-            weight=user.weight,
-            height=user.height,
-            follower_count=follower_count,
-            following_count=following_count,
-            is_following=True  # Always true for users in following list
-        )
-        following_with_status.append(user_result)
+    following_with_status = [UserSearchResult(**user) for user in following]
     
     return UserSearchResultsPublic(data=following_with_status, count=count)
 
@@ -245,28 +298,16 @@ def get_user_profile(
 ) -> Any:
     """
     Get a user's profile with follower and following counts.
+    Served from the response cache, invalidated when the user or their
+    follows change.
     """
-    # Check if the user exists
-    user = crud.get_user_by_id(session=session, user_id=user_id)
-    if not user:
+    profile = crud.get_user_profile_cached(session=session, user_id=user_id)
+    if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    
-    # Get follower and following counts
-    follower_count = crud.get_follower_count(session=session, user_id=user_id)
-    following_count = crud.get_following_count(session=session, user_id=user_id)
-    
-    # Create extended user profile
-    user_data = UserPublic.model_validate(user).model_dump()
-    user_extended = UserPublicExtended(
-        **user_data,
-        follower_count=follower_count,
-        following_count=following_count
-    )
-    
-    return user_extended
+    return profile
 
 
 @router.get("/is-following/{user_id}", response_model=dict)
@@ -310,6 +351,64 @@ def check_if_following(
     return {"is_following": is_following}
 
 
+@router.get("/suggestions", response_model=FollowSuggestionsPublic)
+def get_follow_suggestions(
+    session: SessionDep,
+    current_user: CurrentUser,
+    limit: int = 20
+) -> Any:
+    """
+    Suggest users to follow: people followed by the users the current user
+    follows, ranked by how many of them follow each one.
+
+    Parameters:
+    - **limit**: Optional. Maximum number of suggestions (default: 20, max: 50)
+
+    Returns users not yet followed by the current user, with their mutual_count.
+    """
+    suggestions = crud.get_follow_suggestions(
+        session=session,
+        user_id=current_user.id,
+        limit=max(1, min(limit, settings.FOLLOW_SUGGESTIONS_CACHE_SIZE)),
+    )
+    return FollowSuggestionsPublic(data=[FollowSuggestion(**s) for s in suggestions])
+
+
+@router.get("/users/typeahead", response_model=UserTypeaheadPublic)
+def typeahead_users(
+    q: str,
+    session: SessionDep,
+    current_user: CurrentUser,
+    limit: int = 8
+) -> Any:
+    """
+    Suggest users as the search box is typed into.
+
+    Matches names and emails starting with the query and returns only id and
+    full_name, without social stats, so it is cheap enough to call on every
+    keystroke. Use /users/search for the full results.
+
+    Parameters:
+    - **q**: Required. The prefix typed so far
+    - **limit**: Optional. Maximum number of suggestions (default: 8, max: 20)
+
+    Raises:
+    - 400: If the query is empty
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must be at least 1 character long",
+        )
+    suggestions = crud.typeahead_users(
+        session=session,
+        query=q,
+        viewer_id=current_user.id,
+        limit=max(1, min(limit, 20)),
+    )
+    return UserTypeaheadPublic(data=[UserTypeaheadResult(**s) for s in suggestions])
+
+
 @router.get("/users/search", response_model=UserSearchResultsPublic)
 def search_users(
     q: str,
@@ -322,7 +421,8 @@ def search_users(
     Search for users by name or email to enable user discovery functionality.
     
     This endpoint allows users to search for other users by full_name or email
-    with case-insensitive partial matching. Results include social stats and
+    with case-insensitive partial matching (prefix matching for queries under
+    3 characters), best matches first. Results include social stats and
     following status for each user.
     
     Parameters:
@@ -331,7 +431,8 @@ def search_users(
     - **limit**: Optional. Maximum number of records to return (default: 20, max: 100)
     
     Returns:
-    - A paginated list of users matching the search criteria
+    - A paginated list of users matching the search criteria, with the
+      number of matches capped at 1000
     - Each user includes follower/following counts and is_following status
     - The current user is excluded from results
     
@@ -424,8 +525,10 @@ def create_workout_post(
 def get_my_workout_posts(
     session: SessionDep,
     current_user: CurrentUser,
+    cursor: CursorDep,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    include_count: bool = True
 ) -> Any:
     """
     Get the current user's workout posts.
@@ -433,13 +536,20 @@ def get_my_workout_posts(
     This endpoint retrieves all workout posts created by the current user.
     
     Parameters:
+    - **cursor**: Optional. The next_cursor of the previous page (preferred over skip)
     - **skip**: Number of records to skip for pagination
     - **limit**: Maximum number of records to return
+    - **include_count**: Optional. Set to false to skip computing the total count
     
-    Returns a list of workout posts and the total count.
+    Returns a list of workout posts, the total count and the cursor of the next page.
     """
     posts, count = crud.get_user_workout_posts(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
     )
     
     # Add user's full name and mutual follow status to each post
@@ -450,60 +560,59 @@ def get_my_workout_posts(
         post_dict["is_mutual_follow"] = True  # User's own posts
         post_data.append(WorkoutPostPublic(**post_dict))
     
-    return WorkoutPostsPublic(data=post_data, count=count)
+    return WorkoutPostsPublic(
+        data=post_data, count=count, next_cursor=next_cursor(posts, limit)
+    )
 
 
 @router.get("/user/{user_id}/workout-posts", response_model=WorkoutPostsPublic)
 def get_user_workout_posts(
-    user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    user_id: uuid.UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100
 ) -> Any:
     """
     Get a specific user's workout posts with privacy filtering.
     Only returns posts that the current user is allowed to see.
     """
-    # Check if the user exists
-    user = crud.get_user_by_id(session=session, user_id=user_id)
-    if not user:
+    page = crud.get_user_workout_posts_page_cached(
+        session=session,
+        user_id=user_id,
+        viewer_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+    )
+    if page is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
-    
-    posts, count = crud.get_user_workout_posts(
-        session=session, user_id=user_id, skip=skip, limit=limit
-    )
-    
-    # Filter posts based on privacy settings
-    is_own_profile = user_id == current_user.id
-    is_mutual = crud.is_mutual_follow(session=session, user1_id=current_user.id, user2_id=user_id)
-    
-    filtered_posts = []
-    for post in posts:
-        # Apply privacy filtering
-        if is_own_profile or post.is_public or is_mutual:
-            post_dict = WorkoutPostPublic.model_validate(post).model_dump()
-            post_dict["user_full_name"] = user.full_name
-            post_dict["is_mutual_follow"] = is_own_profile or is_mutual
-            filtered_posts.append(WorkoutPostPublic(**post_dict))
-    
-    return WorkoutPostsPublic(data=filtered_posts, count=len(filtered_posts))
+    return page
 
 
 @router.get("/feed", response_model=WorkoutPostsPublic)
 def get_feed(
     session: SessionDep,
     current_user: CurrentUser,
+    cursor: CursorDep,
     skip: int = 0,
     limit: int = 100,
-    feed_type: str = "personal"
+    feed_type: str = "personal",
+    include_count: bool = True
 ) -> Any:
     """
     Get workout posts based on feed type with privacy filtering.
     
     Parameters:
     - **feed_type**: "personal" (default), "public", or "combined"
+    - **cursor**: Optional. The next_cursor of the previous page (preferred over skip)
     - **skip**: Number of records to skip for pagination
     - **limit**: Maximum number of records to return
+    - **include_count**: Optional. Set to false to skip computing the total count
     
     Feed Types:
     - **personal**: Posts from users you follow (respecting privacy)
@@ -519,98 +628,78 @@ def get_feed(
         )
     
     posts, count = crud.get_feed_posts(
-        session=session, user_id=current_user.id, skip=skip, limit=limit, feed_type=feed_type
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        feed_type=feed_type,
+        cursor=cursor,
+        include_count=include_count,
     )
     
     # Add user's full name and mutual follow status to each post
-    post_data = []
-    for post in posts:
-        post_dict = WorkoutPostPublic.model_validate(post).model_dump()
-        
-        # Get the user who created the post
-        user = crud.get_user_by_id(session=session, user_id=post.user_id)
-        if user:
-            post_dict["user_full_name"] = user.full_name
-        
-        # Add mutual follow status for privacy logic
-        if post.user_id != current_user.id:
-            post_dict["is_mutual_follow"] = crud.is_mutual_follow(
-                session=session, user1_id=current_user.id, user2_id=post.user_id
-            )
-        else:
-            post_dict["is_mutual_follow"] = True  # User's own posts
-        
-        post_data.append(WorkoutPostPublic(**post_dict))
+    post_data = crud.enrich_workout_posts(
+        session=session, posts=posts, viewer_id=current_user.id
+    )
     
-    return WorkoutPostsPublic(data=post_data, count=count)
+    return WorkoutPostsPublic(
+        data=post_data, count=count, next_cursor=next_cursor(posts, limit)
+    )
 
 
 @router.get("/feed/public", response_model=WorkoutPostsPublic)
 def get_public_feed(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: bool = True
 ) -> Any:
     """
     Get all public workout posts from all users (discovery feed).
+    Pages are served from the response cache, invalidated when a public
+    post is created, changed or deleted.
     """
-    posts, count = crud.get_public_feed_posts(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+    return crud.get_public_feed_page_cached(
+        session=session,
+        viewer_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
     )
-    
-    # Add user's full name to each post
-    post_data = []
-    for post in posts:
-        post_dict = WorkoutPostPublic.model_validate(post).model_dump()
-        
-        # Get the user who created the post
-        user = crud.get_user_by_id(session=session, user_id=post.user_id)
-        if user:
-            post_dict["user_full_name"] = user.full_name
-        
-        # Add mutual follow status
-        if post.user_id != current_user.id:
-            post_dict["is_mutual_follow"] = crud.is_mutual_follow(
-                session=session, user1_id=current_user.id, user2_id=post.user_id
-            )
-        else:
-            post_dict["is_mutual_follow"] = True
-        
-        post_data.append(WorkoutPostPublic(**post_dict))
-    
-    return WorkoutPostsPublic(data=post_data, count=count)
 
 
 @router.get("/feed/personal", response_model=WorkoutPostsPublic)
 def get_personal_feed(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: bool = True
 ) -> Any:
     """
     Get workout posts from users you follow (respecting privacy settings).
     """
     posts, count = crud.get_personal_feed_posts(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
     )
     
     # Add user's full name and mutual follow status to each post
-    post_data = []
-    for post in posts:
-        post_dict = WorkoutPostPublic.model_validate(post).model_dump()
-        
-        # Get the user who created the post
-        user = crud.get_user_by_id(session=session, user_id=post.user_id)
-        if user:
-            post_dict["user_full_name"] = user.full_name
-        
-        # Add mutual follow status
-        if post.user_id != current_user.id:
-            post_dict["is_mutual_follow"] = crud.is_mutual_follow(
-                session=session, user1_id=current_user.id, user2_id=post.user_id
-            )
-        else:
-            post_dict["is_mutual_follow"] = True
-        
-        post_data.append(WorkoutPostPublic(**post_dict))
+    post_data = crud.enrich_workout_posts(
+        session=session, posts=posts, viewer_id=current_user.id
+    )
     
-    return WorkoutPostsPublic(data=post_data, count=count)
+    return WorkoutPostsPublic(
+        data=post_data, count=count, next_cursor=next_cursor(posts, limit)
+    )
 
 
 @router.get("/workout-posts/{post_id}", response_model=WorkoutPostPublic)
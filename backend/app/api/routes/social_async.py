@@ -0,0 +1,181 @@
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CursorDep
+from app.crud import social_async
+from app.crud.pagination import next_cursor
+from app.models.social import (
+    UserSearchResult,
+    UserSearchResultsPublic,
+    WorkoutPostPublic,
+    WorkoutPostsPublic,
+)
+
+# Async handlers for the hot social read endpoints. When ASYNC_DB_ENABLED is
+# set, app.api.main registers them in place of the matching routes of
+# app.api.routes.social; every other social endpoint keeps its sync handler.
+router = APIRouter(prefix="/social", tags=["social"])
+
+FEED_TYPES = ["personal", "public", "combined"]
+
+
+@router.get("/followers", response_model=UserSearchResultsPublic)
+async def get_followers(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """
+    Get users who follow the current user.
+    """
+    followers, count = await social_async.get_followers_with_stats(
+        session=session,
+        user_id=current_user.id,
+        viewer_id=current_user.id,
+        skip=skip,
+        limit=limit,
+    )
+    return UserSearchResultsPublic(
+        data=[UserSearchResult(**user) for user in followers], count=count
+    )
+
+
+@router.get("/following", response_model=UserSearchResultsPublic)
+async def get_following(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+) -> Any:
+    """
+    Get users that the current user follows.
+    """
+    following, count = await social_async.get_following_with_stats(
+        session=session,
+        user_id=current_user.id,
+        viewer_id=current_user.id,
+        skip=skip,
+        limit=limit,
+    )
+    return UserSearchResultsPublic(
+        data=[UserSearchResult(**user) for user in following], count=count
+    )
+
+
+@router.get("/workout-posts", response_model=WorkoutPostsPublic)
+async def get_my_workout_posts(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: bool = True,
+) -> Any:
+    """
+    Get the current user's workout posts.
+    """
+    posts, count = await social_async.get_user_workout_posts(
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
+    )
+    post_data = [
+        WorkoutPostPublic.model_validate(
+            post,
+            update={"user_full_name": current_user.full_name, "is_mutual_follow": True},
+        )
+        for post in posts
+    ]
+    return WorkoutPostsPublic(
+        data=post_data, count=count, next_cursor=next_cursor(posts, limit)
+    )
+
+
+@router.get("/feed", response_model=WorkoutPostsPublic)
+async def get_feed(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    feed_type: str = "personal",
+    include_count: bool = True,
+) -> Any:
+    """
+    Get workout posts based on feed type with privacy filtering.
+    """
+    if feed_type not in FEED_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid feed_type. Must be one of: {', '.join(FEED_TYPES)}",
+        )
+    posts, count = await social_async.get_feed_posts(
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        feed_type=feed_type,
+        cursor=cursor,
+        include_count=include_count,
+    )
+    post_data = await social_async.enrich_workout_posts(
+        session=session, posts=posts, viewer_id=current_user.id
+    )
+    return WorkoutPostsPublic(
+        data=post_data, count=count, next_cursor=next_cursor(posts, limit)
+    )
+
+
+@router.get("/feed/public", response_model=WorkoutPostsPublic)
+async def get_public_feed(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: bool = True,
+) -> Any:
+    """
+    Get all public workout posts from all users (discovery feed).
+    """
+    return await social_async.get_public_feed_page_cached(
+        session=session,
+        viewer_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
+    )
+
+
+@router.get("/feed/personal", response_model=WorkoutPostsPublic)
+async def get_personal_feed(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    cursor: CursorDep,
+    skip: int = 0,
+    limit: int = 100,
+    include_count: bool = True,
+) -> Any:
+    """
+    Get workout posts from users you follow (respecting privacy settings).
+    """
+    posts, count = await social_async.get_personal_feed_posts(
+        session=session,
+        user_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
+    )
+    post_data = await social_async.enrich_workout_posts(
+        session=session, posts=posts, viewer_id=current_user.id
+    )
+    return WorkoutPostsPublic(
+        data=post_data, count=count, next_cursor=next_cursor(posts, limit)
+    )
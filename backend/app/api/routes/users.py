@@ -136,6 +136,7 @@ def update_user_me(
     current_user.sqlmodel_update(user_data)
     session.add(current_user)
     session.commit()
+    crud.invalidate_cached_user(current_user.id)
     session.refresh(current_user)
     return current_user
 
@@ -170,6 +171,7 @@ def update_password_me(
     current_user.hashed_password = hashed_password
     session.add(current_user)
     session.commit()
+    crud.invalidate_cached_user(current_user.id)
     return Message(message="Password updated successfully")
 
 
@@ -200,8 +202,12 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
         raise HTTPException(
             status_code=403, detail="Super users are not allowed to delete themselves"
         )
+    crud.release_user_follows(session=session, user_id=current_user.id)
     session.delete(current_user)
     session.commit()
+    crud.invalidate_cached_user(current_user.id)
+    # Their posts are gone from every feed page
+    crud.invalidate_post_responses(current_user.id)
     return Message(message="User deleted successfully")
 
 
@@ -299,6 +305,10 @@ def delete_user(
         )
     statement = delete(Item).where(col(Item.owner_id) == user_id)
     session.exec(statement)  # type: ignore
+    crud.release_user_follows(session=session, user_id=user_id)
     session.delete(user)
     session.commit()
+    crud.invalidate_cached_user(user_id)
+    # Their posts are gone from every feed page
+    crud.invalidate_post_responses(user_id)
     return Message(message="User deleted successfully")
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from pydantic.networks import EmailStr
 
 from app.api.deps import get_current_active_superuser
+from app.core.db import get_pool_stats
 from app.models import Message
 from app.utils import generate_test_email, send_email
 
@@ -26,6 +27,18 @@ def test_email(email_to: EmailStr) -> Message:
     return Message(message="Test email sent")
 
 
+@router.get(
+    "/db-pool/",
+    dependencies=[Depends(get_current_active_superuser)],
+)
+def db_pool_stats() -> dict:
+    """
+    Connection pool usage for the worker that serves the request: checked-out,
+    idle and overflow connections, plus checkout wait times since startup.
+    """
+    return get_pool_stats()
+
+
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
@@ -1,11 +1,23 @@
 import uuid
 from datetime import datetime
-from typing import Any, List, Optional
-
-from fastapi import APIRouter, HTTPException, Query, Path, Body, status
-from sqlmodel import Session, select, func
-
-from app.api.deps import CurrentUser, SessionDep
+from typing import Any, Iterable, Iterator, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Path, Body, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlmodel import Session, select
+
+from app import crud
+from app.api.deps import CurrentUser, CursorDep, SessionDep
+from app.crud.pagination import next_cursor
+from app.crud.workout import (
+    completed_sort_key,
+    completed_workouts_statement,
+    scheduled_workouts_statement,
+    workouts_public,
+    workouts_statement,
+    workouts_with_exercises_statement,
+)
 from app.models.token import Message
 from app.models.workout import (
     Workout,
@@ -18,7 +30,27 @@ from app.models.workout import (
     ExercisePublic,
     WorkoutWithExercisesPublic
 )
-from app.crudFuncs import create_or_update_personal_best, update_personal_bests_after_workout
+from app.crudFuncs import personal_best_candidates, update_personal_bests_after_workout
+
+# Response header carrying the cursor of the next page for list endpoints
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+
+def iter_json_array(items: Iterable[BaseModel]) -> Iterator[str]:
+    """
+    Serialize models into a JSON array one element at a time, so a large
+    page is streamed instead of being rendered into a single buffer.
+    """
+    yield "["
+    for index, item in enumerate(items):
+        yield ("," if index else "") + item.model_dump_json()
+    yield "]"
+
 
 TRACKED_EXERCISES = {
     "bench press": {"id": "1", "muscle_group": "Chest", "type": "strength"},
@@ -40,123 +72,68 @@ TRACKED_EXERCISES = {
 router = APIRouter(prefix="/workouts", tags=["workouts"])
 
 
-from app.models import PersonalBestCreate  # make sure this is imported
-
-@router.post("/", response_model=WorkoutPublic)
+@router.post("/", response_model=WorkoutWithExercisesPublic)
 def create_workout(
     *,
     session: SessionDep,
     current_user: CurrentUser,
     workout_in: WorkoutCreate
 ) -> Any:
-    workout = Workout(
-        user_id=current_user.id,
-        name=workout_in.name,
-        description=workout_in.description,
-        scheduled_date=workout_in.scheduled_date,
-        duration_minutes=workout_in.duration_minutes,
-        is_completed=False,
-        created_at=datetime.utcnow(),
+    """
+    Create a workout with its exercises.
+    
+    Tracked exercises update the user's personal bests in the same transaction.
+    Returns the workout together with the created exercises.
+    """
+    personal_bests = personal_best_candidates(
+        workout_in.exercises,
+        tracked_exercises=TRACKED_EXERCISES,
+        achieved_at=datetime.utcnow(),
     )
 
-    session.add(workout)
-    session.commit()
-    session.refresh(workout)
-
-    # Add nested exercises
-    for ex in workout_in.exercises:
-        exercise = Exercise(
-            workout_id=workout.id,
-            name=ex.name,
-            description=ex.description,
-            category=ex.category,
-            sets=ex.sets,
-            reps=ex.reps,
-            weight=ex.weight,
-        )
-        session.add(exercise)
-
-        # Check if this exercise is tracked for PBs
-        name_key = ex.name.lower()
-        metric_info = TRACKED_EXERCISES.get(name_key)
-        if metric_info:
-            value = (ex.sets or 0) * (ex.reps or 0) * (ex.weight or 0) #Deciding Factor for upsert
-            pb_in = PersonalBestCreate(
-                exercise_name=ex.name,
-                metric_type=metric_info["type"],
-                metric_value=value,
-                date_achieved=datetime.utcnow().date()
-            )
-            create_or_update_personal_best(
-                session=session, user_id=current_user.id, pb_in=pb_in
-            )
-
-    session.commit()
-    session.refresh(workout)
-
-    # Load exercises manually
-    workout.exercises = session.exec(
-        select(Exercise).where(Exercise.workout_id == workout.id)
-    ).all()
-
-    return workout
+    return crud.create_workout(
+        session=session,
+        workout_in=workout_in,
+        user_id=current_user.id,
+        personal_bests=personal_bests,
+    )
 
 
 @router.get("/", response_model=List[WorkoutPublic])
 def get_workouts(
+    response: Response,
     session: SessionDep,
     current_user: CurrentUser,
+    cursor: CursorDep,
     skip: int = Query(0, description="Number of records to skip for pagination"),
     limit: int = Query(100, description="Maximum number of records to return")
 ) -> Any:
     """
     Get all workouts for the current user.
     
-    This endpoint retrieves all workouts created by the current user, with pagination support.
+    This endpoint retrieves all workouts created by the current user, newest first,
+    with pagination support.
     
+    - **cursor**: Cursor from the previous page's X-Next-Cursor header (preferred over skip)
     - **skip**: Number of records to skip (for pagination)
     - **limit**: Maximum number of records to return (for pagination)
     
-    Returns a list of workouts and the total count.
+    Returns a list of workouts. The X-Next-Cursor response header holds the
+    cursor of the next page and is omitted on the last page.
     """
-    # Get count of user's workouts
-    count_statement = (
-        select(func.count())
-        .select_from(Workout)
-        .where(Workout.user_id == current_user.id)
-    )
-    count = session.exec(count_statement).one()
-    
     # Get user's workouts with pagination
-    statement = (
-        select(Workout)
-        .where(Workout.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
-    )
-    workouts = session.exec(statement).all()
-    
-    """# Add exercise count to each workout
-    workout_data = []
-    workout_list = [] #Actual list of Workout, not just data
-    for workout in workouts:
-        # Count exercises for this workout
-        exercise_count_stmt = (
-            select(func.count())
-            .select_from(Exercise)
-            .where(Exercise.workout_id == workout.id)
+    rows = session.exec(
+        workouts_statement(
+            user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
         )
-        exercise_count = session.exec(exercise_count_stmt).one()
-        workout_list.append(workout)
-        # Convert to dict and add exercise_count
-        workout_dict = workout.model_dump()
-        workout_dict["exercise_count"] = exercise_count
-        workout_data.append(workout_dict)"""
+    ).all()
+    workouts = workouts_public(rows)
     
+    set_next_cursor(response, next_cursor(workouts, limit))
     return workouts
 
 
-@router.get("/{workout_id}", response_model=WorkoutPublic)
+@router.get("/{workout_id:uuid}", response_model=WorkoutPublic)
 def get_workout(
     workout_id: uuid.UUID = Path(..., description="The ID of the workout to retrieve"),
     session: SessionDep = None,
@@ -196,21 +173,40 @@ def get_workout(
 def get_workouts_with_exercises(
     session: SessionDep,
     current_user: CurrentUser,
+    cursor: CursorDep,
+    start: Optional[datetime] = Query(None, description="Only workouts created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only workouts created before this time"),
+    skip: int = Query(0, description="Number of records to skip for pagination"),
+    limit: int = Query(100, description="Maximum number of records to return")
 ) -> Any:
     """
-    Get all workouts with their exercises for the current user.
+    Get the current user's workouts with their exercises, newest first.
+    
+    - **cursor**: Cursor from the previous page's X-Next-Cursor header (preferred over skip)
+    - **start** / **end**: Optional creation time range
+    - **skip**: Number of records to skip (for pagination)
+    - **limit**: Maximum number of records to return (for pagination)
+    
+    The page costs two queries whatever its size, and the response body is
+    streamed. The X-Next-Cursor response header holds the cursor of the next
+    page and is omitted on the last page.
     """
-    # Fetch workouts
-    stmt = select(Workout).where(Workout.user_id == current_user.id)
-    workouts = session.exec(stmt).all()
-
-    # Load and attach exercises manually
-    for workout in workouts:
-        workout.exercises = session.exec(
-            select(Exercise).where(Exercise.workout_id == workout.id)
-        ).all()
+    workouts = session.exec(
+        workouts_with_exercises_statement(
+            user_id=current_user.id,
+            start=start,
+            end=end,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    ).all()
+    # Validate while the session is open; serialization happens as the body streams
+    page = [WorkoutWithExercisesPublic.model_validate(workout) for workout in workouts]
 
-    return workouts
+    response = StreamingResponse(iter_json_array(page), media_type="application/json")
+    set_next_cursor(response, next_cursor(workouts, limit))
+    return response
 
 @router.put("/{workout_id}", response_model=WorkoutPublic)
 def update_workout(
@@ -269,8 +265,15 @@ def update_workout(
     # Set updated_at timestamp
     update_dict["updated_at"] = datetime.utcnow()
     
+    stats_before = crud.workout_stats_contribution(workout)
     workout.sqlmodel_update(update_dict)
     session.add(workout)
+    crud.adjust_workout_stats(
+        session=session,
+        user_id=workout.user_id,
+        before=stats_before,
+        after=crud.workout_stats_contribution(workout),
+    )
     session.commit()
     session.refresh(workout)
     
@@ -292,11 +295,18 @@ def complete_workout(
     if workout.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
 
+    stats_before = crud.workout_stats_contribution(workout)
     workout.is_completed = True
     workout.completed_date = datetime.utcnow()
     workout.updated_at = datetime.utcnow()
 
     session.add(workout)
+    crud.adjust_workout_stats(
+        session=session,
+        user_id=workout.user_id,
+        before=stats_before,
+        after=crud.workout_stats_contribution(workout),
+    )
     session.commit()
     session.refresh(workout)
 
@@ -336,6 +346,11 @@ def delete_workout(
             detail="Not enough permissions"
         )
     
+    crud.adjust_workout_stats(
+        session=session,
+        user_id=workout.user_id,
+        before=crud.workout_stats_contribution(workout),
+    )
     session.delete(workout)
     session.commit()
     
@@ -377,25 +392,34 @@ def complete_workout(
             detail="Not enough permissions"
         )
     
+    stats_before = crud.workout_stats_contribution(workout)
     workout.is_completed = True
     workout.completed_date = datetime.utcnow()
     workout.updated_at = datetime.utcnow()
     
     session.add(workout)
+    crud.adjust_workout_stats(
+        session=session,
+        user_id=workout.user_id,
+        before=stats_before,
+        after=crud.workout_stats_contribution(workout),
+    )
+    #added for updating personalbests, committed together with the workout
+    update_personal_bests_after_workout(
+        session=session, workout=workout, tracked_exercises=TRACKED_EXERCISES
+    )
     session.commit()
     session.refresh(workout)
 
-    #added for updating personalbests
-    update_personal_bests_after_workout(session=session, workout=workout)
-
-    
     return workout
 
 
 @router.get("/scheduled", response_model=List[WorkoutPublic])
 def get_scheduled_workouts(
+    response: Response,
     session: SessionDep,
     current_user: CurrentUser,
+    cursor: CursorDep,
     skip: int = Query(0, description="Number of records to skip for pagination"),
     limit: int = Query(100, description="Maximum number of records to return")
 ) -> Any:
@@ -405,42 +429,33 @@ def get_scheduled_workouts(
     This endpoint retrieves all scheduled workouts for the current user that have not been
     completed yet, ordered by scheduled date.
     
+    - **cursor**: Cursor from the previous page's X-Next-Cursor header (preferred over skip)
     - **skip**: Number of records to skip (for pagination)
     - **limit**: Maximum number of records to return (for pagination)
     
-    Returns a list of upcoming workouts and the total count.
+    Returns a list of upcoming workouts. The X-Next-Cursor response header holds
+    the cursor of the next page and is omitted on the last page.
     """
-    # Get count of user's scheduled workouts
-    count_statement = (
-        select(func.count())
-        .select_from(Workout)
-        .where(Workout.user_id == current_user.id)
-        .where(Workout.is_completed == False)
-        .where(Workout.scheduled_date != None)
-        .where(Workout.scheduled_date >= datetime.utcnow())
-    )
-    count = session.exec(count_statement).one()
-    
     # Get user's scheduled workouts with pagination
-    statement = (
-        select(Workout)
-        .where(Workout.user_id == current_user.id)
-        .where(Workout.is_completed == False)
-        .where(Workout.scheduled_date != None)
-        .where(Workout.scheduled_date >= datetime.utcnow())
-        .order_by(Workout.scheduled_date)
-        .offset(skip)
-        .limit(limit)
-    )
-    workouts = session.exec(statement).all()
+    rows = session.exec(
+        scheduled_workouts_statement(
+            user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+        )
+    ).all()
+    workouts = workouts_public(rows)
     
+    set_next_cursor(
+        response, next_cursor(workouts, limit, sort_key=lambda w: w.scheduled_date)
+    )
     return workouts #Maybe check if list?
 
 
 @router.get("/completed", response_model=List[WorkoutPublic])
 def get_completed_workouts(
+    response: Response,
     session: SessionDep,
     current_user: CurrentUser,
+    cursor: CursorDep,
     skip: int = Query(0, description="Number of records to skip for pagination"),
     limit: int = Query(100, description="Maximum number of records to return")
 ) -> Any:
@@ -450,31 +465,24 @@ def get_completed_workouts(
     This endpoint retrieves all completed workouts for the current user,
     ordered by completed date (most recent first).
     
+    - **cursor**: Cursor from the previous page's X-Next-Cursor header (preferred over skip)
     - **skip**: Number of records to skip (for pagination)
     - **limit**: Maximum number of records to return (for pagination)
     
-    Returns a list of completed workouts and the total count.
+    Returns a list of completed workouts. The X-Next-Cursor response header holds
+    the cursor of the next page and is omitted on the last page.
     """
-    # Get count of user's completed workouts
-    count_statement = (
-        select(func.count())
-        .select_from(Workout)
-        .where(Workout.user_id == current_user.id)
-        .where(Workout.is_completed == True)
-    )
-    count = session.exec(count_statement).one()
-    
     # Get user's completed workouts with pagination
-    statement = (
-        select(Workout)
-        .where(Workout.user_id == current_user.id)
-        .where(Workout.is_completed == True)
-        .order_by(Workout.completed_date.desc())
-        .offset(skip)
-        .limit(limit)
-    )
-    workouts = session.exec(statement).all()
+    rows = session.exec(
+        completed_workouts_statement(
+            user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+        )
+    ).all()
+    workouts = workouts_public(rows)
     
+    set_next_cursor(
+        response, next_cursor(workouts, limit, sort_key=completed_sort_key)
+    )
     return workouts
 
 
@@ -493,59 +501,12 @@ def get_workout_stats(
     - Total workout duration (in minutes)
     - Average workout duration (in minutes)
     
+    All figures come from a single query, or from the user's WorkoutStats
+    rollup when WORKOUT_STATS_USE_ROLLUP is set.
+    
     Returns a dictionary with the statistics.
     """
-    # Total workouts
-    total_workouts_stmt = (
-        select(func.count())
-        .select_from(Workout)
-        .where(Workout.user_id == current_user.id)
-    )
-    total_workouts = session.exec(total_workouts_stmt).one()
-    
-    # Completed workouts
-    completed_workouts_stmt = (
-        select(func.count())
-        .select_from(Workout)
-        .where(Workout.user_id == current_user.id)
-        .where(Workout.is_completed == True)
-    )
-    completed_workouts = session.exec(completed_workouts_stmt).one()
-    
-    # Scheduled workouts
-    scheduled_workouts_stmt = (
-        select(func.count())
-        .select_from(Workout)
-        .where(Workout.user_id == current_user.id)
-        .where(Workout.is_completed == False)
-        .where(Workout.scheduled_date != None)
-        .where(Workout.scheduled_date >= datetime.utcnow())
-    )
-    scheduled_workouts = session.exec(scheduled_workouts_stmt).one()
-    
-    # Total duration
-    total_duration_stmt = (
-        select(func.sum(Workout.duration_minutes))
-        .where(Workout.user_id == current_user.id)
-        .where(Workout.duration_minutes != None)
-    )
-    total_duration = session.exec(total_duration_stmt).one() or 0
-    
-    # Average duration
-    avg_duration_stmt = (
-        select(func.avg(Workout.duration_minutes))
-        .where(Workout.user_id == current_user.id)
-        .where(Workout.duration_minutes != None)
-    )
-    avg_duration = session.exec(avg_duration_stmt).one() or 0
-    
-    return {
-        "total_workouts": total_workouts,
-        "completed_workouts": completed_workouts,
-        "scheduled_workouts": scheduled_workouts,
-        "total_duration_minutes": total_duration,
-        "average_duration_minutes": round(avg_duration, 1),
-    }
+    return crud.get_workout_stats(session=session, user_id=current_user.id)
 
 
 @router.post("/{workout_id}/exercises", response_model=ExercisePublic)
@@ -0,0 +1,112 @@
+import uuid
+from typing import Any, List
+
+from fastapi import APIRouter, HTTPException, Path, Query, Response, status
+
+from app.api.deps import AsyncCurrentUser, AsyncSessionDep, CursorDep
+from app.api.routes.workouts import set_next_cursor
+from app.crud.pagination import next_cursor
+from app.crud.workout import (
+    completed_sort_key,
+    completed_workouts_statement,
+    scheduled_workouts_statement,
+    workouts_public,
+    workouts_statement,
+)
+from app.models.workout import Workout, WorkoutPublic
+
+# Async handlers for the workout list endpoints. When ASYNC_DB_ENABLED is
+# set, app.api.main registers them in place of the matching routes of
+# app.api.routes.workouts.
+router = APIRouter(prefix="/workouts", tags=["workouts"])
+
+
+@router.get("/", response_model=List[WorkoutPublic])
+async def get_workouts(
+    response: Response,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    cursor: CursorDep,
+    skip: int = Query(0, description="Number of records to skip for pagination"),
+    limit: int = Query(100, description="Maximum number of records to return")
+) -> Any:
+    """
+    Get all workouts for the current user, newest first.
+    """
+    result = await session.exec(
+        workouts_statement(user_id=current_user.id, skip=skip, limit=limit, cursor=cursor)
+    )
+    workouts = workouts_public(result.all())
+    set_next_cursor(response, next_cursor(workouts, limit))
+    return workouts
+
+
+@router.get("/{workout_id:uuid}", response_model=WorkoutPublic)
+async def get_workout(
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    workout_id: uuid.UUID = Path(..., description="The ID of the workout to retrieve"),
+) -> Any:
+    """
+    Get a specific workout by ID.
+    """
+    workout = await session.get(Workout, workout_id)
+    if not workout:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Workout not found"
+        )
+    if workout.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+    return workout
+
+
+@router.get("/scheduled", response_model=List[WorkoutPublic])
+async def get_scheduled_workouts(
+    response: Response,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    cursor: CursorDep,
+    skip: int = Query(0, description="Number of records to skip for pagination"),
+    limit: int = Query(100, description="Maximum number of records to return")
+) -> Any:
+    """
+    Get upcoming scheduled workouts, soonest first.
+    """
+    result = await session.exec(
+        scheduled_workouts_statement(
+            user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+        )
+    )
+    workouts = workouts_public(result.all())
+    set_next_cursor(
+        response, next_cursor(workouts, limit, sort_key=lambda w: w.scheduled_date)
+    )
+    return workouts
+
+
+@router.get("/completed", response_model=List[WorkoutPublic])
+async def get_completed_workouts(
+    response: Response,
+    session: AsyncSessionDep,
+    current_user: AsyncCurrentUser,
+    cursor: CursorDep,
+    skip: int = Query(0, description="Number of records to skip for pagination"),
+    limit: int = Query(100, description="Maximum number of records to return")
+) -> Any:
+    """
+    Get completed workouts, most recently completed first.
+    """
+    result = await session.exec(
+        completed_workouts_statement(
+            user_id=current_user.id, skip=skip, limit=limit, cursor=cursor
+        )
+    )
+    workouts = workouts_public(result.all())
+    set_next_cursor(
+        response, next_cursor(workouts, limit, sort_key=completed_sort_key)
+    )
+    return workouts
@@ -0,0 +1,24 @@
+import logging
+
+from sqlmodel import Session
+
+from app import crud
+from app.core.db import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def init() -> int:
+    with Session(engine) as session:
+        return crud.backfill_feeds(session=session)
+
+
+def main() -> None:
+    logger.info("Backfilling materialized feeds")
+    inserted = init()
+    logger.info("Feeds backfilled, %s entries inserted", inserted)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+import json
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class CacheBackend(ABC):
+    """
+    Minimal key/value interface implemented by every cache backend.
+    Values must be JSON-serializable so any backend can store them.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+
+class MemoryCache(CacheBackend):
+    """
+    Thread-safe, size-bounded LRU cache with per-entry expiry, local to
+    the worker process.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by all workers, so invalidations apply everywhere at once.
+    Requires the optional `redis` package.
+    """
+
+    def __init__(self, url: str, prefix: str) -> None:
+        try:
+            import redis
+        except ImportError as e:  # pragma: no cover - optional dependency
+            raise RuntimeError(
+                "CACHE_BACKEND=redis requires the 'redis' package to be installed"
+            ) from e
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self._client.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._client.set(
+            self.prefix + key, json.dumps(value, default=str), px=int(ttl * 1000)
+        )
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self._client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._client.delete(*keys)
+
+
+class Cache:
+    """
+    A named cache with its own size bound and TTL on top of the configured
+    backend. A TTL of 0 disables the cache.
+    """
+
+    def __init__(self, namespace: str, *, maxsize: int, ttl: float) -> None:
+        self.namespace = namespace
+        self.ttl = ttl
+        if settings.CACHE_BACKEND == "redis" and settings.CACHE_REDIS_URL:
+            self.backend: CacheBackend = RedisCache(
+                settings.CACHE_REDIS_URL, prefix=f"{settings.PROJECT_NAME}:{namespace}:"
+            )
+        else:
+            self.backend = MemoryCache(maxsize)
+        _caches[namespace] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        if self.enabled:
+            self.backend.set(key, value, self.ttl)
+
+    def delete(self, key: str) -> None:
+        self.backend.delete(key)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+
+class TaggedCache:
+    """
+    A named cache whose entries depend on tags, e.g. "posts of user X".
+    Each tag has a random version that is part of every key stored under
+    it; invalidating a tag replaces its version, which orphans all those
+    entries at once without scanning keys on any backend. Orphans age out
+    through the TTL and the LRU bound.
+    """
+
+    def __init__(self, namespace: str, *, maxsize: int, ttl: float) -> None:
+        self.entries = Cache(namespace, maxsize=maxsize, ttl=ttl)
+        # Versions must outlive the entries built on them, or a hit rate
+        # is lost (never correctness: a missing version is a fresh one)
+        self.versions = Cache(f"{namespace}-tags", maxsize=maxsize, ttl=ttl * 10)
+
+    @property
+    def enabled(self) -> bool:
+        return self.entries.enabled
+
+    def _version(self, tag: str) -> str:
+        version = self.versions.get(tag)
+        if version is None:
+            version = uuid.uuid4().hex
+            self.versions.set(tag, version)
+        return version
+
+    def entry_key(self, key: str, tags: Iterable[str]) -> str:
+        """
+        Resolve a key against the current versions of its tags. Take it
+        before reading the data to cache: if a tag is invalidated while the
+        value is computed, the value is stored under the old version and is
+        never served.
+        """
+        return key + "|" + ",".join(f"{tag}@{self._version(tag)}" for tag in tags)
+
+    def get(self, entry_key: str) -> Optional[Any]:
+        return self.entries.get(entry_key)
+
+    def set(self, entry_key: str, value: Any) -> None:
+        self.entries.set(entry_key, value)
+
+    def invalidate(self, *tags: str) -> None:
+        for tag in tags:
+            self.versions.delete(tag)
+
+
+_caches: Dict[str, Cache] = {}
+
+
+def clear_all_caches() -> None:
+    """
+    Empty every named cache, e.g. between tests.
+    """
+    for cache in _caches.values():
+        cache.clear()
@@ -69,6 +69,81 @@ class Settings(BaseSettings):
             path=self.POSTGRES_DB,
         )
 
+    # Connection pool, per engine and per worker process. Each worker can open
+    # up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections per engine (the async
+    # engine only when ASYNC_DB_ENABLED), so keep
+    # workers * (pool size + overflow) under Postgres max_connections.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds; -1 keeps connections forever
+    DB_POOL_PRE_PING: bool = True
+    # Set when connecting through PgBouncer in transaction pooling mode
+    DB_PGBOUNCER_MODE: bool = False
+
+    # Backend for app.core.cache. "memory" caches are per worker process, so
+    # invalidations only reach other workers once their entries expire; use
+    # "redis" (requires the redis package) to share them between workers.
+    CACHE_BACKEND: Literal["memory", "redis"] = "memory"
+    CACHE_REDIS_URL: str | None = None
+    # Authenticated user lookups in get_current_user; 0 disables the cache
+    USER_CACHE_TTL_SECONDS: float = 30.0
+    USER_CACHE_MAX_SIZE: int = 10_000
+    # Responses of the read-heavy social endpoints (public feed, profiles,
+    # user posts); invalidated on writes, 0 disables the cache
+    RESPONSE_CACHE_TTL_SECONDS: float = 15.0
+    RESPONSE_CACHE_MAX_SIZE: int = 10_000
+    # Per-user sets of followed ids for follow and privacy checks. Users
+    # following more than FOLLOW_GRAPH_MAX_SET_SIZE aren't cached.
+    FOLLOW_GRAPH_CACHE_TTL_SECONDS: float = 30.0
+    FOLLOW_GRAPH_CACHE_MAX_SIZE: int = 10_000
+    FOLLOW_GRAPH_MAX_SET_SIZE: int = 5_000
+    # Most user ids plus email hashes accepted by one bulk follow request
+    BULK_FOLLOW_MAX_ITEMS: int = 500
+    # Friends-of-friends suggestions: the most recent follows walked, and
+    # the top suggestions cached per user
+    FOLLOW_SUGGESTIONS_MAX_FRIENDS: int = 500
+    FOLLOW_SUGGESTIONS_CACHE_SIZE: int = 50
+    FOLLOW_SUGGESTIONS_CACHE_TTL_SECONDS: float = 600.0
+    FOLLOW_SUGGESTIONS_CACHE_MAX_SIZE: int = 10_000
+
+    # Expo push delivery (app.push). Point EXPO_PUSH_URL at a local stub to
+    # test without sending real notifications.
+    EXPO_PUSH_URL: str = "https://exp.host/--/api/v2/push/send"
+    EXPO_PUSH_RECEIPTS_URL: str = "https://exp.host/--/api/v2/push/getReceipts"
+    EXPO_ACCESS_TOKEN: str | None = None
+    EXPO_PUSH_CONCURRENCY: int = 6  # batches of 100 in flight at once
+    EXPO_PUSH_RATE_PER_SECOND: float = 600.0  # Expo's per-project limit
+    EXPO_PUSH_TIMEOUT_SECONDS: float = 15.0
+    EXPO_PUSH_MAX_RETRIES: int = 3
+    # Receipts are checked once tickets are this old (Expo needs ~15 minutes)
+    EXPO_RECEIPT_DELAY_MINUTES: int = 15
+    # Due reminders claimed per UPDATE ... RETURNING by the dispatcher
+    REMINDER_CLAIM_BATCH_SIZE: int = 500
+    # The dispatcher keeps the due times of the next window of unsent
+    # reminders in memory, up to REMINDER_WINDOW_LIMIT of them
+    REMINDER_WINDOW_SECONDS: int = 300
+    REMINDER_WINDOW_LIMIT: int = 10_000
+    # The daily quote goes out in batches of DAILY_QUOTE_BATCH_SIZE tokens,
+    # spread evenly over DAILY_QUOTE_WINDOW_MINUTES from 15:00 UTC
+    DAILY_QUOTE_BATCH_SIZE: int = 1000
+    DAILY_QUOTE_WINDOW_MINUTES: int = 60
+    # Run the scheduled jobs inside every API worker. Turn off when a
+    # separate `python -m app.scheduler` process runs them instead.
+    SCHEDULER_ENABLED_IN_API: bool = True
+
+    # User search: queries shorter than this match name/email prefixes only,
+    # and the reported number of matches stops at the cap
+    USER_SEARCH_MIN_SUBSTRING_LENGTH: int = 3
+    USER_SEARCH_COUNT_CAP: int = 1000
+    # Typeahead suggestions per prefix, shared by all viewers for a short time
+    TYPEAHEAD_CACHE_TTL_SECONDS: float = 60.0
+    TYPEAHEAD_CACHE_MAX_SIZE: int = 10_000
+
+    # Serve the hot read endpoints (feeds, follower lists, workout lists) from
+    # async handlers on an async engine instead of the threadpool
+    ASYNC_DB_ENABLED: bool = False
+
     SMTP_TLS: bool = True
     SMTP_SSL: bool = False
     SMTP_PORT: int = 587
@@ -91,10 +166,27 @@ class Settings(BaseSettings):
     def emails_enabled(self) -> bool:
         return bool(self.SMTP_HOST and self.EMAILS_FROM_EMAIL)
 
+    # bcrypt cost factor; stored hashes with another cost are rehashed on login
+    BCRYPT_ROUNDS: int = 12
+    # Processes that run bcrypt for this worker; 0 hashes in the calling thread
+    PASSWORD_HASH_WORKERS: int = 2
+    # Hashing jobs allowed in flight per worker before requests get a 503
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
     EMAIL_TEST_USER: EmailStr = "test@example.com"
     FIRST_SUPERUSER: EmailStr
     FIRST_SUPERUSER_PASSWORD: str
 
+    # Posts by accounts with more followers than this are not fanned out to
+    # follower feeds; they are merged in at read time instead
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10_000
+    # Read follower/following counts from the denormalized User columns;
+    # set to False to count UserFollow rows in the query instead
+    SOCIAL_STATS_USE_COUNTERS: bool = True
+    # Serve /workouts/stats from the per-user WorkoutStats rollup; set to
+    # False to aggregate the user's workouts in the query instead
+    WORKOUT_STATS_USE_ROLLUP: bool = True
+
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "changethis":
             message = (
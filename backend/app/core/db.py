@@ -1,10 +1,54 @@
+import os
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import Pool
 from sqlmodel import Session, create_engine, select
 
 from app import crud
 from app.core.config import settings
+from app.core.pool import TimedAsyncAdaptedQueuePool, TimedQueuePool, pool_status
 from app.models import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+
+def _engine_options(poolclass: type[Pool]) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_PGBOUNCER_MODE:
+        # In transaction pooling mode consecutive transactions may run on
+        # different server connections, so psycopg must not prepare statements
+        options["connect_args"] = {"prepare_threshold": None}
+    return options
+
+
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI), **_engine_options(TimedQueuePool)
+)
+# psycopg 3 drives both engines; create_async_engine selects its async mode.
+# Connections are only opened on first use, so this is free when
+# ASYNC_DB_ENABLED is off.
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    **_engine_options(TimedAsyncAdaptedQueuePool),
+)
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Report connection pool usage for this worker process. Each worker owns
+    its own pools, so the numbers cover only the worker serving the request.
+    """
+    return {
+        "pid": os.getpid(),
+        "sync": pool_status(engine.pool),
+        "async": pool_status(async_engine.pool),
+    }
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -5,42 +5,75 @@ from app.crud.item import (
     get_items,
     update_item,
 )
+from app.crud.feed import backfill_feeds
 from app.crud.social import (
     create_workout_post,
     delete_workout_post,
+    enrich_workout_posts,
     follow_user,
+    follow_users,
     get_feed_posts,
     get_personal_feed_posts,
     get_public_feed_posts,
     get_combined_feed_posts,
     get_follower_count,
     get_followers,
+    get_followers_with_stats,
     get_following,
     get_following_count,
+    get_following_with_stats,
+    get_mutual_follow_ids,
+    get_public_feed_page_cached,
+    get_user_ids_by_email_hash,
+    get_user_profile_cached,
     get_user_workout_posts,
+    get_user_workout_posts_page_cached,
     get_workout_post,
     is_following,
     is_mutual_follow,
+    release_user_follows,
     search_users,
+    select_users_with_stats,
     unfollow_user,
+    unfollow_users,
     update_workout_post,
 )
+from app.crud.search import typeahead_users
+from app.crud.suggestions import get_follow_suggestions
+from app.crud.response_cache import (
+    invalidate_post_responses,
+    invalidate_user_responses,
+)
+from app.crud.workout import (
+    adjust_workout_stats,
+    create_workout,
+    get_workout_stats,
+    workout_stats_contribution,
+)
 from app.crud.user import (
     authenticate,
+    cache_user,
     create_user,
+    get_cached_user,
     get_user_by_email,
     get_user_by_id,
+    get_user_by_id_cached,
     get_users,
+    invalidate_cached_user,
     update_user,
 )
 
 __all__ = [
     # User operations
     "authenticate",
+    "cache_user",
     "create_user",
+    "get_cached_user",
     "get_user_by_email",
     "get_user_by_id",
+    "get_user_by_id_cached",
     "get_users",
+    "invalidate_cached_user",
     "update_user",
     
     # Item operations
@@ -53,12 +86,21 @@ __all__ = [
     # Social operations - User Follow
     "follow_user",
     "unfollow_user",
+    "follow_users",
+    "unfollow_users",
+    "get_user_ids_by_email_hash",
     "get_followers",
     "get_following",
     "is_following",
     "get_follower_count",
     "get_following_count",
+    "get_followers_with_stats",
+    "get_following_with_stats",
+    "select_users_with_stats",
+    "release_user_follows",
     "search_users",
+    "typeahead_users",
+    "get_follow_suggestions",
     
     # Social operations - Workout Posts
     "create_workout_post",
@@ -69,6 +111,24 @@ __all__ = [
     "get_public_feed_posts",
     "get_combined_feed_posts",
     "is_mutual_follow",
+    "get_mutual_follow_ids",
+    "enrich_workout_posts",
     "update_workout_post",
     "delete_workout_post",
+    
+    # Social operations - Cached responses
+    "get_public_feed_page_cached",
+    "get_user_profile_cached",
+    "get_user_workout_posts_page_cached",
+    "invalidate_post_responses",
+    "invalidate_user_responses",
+    
+    # Workout operations
+    "adjust_workout_stats",
+    "create_workout",
+    "get_workout_stats",
+    "workout_stats_contribution",
+    
+    # Feed operations
+    "backfill_feeds",
 ]
\ No newline at end of file
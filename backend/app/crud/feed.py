@@ -0,0 +1,476 @@
+import uuid
+from typing import Collection, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, exists, insert, literal, update
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, and_, func, or_, select
+
+from app.core.config import settings
+from app.crud.pagination import Cursor, apply_cursor, paginate
+from app.models.social import FeedItem, UserFollow, WorkoutPost
+from app.models.user import User
+
+FEED_ITEM_COLUMNS = ["owner_id", "post_id", "author_id", "is_public", "created_at"]
+
+
+# Fan-out helpers
+
+def _literal(value, column: str):
+    """
+    Bind a Python value with the type of the matching FeedItem column.
+    """
+    return literal(value, FeedItem.__table__.c[column].type)
+
+
+def _followers_allowed_to_see(*, author_id: uuid.UUID, is_public: bool):
+    """
+    Build a SELECT of the author's followers who may see a post.
+    Private posts are only visible to mutual followers.
+    """
+    statement = select(UserFollow.follower_id).where(UserFollow.followed_id == author_id)
+    if not is_public:
+        statement = statement.where(
+            UserFollow.follower_id.in_(
+                select(UserFollow.followed_id).where(UserFollow.follower_id == author_id)
+            )
+        )
+    return statement
+
+
+def _fan_out_to_followers(*, session: Session, post: WorkoutPost) -> None:
+    """
+    Insert the post into the feed of every follower allowed to see it
+    with a single INSERT ... SELECT.
+    """
+    followers = _followers_allowed_to_see(
+        author_id=post.user_id, is_public=post.is_public
+    ).subquery()
+    source = select(
+        followers.c.follower_id,
+        _literal(post.id, "post_id"),
+        _literal(post.user_id, "author_id"),
+        _literal(post.is_public, "is_public"),
+        _literal(post.created_at, "created_at"),
+    ).where(
+        ~exists().where(
+            FeedItem.owner_id == followers.c.follower_id,
+            FeedItem.post_id == post.id,
+        )
+    )
+    session.execute(insert(FeedItem).from_select(FEED_ITEM_COLUMNS, source))
+
+
+def _fan_out_author_posts(*, session: Session, author_ids: Collection[uuid.UUID]) -> None:
+    """
+    Copy all of the authors' posts into the feeds of their current followers
+    with a single INSERT ... SELECT; private posts only reach mutual
+    followers. Used when accounts drop back under the fan-out threshold.
+    """
+    reverse_follow = aliased(UserFollow)
+    source = (
+        select(
+            UserFollow.follower_id,
+            WorkoutPost.id,
+            WorkoutPost.user_id,
+            WorkoutPost.is_public,
+            WorkoutPost.created_at,
+        )
+        .join(WorkoutPost, WorkoutPost.user_id == UserFollow.followed_id)
+        .where(
+            UserFollow.followed_id.in_(author_ids),
+            or_(
+                WorkoutPost.is_public == True,
+                exists().where(
+                    reverse_follow.follower_id == UserFollow.followed_id,
+                    reverse_follow.followed_id == UserFollow.follower_id,
+                ),
+            ),
+            ~exists().where(
+                FeedItem.owner_id == UserFollow.follower_id,
+                FeedItem.post_id == WorkoutPost.id,
+            ),
+        )
+    )
+    session.execute(insert(FeedItem).from_select(FEED_ITEM_COLUMNS, source))
+
+
+def _over_fanout_threshold(*, session: Session, user_ids: List[uuid.UUID]) -> Set[uuid.UUID]:
+    """
+    Get which of the users have more followers than FEED_FANOUT_MAX_FOLLOWERS,
+    in one query. Reads at most threshold + 1 index entries per user instead
+    of counting them all.
+    """
+    over_threshold = (
+        select(UserFollow.follower_id)
+        .where(UserFollow.followed_id == User.id)
+        .offset(settings.FEED_FANOUT_MAX_FOLLOWERS)
+        .limit(1)
+        .exists()
+    )
+    statement = select(User.id).where(User.id.in_(user_ids), over_threshold)
+    return set(session.exec(statement).all())
+
+
+def _sync_fanout_exempt(*, session: Session, users: List[User]) -> None:
+    """
+    Update the users' fanout_exempt flags after their follower counts
+    changed, and fan out the posts of those that dropped under the threshold.
+    """
+    if not users:
+        return
+    over_threshold = _over_fanout_threshold(
+        session=session, user_ids=[user.id for user in users]
+    )
+    released = []
+    for user in users:
+        exempt = user.id in over_threshold
+        if exempt != user.fanout_exempt:
+            user.fanout_exempt = exempt
+            session.add(user)
+            if not exempt:
+                released.append(user.id)
+    if released:
+        # Posts written while exempt were never fanned out
+        _fan_out_author_posts(session=session, author_ids=released)
+
+
+# Write path - called by the social CRUD operations before they commit
+
+def fan_out_workout_post(*, session: Session, post: WorkoutPost) -> None:
+    """
+    Add a newly created (and flushed) post to the author's feed and, unless the
+    author is exempt from fan-out, to the feeds of followers allowed to see it.
+    """
+    session.add(
+        FeedItem(
+            owner_id=post.user_id,
+            post_id=post.id,
+            author_id=post.user_id,
+            is_public=post.is_public,
+            created_at=post.created_at,
+        )
+    )
+    session.flush()
+
+    author = session.get(User, post.user_id)
+    if author and not author.fanout_exempt:
+        _fan_out_to_followers(session=session, post=post)
+
+
+def refresh_workout_post_fanout(*, session: Session, post: WorkoutPost) -> None:
+    """
+    Re-apply privacy rules after a post's visibility changed.
+    """
+    session.execute(
+        delete(FeedItem).where(
+            FeedItem.post_id == post.id, FeedItem.owner_id != post.user_id
+        )
+    )
+    session.execute(
+        update(FeedItem)
+        .where(FeedItem.post_id == post.id)
+        .values(is_public=post.is_public)
+    )
+    author = session.get(User, post.user_id)
+    if author and not author.fanout_exempt:
+        _fan_out_to_followers(session=session, post=post)
+
+
+def remove_workout_post_from_feeds(*, session: Session, post_id: uuid.UUID) -> None:
+    """
+    Remove a post from every feed it was fanned out to.
+    """
+    session.execute(delete(FeedItem).where(FeedItem.post_id == post_id))
+
+
+def add_follows_to_feeds(
+    *, session: Session, follower_id: uuid.UUID, followed_ids: Collection[uuid.UUID]
+) -> None:
+    """
+    Backfill feeds after follower_id started following followed_ids, with
+    one INSERT ... SELECT per direction whatever the number of follows.
+    Followed users who follow back also gain the follower's private posts.
+    """
+    follower = session.get(User, follower_id)
+    followed = session.exec(select(User).where(User.id.in_(followed_ids))).all()
+    if not follower or not followed:
+        return
+
+    # Follower counts only grow here, so exempt accounts stay exempt
+    _sync_fanout_exempt(
+        session=session, users=[user for user in followed if not user.fanout_exempt]
+    )
+
+    reverse_follow = aliased(UserFollow)
+    authors = [user.id for user in followed if not user.fanout_exempt]
+    if authors:
+        # Private posts only when the author follows back
+        source = select(
+            _literal(follower_id, "owner_id"),
+            WorkoutPost.id,
+            WorkoutPost.user_id,
+            WorkoutPost.is_public,
+            WorkoutPost.created_at,
+        ).where(
+            WorkoutPost.user_id.in_(authors),
+            or_(
+                WorkoutPost.is_public == True,
+                exists().where(
+                    reverse_follow.follower_id == WorkoutPost.user_id,
+                    reverse_follow.followed_id == follower_id,
+                ),
+            ),
+            ~exists().where(FeedItem.owner_id == follower_id, FeedItem.post_id == WorkoutPost.id),
+        )
+        session.execute(insert(FeedItem).from_select(FEED_ITEM_COLUMNS, source))
+
+    if not follower.fanout_exempt:
+        # Followed users who follow back now form a mutual pair
+        source = (
+            select(
+                reverse_follow.follower_id,
+                WorkoutPost.id,
+                WorkoutPost.user_id,
+                WorkoutPost.is_public,
+                WorkoutPost.created_at,
+            )
+            .join(WorkoutPost, WorkoutPost.user_id == reverse_follow.followed_id)
+            .where(
+                reverse_follow.followed_id == follower_id,
+                reverse_follow.follower_id.in_([user.id for user in followed]),
+                ~exists().where(
+                    FeedItem.owner_id == reverse_follow.follower_id,
+                    FeedItem.post_id == WorkoutPost.id,
+                ),
+            )
+        )
+        session.execute(insert(FeedItem).from_select(FEED_ITEM_COLUMNS, source))
+
+
+def add_follow_to_feeds(
+    *, session: Session, follower_id: uuid.UUID, followed_id: uuid.UUID
+) -> None:
+    """
+    Backfill feeds after follower_id started following followed_id.
+    If the follow made the pair mutual, the followed user also gains
+    the follower's private posts.
+    """
+    add_follows_to_feeds(session=session, follower_id=follower_id, followed_ids=[followed_id])
+
+
+def remove_follows_from_feeds(
+    *, session: Session, follower_id: uuid.UUID, followed_ids: Collection[uuid.UUID]
+) -> None:
+    """
+    Prune feeds after follower_id stopped following followed_ids, with one
+    DELETE per direction whatever the number of follows. Followed users who
+    followed back lose the follower's private posts.
+    """
+    session.execute(
+        delete(FeedItem).where(
+            FeedItem.owner_id == follower_id, FeedItem.author_id.in_(followed_ids)
+        )
+    )
+    # Only a mutual follower could see the private posts, and the pairs no
+    # longer are
+    session.execute(
+        delete(FeedItem).where(
+            FeedItem.owner_id.in_(followed_ids),
+            FeedItem.author_id == follower_id,
+            FeedItem.is_public == False,
+        )
+    )
+
+    # Follower counts only shrink here, so only exempt accounts can flip
+    exempt = session.exec(
+        select(User).where(User.id.in_(followed_ids), User.fanout_exempt == True)
+    ).all()
+    _sync_fanout_exempt(session=session, users=list(exempt))
+
+
+def remove_follow_from_feeds(
+    *, session: Session, follower_id: uuid.UUID, followed_id: uuid.UUID
+) -> None:
+    """
+    Prune feeds after follower_id stopped following followed_id.
+    If the pair was mutual, the followed user loses the follower's private posts.
+    """
+    remove_follows_from_feeds(
+        session=session, follower_id=follower_id, followed_ids=[followed_id]
+    )
+
+
+# Read path
+
+def get_feed_posts_page(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
+    """
+    Read a page of the user's materialized personal feed.
+
+    Posts by followed accounts that are exempt from fan-out are merged in at
+    query time with the same privacy rules used when fanning out.
+    """
+    exempt_ids = session.exec(exempt_followees_statement(user_id)).all()
+    statement, count_statement = feed_page_statements(
+        user_id=user_id, exempt_ids=exempt_ids, skip=skip, limit=limit, cursor=cursor
+    )
+    count = session.exec(count_statement).one() if include_count else None
+    posts = session.exec(statement).all()
+    return posts, count
+
+
+def exempt_followees_statement(user_id: uuid.UUID):
+    """
+    Build a SELECT of the followed accounts that are exempt from fan-out.
+    """
+    return (
+        select(UserFollow.followed_id)
+        .join(User, User.id == UserFollow.followed_id)
+        .where(UserFollow.follower_id == user_id, User.fanout_exempt == True)
+    )
+
+
+def feed_page_statements(
+    *,
+    user_id: uuid.UUID,
+    exempt_ids: List[uuid.UUID],
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+):
+    """
+    Build the page and count statements for a personal feed, given the
+    followed accounts that are exempt from fan-out.
+    """
+    if not exempt_ids:
+        count_statement = (
+            select(func.count())
+            .select_from(FeedItem)
+            .where(FeedItem.owner_id == user_id)
+        )
+        statement = apply_cursor(
+            select(WorkoutPost)
+            .join(FeedItem, FeedItem.post_id == WorkoutPost.id)
+            .where(FeedItem.owner_id == user_id),
+            cursor,
+            FeedItem.created_at,
+            FeedItem.post_id,
+        )
+    else:
+        condition = or_(
+            WorkoutPost.id.in_(
+                select(FeedItem.post_id).where(FeedItem.owner_id == user_id)
+            ),
+            and_(
+                WorkoutPost.user_id.in_(exempt_ids),
+                or_(
+                    WorkoutPost.is_public == True,
+                    WorkoutPost.user_id.in_(
+                        select(UserFollow.follower_id).where(
+                            UserFollow.followed_id == user_id
+                        )
+                    ),
+                ),
+            ),
+        )
+        count_statement = select(func.count()).select_from(WorkoutPost).where(condition)
+        statement = apply_cursor(
+            select(WorkoutPost).where(condition),
+            cursor,
+            WorkoutPost.created_at,
+            WorkoutPost.id,
+        )
+
+    return paginate(statement, cursor, skip, limit), count_statement
+
+
+# Backfill
+
+def _backfill_posts(*, session: Session, post_ids: List[uuid.UUID]) -> int:
+    """
+    Fan out a batch of existing posts, skipping entries that already exist.
+    """
+    reverse_follow = aliased(UserFollow)
+    own_entries = select(
+        WorkoutPost.user_id.label("owner_id"),
+        WorkoutPost.id.label("post_id"),
+        WorkoutPost.user_id.label("author_id"),
+        WorkoutPost.is_public,
+        WorkoutPost.created_at,
+    ).where(WorkoutPost.id.in_(post_ids))
+    follower_entries = (
+        select(
+            UserFollow.follower_id.label("owner_id"),
+            WorkoutPost.id.label("post_id"),
+            WorkoutPost.user_id.label("author_id"),
+            WorkoutPost.is_public,
+            WorkoutPost.created_at,
+        )
+        .join(UserFollow, UserFollow.followed_id == WorkoutPost.user_id)
+        .join(User, User.id == WorkoutPost.user_id)
+        .where(
+            WorkoutPost.id.in_(post_ids),
+            User.fanout_exempt == False,
+            or_(
+                WorkoutPost.is_public == True,
+                exists().where(
+                    reverse_follow.follower_id == WorkoutPost.user_id,
+                    reverse_follow.followed_id == UserFollow.follower_id,
+                ),
+            ),
+        )
+    )
+    entries = own_entries.union_all(follower_entries).subquery()
+    source = select(*[entries.c[name] for name in FEED_ITEM_COLUMNS]).where(
+        ~exists().where(
+            FeedItem.owner_id == entries.c.owner_id,
+            FeedItem.post_id == entries.c.post_id,
+        )
+    )
+    result = session.execute(insert(FeedItem).from_select(FEED_ITEM_COLUMNS, source))
+    return result.rowcount or 0
+
+
+def backfill_feeds(*, session: Session, batch_size: int = 500) -> int:
+    """
+    Recompute fan-out exemptions and materialize feed entries for all existing
+    posts. Safe to re-run; also applies a changed FEED_FANOUT_MAX_FOLLOWERS.
+    Returns the number of feed entries inserted.
+    """
+    over_threshold = (
+        select(UserFollow.followed_id)
+        .group_by(UserFollow.followed_id)
+        .having(func.count() > settings.FEED_FANOUT_MAX_FOLLOWERS)
+    )
+    session.execute(
+        update(User)
+        .where(User.fanout_exempt == False, User.id.in_(over_threshold))
+        .values(fanout_exempt=True)
+    )
+    session.execute(
+        update(User)
+        .where(User.fanout_exempt == True, User.id.not_in(over_threshold))
+        .values(fanout_exempt=False)
+    )
+    session.commit()
+
+    inserted = 0
+    last_id = None
+    while True:
+        statement = select(WorkoutPost.id).order_by(WorkoutPost.id).limit(batch_size)
+        if last_id is not None:
+            statement = statement.where(WorkoutPost.id > last_id)
+        post_ids = session.exec(statement).all()
+        if not post_ids:
+            break
+        inserted += _backfill_posts(session=session, post_ids=post_ids)
+        session.commit()
+        last_id = post_ids[-1]
+    return inserted
@@ -0,0 +1,91 @@
+import uuid
+from typing import Optional, Set
+
+from sqlmodel import Session, and_, select
+
+from app.core.cache import TaggedCache
+from app.core.config import settings
+from app.models.social import UserFollow
+
+# Ids of the users each user follows, as lists of strings so any cache
+# backend can hold them. Each entry is tagged with its user, whose tag
+# follow_user/unfollow_user invalidate; other workers' copies expire after
+# FOLLOW_GRAPH_CACHE_TTL_SECONDS unless the cache is shared
+# (CACHE_BACKEND=redis).
+follow_graph_cache = TaggedCache(
+    "follow-graph",
+    maxsize=settings.FOLLOW_GRAPH_CACHE_MAX_SIZE,
+    ttl=settings.FOLLOW_GRAPH_CACHE_TTL_SECONDS,
+)
+
+
+def following_tag(user_id: uuid.UUID) -> str:
+    """
+    Tag of the cached following set of a user.
+    """
+    return f"following:{user_id}"
+
+
+def following_key(user_id: uuid.UUID) -> str:
+    """
+    Cache key of a user's following set, resolved against the current
+    version of its tag.
+    """
+    return follow_graph_cache.entry_key(str(user_id), [following_tag(user_id)])
+
+
+def get_following_ids(*, session: Session, user_id: uuid.UUID) -> Optional[Set[uuid.UUID]]:
+    """
+    Get the ids of the users a user follows, from the cache when possible.
+    Returns None for users following more than FOLLOW_GRAPH_MAX_SET_SIZE
+    users, which aren't cached to keep entries small; ask the database
+    about them directly.
+    """
+    # Resolved before the read, so a set read before a concurrent follow
+    # commits is stored under the version that follow invalidates
+    key = following_key(user_id)
+    cached = follow_graph_cache.get(key)
+    if cached is None:
+        statement = (
+            select(UserFollow.followed_id)
+            .where(UserFollow.follower_id == user_id)
+            .limit(settings.FOLLOW_GRAPH_MAX_SET_SIZE + 1)
+        )
+        ids = session.exec(statement).all()
+        if len(ids) > settings.FOLLOW_GRAPH_MAX_SET_SIZE:
+            return None
+        cached = [str(followed_id) for followed_id in ids]
+        follow_graph_cache.set(key, cached)
+    return {uuid.UUID(followed_id) for followed_id in cached}
+
+
+def follows(*, session: Session, follower_id: uuid.UUID, followed_id: uuid.UUID) -> bool:
+    """
+    Whether follower_id follows followed_id.
+    """
+    following = get_following_ids(session=session, user_id=follower_id)
+    if following is not None:
+        return followed_id in following
+    statement = select(UserFollow.follower_id).where(
+        and_(
+            UserFollow.follower_id == follower_id,
+            UserFollow.followed_id == followed_id,
+        )
+    )
+    return session.exec(statement).first() is not None
+
+
+def are_mutual(*, session: Session, user1_id: uuid.UUID, user2_id: uuid.UUID) -> bool:
+    """
+    Whether two users follow each other.
+    """
+    return follows(session=session, follower_id=user1_id, followed_id=user2_id) and follows(
+        session=session, follower_id=user2_id, followed_id=user1_id
+    )
+
+
+def invalidate_following(*user_ids: uuid.UUID) -> None:
+    """
+    Orphan the cached following sets of users whose follows changed.
+    """
+    follow_graph_cache.invalidate(*(following_tag(user_id) for user_id in user_ids))
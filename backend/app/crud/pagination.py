@@ -0,0 +1,87 @@
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Callable, NamedTuple, Optional, Sequence
+
+from sqlalchemy import literal, tuple_
+
+
+class Cursor(NamedTuple):
+    """
+    Position of the last row of a page in a (sort value, id) keyset ordering.
+    """
+    sort_value: datetime
+    id: uuid.UUID
+
+
+def encode_cursor(sort_value: datetime, row_id: uuid.UUID) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor string.
+    """
+    raw = json.dumps([sort_value.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Decode a cursor produced by encode_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return Cursor(datetime.fromisoformat(sort_value), uuid.UUID(row_id))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def apply_cursor(
+    statement: Any,
+    cursor: Optional[Cursor],
+    sort_column: Any,
+    id_column: Any,
+    descending: bool = True,
+) -> Any:
+    """
+    Order a SELECT by (sort_column, id_column) and, when a cursor is given,
+    keep only the rows after it. Unlike OFFSET, the database can seek straight
+    to the cursor position, so every page costs the same as the first one.
+    """
+    if descending:
+        statement = statement.order_by(sort_column.desc(), id_column.desc())
+    else:
+        statement = statement.order_by(sort_column.asc(), id_column.asc())
+    if cursor is None:
+        return statement
+    key = tuple_(sort_column, id_column)
+    position = tuple_(
+        literal(cursor.sort_value, sort_column.type),
+        literal(cursor.id, id_column.type),
+    )
+    return statement.where(key < position if descending else key > position)
+
+
+def next_cursor(
+    rows: Sequence[Any],
+    limit: int,
+    sort_key: Callable[[Any], datetime] = lambda row: row.created_at,
+) -> Optional[str]:
+    """
+    Build the cursor for the page following `rows`, or None on the last page.
+    `sort_key` must return the same value the query sorted on.
+    """
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(sort_key(last), last.id)
+
+
+def paginate(statement: Any, cursor: Optional[Cursor], skip: int, limit: int) -> Any:
+    """
+    Apply skip/limit to a statement already passed through apply_cursor.
+    skip is ignored when paging by cursor.
+    """
+    if cursor is None:
+        statement = statement.offset(skip)
+    return statement.limit(limit)
@@ -0,0 +1,60 @@
+import uuid
+from typing import List, Optional
+
+from app.core.cache import TaggedCache
+from app.core.config import settings
+from app.crud.pagination import Cursor
+
+# Rendered responses of the read-heavy social endpoints. Entries are tagged
+# with what they were built from and orphaned by the write paths below.
+response_cache = TaggedCache(
+    "response",
+    maxsize=settings.RESPONSE_CACHE_MAX_SIZE,
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+PUBLIC_FEED_TAG = "public-feed"
+
+
+def user_tag(user_id: uuid.UUID) -> str:
+    """
+    Tag of responses built from a user's row (profile, follow counts, name).
+    """
+    return f"user:{user_id}"
+
+
+def posts_tag(user_id: uuid.UUID) -> str:
+    """
+    Tag of responses listing a user's workout posts.
+    """
+    return f"posts:{user_id}"
+
+
+def page_key(cursor: Optional[Cursor], skip: int, limit: int) -> str:
+    """
+    The part of a cache key that identifies a page.
+    """
+    position = f"{cursor.sort_value.isoformat()}/{cursor.id}" if cursor else skip
+    return f"{position}:{limit}"
+
+
+def user_posts_tags(user_id: uuid.UUID) -> List[str]:
+    return [posts_tag(user_id), user_tag(user_id)]
+
+
+def invalidate_user_responses(user_id: uuid.UUID) -> None:
+    """
+    Drop cached responses built from a user's row, after it changed.
+    """
+    response_cache.invalidate(user_tag(user_id))
+
+
+def invalidate_post_responses(user_id: uuid.UUID, *, public: bool = True) -> None:
+    """
+    Drop cached responses listing a user's posts, after one of them was
+    created, changed or deleted. `public` also drops the public feed.
+    """
+    tags = [posts_tag(user_id)]
+    if public:
+        tags.append(PUBLIC_FEED_TAG)
+    response_cache.invalidate(*tags)
@@ -0,0 +1,120 @@
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import Select, case
+from sqlmodel import Session, func, or_, select
+
+from app.core.cache import Cache
+from app.core.config import settings
+from app.models.user import User
+
+# Typeahead suggestions by query, as [id, full_name] pairs. Names can be up
+# to TYPEAHEAD_CACHE_TTL_SECONDS stale, which is fine for suggestions.
+typeahead_cache = Cache(
+    "typeahead",
+    maxsize=settings.TYPEAHEAD_CACHE_MAX_SIZE,
+    ttl=settings.TYPEAHEAD_CACHE_TTL_SECONDS,
+)
+
+# Expressions covered by the search indexes of the 20261018_user_search
+# migration: trigram GIN indexes for substring matches and text_pattern_ops
+# b-trees for prefix matches
+SEARCH_NAME = func.lower(User.full_name)
+SEARCH_EMAIL = func.lower(User.email)
+
+
+def normalize_search_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def user_search_filter(query: str) -> Any:
+    """
+    Condition for users matching a normalized query. Queries shorter than
+    USER_SEARCH_MIN_SUBSTRING_LENGTH match name and email prefixes only:
+    they yield no trigrams, so a substring match would scan every user.
+    """
+    if len(query) < settings.USER_SEARCH_MIN_SUBSTRING_LENGTH:
+        return or_(
+            SEARCH_NAME.startswith(query, autoescape=True),
+            SEARCH_EMAIL.startswith(query, autoescape=True),
+        )
+    return or_(
+        SEARCH_NAME.contains(query, autoescape=True),
+        SEARCH_EMAIL.contains(query, autoescape=True),
+    )
+
+
+def user_search_order(session: Session, query: str) -> List[Any]:
+    """
+    Rank matches: prefix matches first, then by trigram similarity to the
+    query on PostgreSQL, or by how early the query appears on SQLite, which
+    has no pg_trgm. Ties are broken by id so pages are stable.
+    """
+    prefix_first = case(
+        (
+            or_(
+                SEARCH_NAME.startswith(query, autoescape=True),
+                SEARCH_EMAIL.startswith(query, autoescape=True),
+            ),
+            0,
+        ),
+        else_=1,
+    )
+    if session.get_bind().dialect.name == "postgresql":
+        closeness = func.greatest(
+            func.similarity(SEARCH_NAME, query), func.similarity(SEARCH_EMAIL, query)
+        ).desc()
+    else:
+        # instr() is 0 when there is no match; push those to the end
+        position = func.coalesce(func.nullif(func.instr(SEARCH_NAME, query), 0), 1_000)
+        closeness = func.min(
+            position, func.coalesce(func.nullif(func.instr(SEARCH_EMAIL, query), 0), 1_000)
+        )
+    return [prefix_first, closeness, User.full_name, User.id]
+
+
+def capped_count(session: Session, statement: Select, cap: int) -> int:
+    """
+    Count the rows of `statement`, stopping at `cap`, so a broad query
+    doesn't count every match on each keystroke.
+    """
+    limited = statement.limit(cap).subquery()
+    return session.exec(select(func.count()).select_from(limited)).one()
+
+
+def typeahead_users(
+    *, session: Session, query: str, viewer_id: uuid.UUID, limit: int = 8
+) -> List[Dict[str, Any]]:
+    """
+    Suggest users whose name or email starts with the query, as id and
+    full_name only. One query on the prefix indexes, without the social
+    stats of search_users, and cached per query so the popular prefixes
+    of each keystroke are served from memory.
+    """
+    query = normalize_search_query(query)
+    key = f"{query}:{limit}"
+    suggestions = typeahead_cache.get(key)
+    if suggestions is None:
+        # One extra row so the viewer can be dropped from a shared entry
+        statement = (
+            select(User.id, User.full_name)
+            .where(
+                or_(
+                    SEARCH_NAME.startswith(query, autoescape=True),
+                    SEARCH_EMAIL.startswith(query, autoescape=True),
+                )
+            )
+            .order_by(SEARCH_NAME, User.id)
+            .limit(limit + 1)
+        )
+        suggestions = [
+            [str(user_id), full_name] for user_id, full_name in session.exec(statement)
+        ]
+        typeahead_cache.set(key, suggestions)
+
+    viewer = str(viewer_id)
+    return [
+        {"id": uuid.UUID(user_id), "full_name": full_name}
+        for user_id, full_name in suggestions
+        if user_id != viewer
+    ][:limit]
@@ -1,11 +1,50 @@
 import uuid
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
-from sqlmodel import Session, select, func, or_, and_
+from sqlalchemy import Select, delete, update
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select, func, and_
 
-from app.models.social import UserFollow, WorkoutPost, WorkoutPostCreate, WorkoutPostUpdate
-from app.models.user import User
+from app.core.config import settings
+
+from app.crud.feed import (
+    add_follow_to_feeds,
+    add_follows_to_feeds,
+    fan_out_workout_post,
+    get_feed_posts_page,
+    refresh_workout_post_fanout,
+    remove_follow_from_feeds,
+    remove_follows_from_feeds,
+    remove_workout_post_from_feeds,
+)
+from app.crud.follow_graph import are_mutual, follows, invalidate_following
+from app.crud.pagination import Cursor, apply_cursor, next_cursor, paginate
+from app.crud.response_cache import (
+    PUBLIC_FEED_TAG,
+    invalidate_post_responses,
+    page_key,
+    response_cache,
+    user_posts_tags,
+    user_tag,
+)
+from app.crud.search import (
+    capped_count,
+    normalize_search_query,
+    user_search_filter,
+    user_search_order,
+)
+from app.crud.suggestions import invalidate_follow_suggestions, remove_follow_suggestions
+from app.crud.user import invalidate_cached_user
+from app.models.social import (
+    UserFollow,
+    WorkoutPost,
+    WorkoutPostCreate,
+    WorkoutPostPublic,
+    WorkoutPostsPublic,
+    WorkoutPostUpdate,
+)
+from app.models.user import User, UserPublic, UserPublicExtended
 
 
 # User Follow Operations
@@ -29,7 +68,17 @@ def follow_user(*, session: Session, follower_id: uuid.UUID, followed_id: uuid.U
     # Create new follow relationship
     follow = UserFollow(follower_id=follower_id, followed_id=followed_id)
     session.add(follow)
+    session.flush()
+    _adjust_follow_counters(
+        session=session, follower_id=follower_id, followed_id=followed_id, delta=1
+    )
+    add_follow_to_feeds(session=session, follower_id=follower_id, followed_id=followed_id)
     session.commit()
+    invalidate_following(follower_id)
+    remove_follow_suggestions(follower_id, [followed_id])
+    # Cached rows and profile responses carry the old counters
+    invalidate_cached_user(follower_id)
+    invalidate_cached_user(followed_id)
     session.refresh(follow)
     return follow
 
@@ -48,11 +97,324 @@ def unfollow_user(*, session: Session, follower_id: uuid.UUID, followed_id: uuid
     
     if follow:
         session.delete(follow)
+        session.flush()
+        _adjust_follow_counters(
+            session=session, follower_id=follower_id, followed_id=followed_id, delta=-1
+        )
+        remove_follow_from_feeds(
+            session=session, follower_id=follower_id, followed_id=followed_id
+        )
         session.commit()
+        invalidate_following(follower_id)
+        invalidate_follow_suggestions(follower_id)
+        invalidate_cached_user(follower_id)
+        invalidate_cached_user(followed_id)
         return True
     return False
 
 
+def _adjust_follow_counters(
+    *, session: Session, follower_id: uuid.UUID, followed_id: uuid.UUID, delta: int
+) -> None:
+    """
+    Apply a follow (+1) or unfollow (-1) to the denormalized counters in the
+    same transaction as the UserFollow change. The increments run in SQL so
+    concurrent follows of the same user don't overwrite each other.
+    """
+    session.execute(
+        update(User)
+        .where(User.id == follower_id)
+        .values(following_count=User.following_count + delta)
+    )
+    session.execute(
+        update(User)
+        .where(User.id == followed_id)
+        .values(follower_count=User.follower_count + delta)
+    )
+
+
+def follow_users(
+    *, session: Session, follower_id: uuid.UUID, followed_ids: List[uuid.UUID]
+) -> Dict[uuid.UUID, str]:
+    """
+    Follow many users in one transaction. Existence is checked with one
+    query and the follows are inserted with one INSERT ... ON CONFLICT DO
+    NOTHING, so only the new ones come back and update the counters and
+    feeds. Returns, per requested id, "followed", "already_following",
+    "not_found" or "self".
+    """
+    requested = list(dict.fromkeys(followed_ids))
+    candidates = [user_id for user_id in requested if user_id != follower_id]
+    existing = set()
+    if candidates:
+        existing = set(session.exec(select(User.id).where(User.id.in_(candidates))).all())
+
+    new_ids: Set[uuid.UUID] = set()
+    if existing:
+        if session.get_bind().dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+
+        now = datetime.utcnow()
+        stmt = (
+            insert(UserFollow)
+            .values(
+                [
+                    {"follower_id": follower_id, "followed_id": followed_id, "created_at": now}
+                    for followed_id in existing
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["follower_id", "followed_id"])
+            .returning(UserFollow.followed_id)
+        )
+        new_ids = set(session.execute(stmt).scalars().all())
+
+    if new_ids:
+        session.execute(
+            update(User)
+            .where(User.id == follower_id)
+            .values(following_count=User.following_count + len(new_ids))
+        )
+        session.execute(
+            update(User)
+            .where(User.id.in_(new_ids))
+            .values(follower_count=User.follower_count + 1)
+        )
+        add_follows_to_feeds(session=session, follower_id=follower_id, followed_ids=new_ids)
+    session.commit()
+
+    if new_ids:
+        invalidate_following(follower_id)
+        remove_follow_suggestions(follower_id, new_ids)
+        for user_id in (follower_id, *new_ids):
+            invalidate_cached_user(user_id)
+
+    results: Dict[uuid.UUID, str] = {}
+    for user_id in requested:
+        if user_id == follower_id:
+            results[user_id] = "self"
+        elif user_id not in existing:
+            results[user_id] = "not_found"
+        elif user_id in new_ids:
+            results[user_id] = "followed"
+        else:
+            results[user_id] = "already_following"
+    return results
+
+
+def unfollow_users(
+    *, session: Session, follower_id: uuid.UUID, followed_ids: List[uuid.UUID]
+) -> Dict[uuid.UUID, str]:
+    """
+    Unfollow many users with one DELETE ... RETURNING in one transaction.
+    Returns, per requested id, "unfollowed" or "not_following".
+    """
+    requested = list(dict.fromkeys(followed_ids))
+    removed: Set[uuid.UUID] = set()
+    if requested:
+        stmt = (
+            delete(UserFollow)
+            .where(UserFollow.follower_id == follower_id)
+            .where(UserFollow.followed_id.in_(requested))
+            .returning(UserFollow.followed_id)
+        )
+        removed = set(session.execute(stmt).scalars().all())
+
+    if removed:
+        session.execute(
+            update(User)
+            .where(User.id == follower_id)
+            .values(following_count=User.following_count - len(removed))
+        )
+        session.execute(
+            update(User)
+            .where(User.id.in_(removed))
+            .values(follower_count=User.follower_count - 1)
+        )
+        remove_follows_from_feeds(
+            session=session, follower_id=follower_id, followed_ids=removed
+        )
+    session.commit()
+
+    if removed:
+        invalidate_following(follower_id)
+        invalidate_follow_suggestions(follower_id)
+        for user_id in (follower_id, *removed):
+            invalidate_cached_user(user_id)
+
+    return {
+        user_id: "unfollowed" if user_id in removed else "not_following"
+        for user_id in requested
+    }
+
+
+def get_user_ids_by_email_hash(
+    *, session: Session, email_hashes: List[str]
+) -> Dict[str, uuid.UUID]:
+    """
+    Map the hashed emails (see app.models.user.hash_email) of a contact
+    import to the ids of the users they belong to, with one query.
+    """
+    hashes = {email_hash.lower() for email_hash in email_hashes}
+    if not hashes:
+        return {}
+    rows = session.exec(
+        select(User.email_hash, User.id).where(User.email_hash.in_(hashes))
+    ).all()
+    return {email_hash: user_id for email_hash, user_id in rows}
+
+
+def release_user_follows(*, session: Session, user_id: uuid.UUID) -> None:
+    """
+    Decrement the counters of everyone a user follows or is followed by.
+    Call before deleting the user, whose UserFollow rows go with it.
+    """
+    session.execute(
+        update(User)
+        .where(
+            User.id.in_(
+                select(UserFollow.followed_id).where(UserFollow.follower_id == user_id)
+            )
+        )
+        .values(follower_count=User.follower_count - 1)
+    )
+    session.execute(
+        update(User)
+        .where(
+            User.id.in_(
+                select(UserFollow.follower_id).where(UserFollow.followed_id == user_id)
+            )
+        )
+        .values(following_count=User.following_count - 1)
+    )
+
+
+def select_users_with_stats(*, viewer_id: uuid.UUID) -> Select:
+    """
+    Build a SELECT of (User, follower_count, following_count, is_following)
+    so a whole page of users and their social stats loads in one query.
+    Callers add their own joins, filters, ordering and pagination.
+    """
+    if settings.SOCIAL_STATS_USE_COUNTERS:
+        follower_count = User.follower_count
+        following_count = User.following_count
+    else:
+        followers_alias = aliased(UserFollow)
+        following_alias = aliased(UserFollow)
+        follower_count = (
+            select(func.count())
+            .select_from(followers_alias)
+            .where(followers_alias.followed_id == User.id)
+            .correlate(User)
+            .scalar_subquery()
+        )
+        following_count = (
+            select(func.count())
+            .select_from(following_alias)
+            .where(following_alias.follower_id == User.id)
+            .correlate(User)
+            .scalar_subquery()
+        )
+    viewer_follow = aliased(UserFollow)
+    is_following_user = (
+        select(viewer_follow.follower_id)
+        .where(
+            viewer_follow.follower_id == viewer_id,
+            viewer_follow.followed_id == User.id,
+        )
+        .correlate(User)
+        .exists()
+    )
+    return select(
+        User,
+        follower_count.label("follower_count"),
+        following_count.label("following_count"),
+        is_following_user.label("is_following"),
+    )
+
+
+def followers_with_stats_statement(
+    *, user_id: uuid.UUID, viewer_id: uuid.UUID, skip: int = 0, limit: int = 100
+) -> Select:
+    """
+    Build a page of a user's followers with their social stats.
+    """
+    return (
+        select_users_with_stats(viewer_id=viewer_id)
+        .join(UserFollow, User.id == UserFollow.follower_id)
+        .where(UserFollow.followed_id == user_id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def following_with_stats_statement(
+    *, user_id: uuid.UUID, viewer_id: uuid.UUID, skip: int = 0, limit: int = 100
+) -> Select:
+    """
+    Build a page of the users a user follows with their social stats.
+    """
+    return (
+        select_users_with_stats(viewer_id=viewer_id)
+        .join(UserFollow, User.id == UserFollow.followed_id)
+        .where(UserFollow.follower_id == user_id)
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def user_stats_dict(row) -> dict:
+    """
+    Convert a row of select_users_with_stats to a UserSearchResult dict.
+    """
+    user, follower_count, following_count, is_following_user = row
+    return {
+        "id": user.id,
+        "email": user.email,
+        "full_name": user.full_name,
+        "is_active": user.is_active,
+        "is_superuser": user.is_superuser,
+        "gender": user.gender,
+        "date_of_birth": user.date_of_birth,
+        "weight": user.weight,
+        "height": user.height,
+        "follower_count": follower_count,
+        "following_count": following_count,
+        "is_following": bool(is_following_user),
+    }
+
+
+def get_followers_with_stats(
+    *, session: Session, user_id: uuid.UUID, viewer_id: uuid.UUID, skip: int = 0, limit: int = 100
+) -> Tuple[List[dict], int]:
+    """
+    Get users who follow the specified user, with their social stats and
+    whether the viewer follows them.
+    """
+    count = get_follower_count(session=session, user_id=user_id)
+    statement = followers_with_stats_statement(
+        user_id=user_id, viewer_id=viewer_id, skip=skip, limit=limit
+    )
+    rows = session.exec(statement).all()
+    return [user_stats_dict(row) for row in rows], count
+
+
+def get_following_with_stats(
+    *, session: Session, user_id: uuid.UUID, viewer_id: uuid.UUID, skip: int = 0, limit: int = 100
+) -> Tuple[List[dict], int]:
+    """
+    Get users that the specified user follows, with their social stats and
+    whether the viewer follows them.
+    """
+    count = get_following_count(session=session, user_id=user_id)
+    statement = following_with_stats_statement(
+        user_id=user_id, viewer_id=viewer_id, skip=skip, limit=limit
+    )
+    rows = session.exec(statement).all()
+    return [user_stats_dict(row) for row in rows], count
+
+
 def get_followers(*, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100) -> Tuple[List[User], int]:
     """
     Get users who follow the specified user.
@@ -105,51 +467,140 @@ def get_following(*, session: Session, user_id: uuid.UUID, skip: int = 0, limit:
 
 def is_following(*, session: Session, follower_id: uuid.UUID, followed_id: uuid.UUID) -> bool:
     """
-    Check if a user is following another user.
+    Check if a user is following another user, using the follow graph cache.
     """
-    statement = select(UserFollow).where(
-        and_(
-            UserFollow.follower_id == follower_id,
-            UserFollow.followed_id == followed_id
-        )
-    )
-    follow = session.exec(statement).first()
-    return follow is not None
+    return follows(session=session, follower_id=follower_id, followed_id=followed_id)
 
 
-def get_follower_count(*, session: Session, user_id: uuid.UUID) -> int:
+def follower_count_statement(user_id: uuid.UUID) -> Select:
     """
-    Get the number of followers for a user.
+    Build a SELECT of a user's follower count.
     """
-    statement = (
+    if settings.SOCIAL_STATS_USE_COUNTERS:
+        return select(User.follower_count).where(User.id == user_id)
+    return (
         select(func.count())
         .select_from(UserFollow)
         .where(UserFollow.followed_id == user_id)
     )
-    return session.exec(statement).one()
 
 
-def get_following_count(*, session: Session, user_id: uuid.UUID) -> int:
+def following_count_statement(user_id: uuid.UUID) -> Select:
     """
-    Get the number of users a user is following.
+    Build a SELECT of the number of users a user is following.
     """
-    statement = (
+    if settings.SOCIAL_STATS_USE_COUNTERS:
+        return select(User.following_count).where(User.id == user_id)
+    return (
         select(func.count())
         .select_from(UserFollow)
         .where(UserFollow.follower_id == user_id)
     )
-    return session.exec(statement).one()
+
+
+def get_follower_count(*, session: Session, user_id: uuid.UUID) -> int:
+    """
+    Get the number of followers for a user.
+    """
+    return session.exec(follower_count_statement(user_id)).first() or 0
+
+
+def get_following_count(*, session: Session, user_id: uuid.UUID) -> int:
+    """
+    Get the number of users a user is following.
+    """
+    return session.exec(following_count_statement(user_id)).first() or 0
 
 
 def is_mutual_follow(*, session: Session, user1_id: uuid.UUID, user2_id: uuid.UUID) -> bool:
     """
-    Check if two users follow each other (mutual follow).
+    Check if two users follow each other (mutual follow), using the follow
+    graph cache.
     """
-    # Check if user1 follows user2 AND user2 follows user1
-    user1_follows_user2 = is_following(session=session, follower_id=user1_id, followed_id=user2_id)
-    user2_follows_user1 = is_following(session=session, follower_id=user2_id, followed_id=user1_id)
-    
-    return user1_follows_user2 and user2_follows_user1
+    return are_mutual(session=session, user1_id=user1_id, user2_id=user2_id)
+
+
+def get_mutual_follow_ids(
+    *, session: Session, user_id: uuid.UUID, other_ids: Set[uuid.UUID]
+) -> Set[uuid.UUID]:
+    """
+    Return the subset of other_ids that have a mutual follow with user_id,
+    using a single self-join instead of two lookups per user.
+    """
+    if not other_ids:
+        return set()
+    return set(session.exec(mutual_follow_ids_statement(user_id, other_ids)).all())
+
+
+def mutual_follow_ids_statement(user_id: uuid.UUID, other_ids: Set[uuid.UUID]) -> Select:
+    """
+    Build a SELECT of the ids in other_ids that follow user_id back.
+    """
+    reverse = aliased(UserFollow)
+    return (
+        select(UserFollow.followed_id)
+        .join(
+            reverse,
+            and_(
+                reverse.follower_id == UserFollow.followed_id,
+                reverse.followed_id == UserFollow.follower_id,
+            ),
+        )
+        .where(UserFollow.follower_id == user_id)
+        .where(UserFollow.followed_id.in_(other_ids))
+    )
+
+
+def enrich_workout_posts(
+    *, session: Session, posts: List[WorkoutPost], viewer_id: uuid.UUID
+) -> List[WorkoutPostPublic]:
+    """
+    Convert a page of posts to WorkoutPostPublic with the author's full name and
+    the viewer's mutual follow status, resolved with one query each for the
+    whole page.
+    """
+    author_ids = {post.user_id for post in posts}
+    full_names = {}
+    if author_ids:
+        full_names = dict(session.exec(author_names_statement(author_ids)).all())
+    mutual_ids = get_mutual_follow_ids(
+        session=session, user_id=viewer_id, other_ids=author_ids - {viewer_id}
+    )
+    return workout_posts_public(
+        posts, full_names=full_names, mutual_ids=mutual_ids, viewer_id=viewer_id
+    )
+
+
+def author_names_statement(author_ids: Set[uuid.UUID]) -> Select:
+    """
+    Build a SELECT of (id, full_name) for the authors of a page of posts.
+    """
+    return select(User.id, User.full_name).where(User.id.in_(author_ids))
+
+
+def workout_posts_public(
+    posts: List[WorkoutPost],
+    *,
+    full_names: Dict[uuid.UUID, Optional[str]],
+    mutual_ids: Set[uuid.UUID],
+    viewer_id: uuid.UUID,
+) -> List[WorkoutPostPublic]:
+    """
+    Build the public representation of a page of posts from preloaded
+    author names and mutual follow ids.
+    """
+    return [
+        WorkoutPostPublic.model_validate(
+            post,
+            update={
+                "user_full_name": full_names.get(post.user_id),
+                # User's own posts count as mutual for privacy logic
+                "is_mutual_follow": post.user_id == viewer_id
+                or post.user_id in mutual_ids,
+            },
+        )
+        for post in posts
+    ]
 
 
 # Workout Post Operations
@@ -160,7 +611,11 @@ def create_workout_post(*, session: Session, post_in: WorkoutPostCreate, user_id
     """
     db_post = WorkoutPost.model_validate(post_in, update={"user_id": user_id})
     session.add(db_post)
+    session.flush()
+    fan_out_workout_post(session=session, post=db_post)
+    is_public = db_post.is_public
     session.commit()
+    invalidate_post_responses(user_id, public=is_public)
     session.refresh(db_post)
     return db_post
 
@@ -173,172 +628,170 @@ def get_workout_post(*, session: Session, post_id: uuid.UUID) -> Optional[Workou
 
 
 def get_user_workout_posts(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> Tuple[List[WorkoutPost], int]:
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
     """
     Get workout posts for a specific user.
+    The count is None when include_count is False.
     """
-    count_statement = (
-        select(func.count())
-        .select_from(WorkoutPost)
-        .where(WorkoutPost.user_id == user_id)
-    )
-    count = session.exec(count_statement).one()
-    
-    statement = (
-        select(WorkoutPost)
-        .where(WorkoutPost.user_id == user_id)
-        .order_by(WorkoutPost.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+    statement, count_statement = user_workout_posts_statements(
+        user_id=user_id, skip=skip, limit=limit, cursor=cursor
     )
+    count = session.exec(count_statement).one() if include_count else None
     posts = session.exec(statement).all()
     
     return posts, count
 
 
+def user_workout_posts_statements(
+    *,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+) -> Tuple[Select, Select]:
+    """
+    Build the page and count statements for a user's workout posts.
+    """
+    condition = WorkoutPost.user_id == user_id
+    statement = apply_cursor(
+        select(WorkoutPost).where(condition),
+        cursor,
+        WorkoutPost.created_at,
+        WorkoutPost.id,
+    )
+    count_statement = select(func.count()).select_from(WorkoutPost).where(condition)
+    return paginate(statement, cursor, skip, limit), count_statement
+
+
 def get_feed_posts(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100, feed_type: str = "personal"
-) -> Tuple[List[WorkoutPost], int]:
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    feed_type: str = "personal",
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
     """
     Get workout posts based on feed type with privacy filtering.
     
     Args:
         session: Database session
         user_id: Current user's ID
-        skip: Number of posts to skip for pagination
+        skip: Number of posts to skip for pagination (ignored when cursor is set)
         limit: Maximum number of posts to return
         feed_type: "personal", "public", or "combined"
+        cursor: Keyset position of the last post of the previous page
+        include_count: Whether to run the total count query
     """
+    kwargs = dict(
+        session=session,
+        user_id=user_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
+    )
     if feed_type == "public":
-        return get_public_feed_posts(session=session, user_id=user_id, skip=skip, limit=limit)
+        return get_public_feed_posts(**kwargs)
     elif feed_type == "combined":
-        return get_combined_feed_posts(session=session, user_id=user_id, skip=skip, limit=limit)
+        return get_combined_feed_posts(**kwargs)
     else:  # personal feed
-        return get_personal_feed_posts(session=session, user_id=user_id, skip=skip, limit=limit)
+        return get_personal_feed_posts(**kwargs)
 
 
 def get_personal_feed_posts(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> Tuple[List[WorkoutPost], int]:
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
     """
     Get workout posts from users that the specified user follows (personal feed).
     Includes privacy filtering: private posts only visible if mutual follow.
+
+    Reads the materialized feed maintained by app.crud.feed, so the cost does
+    not depend on how many users are followed.
     """
-    # Early check: if no WorkoutPost records exist, return empty result immediately
-    total_posts_check = session.exec(select(func.count()).select_from(WorkoutPost)).one()
-    if total_posts_check == 0:
-        return [], 0
-    
-    # Get IDs of users that the current user follows
-    following_statement = (
-        select(UserFollow.followed_id)
-        .where(UserFollow.follower_id == user_id)
-    )
-    following_ids = session.exec(following_statement).all()
-    
-    # Include the user's own posts in the feed
-    following_ids.append(user_id)
-    
-    # If no one to follow (including self), return empty
-    if not following_ids:
-        return [], 0
-    
-    # Build privacy filter conditions
-    privacy_conditions = []
-    
-    for followed_id in following_ids:
-        if followed_id == user_id:
-            # User's own posts - always visible
-            privacy_conditions.append(
-                WorkoutPost.user_id == user_id
-            )
-        else:
-            # Posts from followed users
-            is_mutual = is_mutual_follow(session=session, user1_id=user_id, user2_id=followed_id)
-            
-            if is_mutual:
-                # Mutual follow - can see both public and private posts
-                privacy_conditions.append(
-                    WorkoutPost.user_id == followed_id
-                )
-            else:
-                # Not mutual - only public posts
-                privacy_conditions.append(
-                    and_(
-                        WorkoutPost.user_id == followed_id,
-                        WorkoutPost.is_public == True
-                    )
-                )
-    
-    if not privacy_conditions:
-        return [], 0
-    
-    # Combine all conditions with OR
-    combined_condition = or_(*privacy_conditions)
-    
-    # Count posts
-    count_statement = (
-        select(func.count())
-        .select_from(WorkoutPost)
-        .where(combined_condition)
-    )
-    count = session.exec(count_statement).one()
-    
-    # Get posts with pagination
-    statement = (
-        select(WorkoutPost)
-        .where(combined_condition)
-        .order_by(WorkoutPost.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+    return get_feed_posts_page(
+        session=session,
+        user_id=user_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
     )
-    posts = session.exec(statement).all()
-    
-    return posts, count
 
 
 def get_public_feed_posts(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> Tuple[List[WorkoutPost], int]:
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
     """
     Get all public workout posts from all users (discovery feed).
     """
-    # Early check: if no WorkoutPost records exist, return empty result immediately
-    total_posts_check = session.exec(select(func.count()).select_from(WorkoutPost)).one()
-    if total_posts_check == 0:
-        return [], 0
-    
-    # Count all public posts
-    count_statement = (
-        select(func.count())
-        .select_from(WorkoutPost)
-        .where(WorkoutPost.is_public == True)
-    )
-    count = session.exec(count_statement).one()
-    
-    # Get public posts with pagination
-    statement = (
-        select(WorkoutPost)
-        .where(WorkoutPost.is_public == True)
-        .order_by(WorkoutPost.created_at.desc())
-        .offset(skip)
-        .limit(limit)
+    statement, count_statement = public_feed_statements(
+        skip=skip, limit=limit, cursor=cursor
     )
+    count = session.exec(count_statement).one() if include_count else None
     posts = session.exec(statement).all()
     
     return posts, count
 
 
+def public_feed_statements(
+    *, skip: int = 0, limit: int = 100, cursor: Optional[Cursor] = None
+) -> Tuple[Select, Select]:
+    """
+    Build the page and count statements for the public discovery feed.
+    """
+    condition = WorkoutPost.is_public == True
+    statement = apply_cursor(
+        select(WorkoutPost).where(condition),
+        cursor,
+        WorkoutPost.created_at,
+        WorkoutPost.id,
+    )
+    count_statement = select(func.count()).select_from(WorkoutPost).where(condition)
+    return paginate(statement, cursor, skip, limit), count_statement
+
+
 def get_combined_feed_posts(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> Tuple[List[WorkoutPost], int]:
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
     """
     Get combined feed: personal feed + additional public posts.
     """
     # Get personal feed posts first
     personal_posts, personal_count = get_personal_feed_posts(
-        session=session, user_id=user_id, skip=0, limit=limit * 2  # Get more to mix
+        session=session,
+        user_id=user_id,
+        skip=0,
+        limit=limit * 2,  # Get more to mix
+        cursor=cursor,
+        include_count=include_count,
     )
     
     # Get personal post IDs to exclude from public feed
@@ -350,23 +803,27 @@ def get_combined_feed_posts(
         ~WorkoutPost.id.in_(personal_post_ids) if personal_post_ids else True
     )
     
-    additional_public_statement = (
-        select(WorkoutPost)
-        .where(public_condition)
-        .order_by(WorkoutPost.created_at.desc())
-        .limit(limit)
-    )
+    additional_public_statement = apply_cursor(
+        select(WorkoutPost).where(public_condition),
+        cursor,
+        WorkoutPost.created_at,
+        WorkoutPost.id,
+    ).limit(limit)
     additional_public_posts = session.exec(additional_public_statement).all()
     
     # Combine and sort by created_at
     all_posts = personal_posts + additional_public_posts
-    all_posts.sort(key=lambda x: x.created_at, reverse=True)
+    all_posts.sort(key=lambda x: (x.created_at, x.id), reverse=True)
     
     # Apply pagination to combined results
+    if cursor is not None:
+        skip = 0
     paginated_posts = all_posts[skip:skip + limit]
     
     # Count would be total of personal + additional public (approximation)
-    total_count = personal_count + len(additional_public_posts)
+    total_count = None
+    if include_count:
+        total_count = personal_count + len(additional_public_posts)
     
     return paginated_posts, total_count
 
@@ -378,10 +835,20 @@ def update_workout_post(
     Update a workout post.
     """
     update_dict = post_in.model_dump(exclude_unset=True)
+    privacy_changed = (
+        update_dict.get("is_public") is not None
+        and update_dict["is_public"] != db_post.is_public
+    )
     update_dict["updated_at"] = datetime.utcnow()
+    affects_public_feed = db_post.is_public or bool(update_dict.get("is_public"))
     db_post.sqlmodel_update(update_dict)
     session.add(db_post)
+    if privacy_changed:
+        session.flush()
+        refresh_workout_post_fanout(session=session, post=db_post)
+    author_id = db_post.user_id
     session.commit()
+    invalidate_post_responses(author_id, public=affects_public_feed)
     session.refresh(db_post)
     return db_post
 
@@ -392,8 +859,11 @@ def delete_workout_post(*, session: Session, post_id: uuid.UUID) -> bool:
     """
     post = session.get(WorkoutPost, post_id)
     if post:
+        author_id, was_public = post.user_id, post.is_public
+        remove_workout_post_from_feeds(session=session, post_id=post_id)
         session.delete(post)
         session.commit()
+        invalidate_post_responses(author_id, public=was_public)
         return True
     return False
 
@@ -407,64 +877,196 @@ def search_users(
     limit: int = 20
 ) -> Tuple[List[dict], int]:
     """
-    Search for users by full_name or email (case-insensitive, partial matches).
-    Returns users with their social stats and is_following status.
-    Excludes the current user from results.
+    Search for users by full_name or email (case-insensitive, partial matches),
+    best matches first. Returns users with their social stats and
+    is_following status, and the number of matches capped at
+    USER_SEARCH_COUNT_CAP. Excludes the current user from results.
     """
-    # Create the search pattern for case-insensitive partial matching
-    search_pattern = f"%{query.lower()}%"
-    
-    # Base query to find users matching the search criteria
-    base_query = (
-        select(User)
-        .where(
-            and_(
-                User.id != current_user_id,  # Exclude current user
-                or_(
-                    func.lower(User.full_name).like(search_pattern),
-                    func.lower(User.email).like(search_pattern)
-                )
-            )
-        )
+    query = normalize_search_query(query)
+    search_filter = and_(
+        User.id != current_user_id,  # Exclude current user
+        user_search_filter(query),
     )
-    
-    # Count total matching users
-    count_statement = select(func.count()).select_from(base_query.subquery())
-    count = session.exec(count_statement).one()
-    
-    # Get paginated results
-    users_statement = base_query.offset(skip).limit(limit)
-    users = session.exec(users_statement).all()
-    
-    # Build result with social stats and is_following status
-    result = []
-    for user in users:
-        # Get follower and following counts
-        follower_count = get_follower_count(session=session, user_id=user.id)
-        following_count = get_following_count(session=session, user_id=user.id)
-        
-        # Check if current user is following this user
-        is_following_user = is_following(
+
+    count = capped_count(
+        session, select(User.id).where(search_filter), settings.USER_SEARCH_COUNT_CAP
+    )
+
+    # Get paginated results with social stats in the same query
+    users_statement = (
+        select_users_with_stats(viewer_id=current_user_id)
+        .where(search_filter)
+        .order_by(*user_search_order(session, query))
+        .offset(skip)
+        .limit(limit)
+    )
+    result = [user_stats_dict(row) for row in session.exec(users_statement).all()]
+
+    return result, count
+
+
+# Cached responses
+#
+# Entries are only ever shared between viewers who would get the same
+# response: the public feed is viewer-independent apart from the mutual
+# follow flags, which are re-resolved on every hit, and a user's posts are
+# cached per relation class of the viewer (self, mutual or other).
+
+def public_feed_cache_key(
+    *, cursor: Optional[Cursor], skip: int, limit: int, include_count: bool
+) -> str:
+    """
+    Resolve the response cache key of a public feed page.
+    """
+    return response_cache.entry_key(
+        f"public-feed:{page_key(cursor, skip, limit)}:{include_count}", [PUBLIC_FEED_TAG]
+    )
+
+
+def set_author_names(
+    posts: List[WorkoutPostPublic], *, full_names: Dict[uuid.UUID, Optional[str]]
+) -> None:
+    """
+    Set user_full_name on a page of posts from freshly loaded author names.
+    """
+    for post in posts:
+        post.user_full_name = full_names.get(post.user_id)
+
+
+def set_mutual_follows(
+    posts: List[WorkoutPostPublic], *, mutual_ids: Set[uuid.UUID], viewer_id: uuid.UUID
+) -> None:
+    """
+    Set is_mutual_follow on a page of posts for the given viewer.
+    """
+    for post in posts:
+        post.is_mutual_follow = post.user_id == viewer_id or post.user_id in mutual_ids
+
+
+def get_public_feed_page_cached(
+    *,
+    session: Session,
+    viewer_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> WorkoutPostsPublic:
+    """
+    Get a page of the public feed from the response cache, computing and
+    storing it on a miss. Author names and mutual follow flags depend on
+    more than the public feed tag, so a hit reloads them for the page's
+    authors: one query each.
+    """
+    entry_key = public_feed_cache_key(
+        cursor=cursor, skip=skip, limit=limit, include_count=include_count
+    )
+    cached = response_cache.get(entry_key)
+    if cached is None:
+        posts, count = get_public_feed_posts(
             session=session,
-            follower_id=current_user_id,
-            followed_id=user.id
+            user_id=viewer_id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_count=include_count,
         )
-        
-        # Create user dict with extended info
-        user_dict = {
-            "id": user.id,
-            "email": user.email,
-            "full_name": user.full_name,
-            "is_active": user.is_active,
-            "is_superuser": user.is_superuser,
-            "gender": user.gender,
-            "date_of_birth": user.date_of_birth,
-            "weight": user.weight,
-            "height": user.height,
-            "follower_count": follower_count,
-            "following_count": following_count,
-            "is_following": is_following_user
-        }
-        result.append(user_dict)
-    
-    return result, count
\ No newline at end of file
+        page = WorkoutPostsPublic(
+            data=enrich_workout_posts(session=session, posts=posts, viewer_id=viewer_id),
+            count=count,
+            next_cursor=next_cursor(posts, limit),
+        )
+        response_cache.set(entry_key, page.model_dump(mode="json"))
+        return page
+
+    page = WorkoutPostsPublic.model_validate(cached)
+    author_ids = {post.user_id for post in page.data}
+    if author_ids:
+        full_names = dict(session.exec(author_names_statement(author_ids)).all())
+        set_author_names(page.data, full_names=full_names)
+    mutual_ids = get_mutual_follow_ids(
+        session=session, user_id=viewer_id, other_ids=author_ids - {viewer_id}
+    )
+    set_mutual_follows(page.data, mutual_ids=mutual_ids, viewer_id=viewer_id)
+    return page
+
+
+def get_user_profile_cached(
+    *, session: Session, user_id: uuid.UUID
+) -> Optional[UserPublicExtended]:
+    """
+    Get a user's profile with follower and following counts from the
+    response cache, or None if the user doesn't exist.
+    """
+    entry_key = response_cache.entry_key(f"profile:{user_id}", [user_tag(user_id)])
+    cached = response_cache.get(entry_key)
+    if cached is not None:
+        return UserPublicExtended.model_validate(cached)
+
+    user = session.get(User, user_id)
+    if not user:
+        return None
+    profile = UserPublicExtended(
+        **UserPublic.model_validate(user).model_dump(),
+        follower_count=get_follower_count(session=session, user_id=user_id),
+        following_count=get_following_count(session=session, user_id=user_id),
+    )
+    response_cache.set(entry_key, profile.model_dump(mode="json"))
+    return profile
+
+
+def get_user_workout_posts_page_cached(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    viewer_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+) -> Optional[WorkoutPostsPublic]:
+    """
+    Get a page of a user's workout posts as the viewer may see them, from
+    the response cache, or None if the user doesn't exist. Private posts
+    are only included for the user themselves and their mutual follows.
+    """
+    is_own_profile = user_id == viewer_id
+    is_mutual = not is_own_profile and are_mutual(
+        session=session, user1_id=viewer_id, user2_id=user_id
+    )
+    relation = "self" if is_own_profile else "mutual" if is_mutual else "other"
+    entry_key = response_cache.entry_key(
+        f"user-posts:{user_id}:{relation}:{page_key(cursor, skip, limit)}",
+        user_posts_tags(user_id),
+    )
+    cached = response_cache.get(entry_key)
+    if cached is not None:
+        return WorkoutPostsPublic.model_validate(cached)
+
+    user = session.get(User, user_id)
+    if not user:
+        return None
+    # The count is recomputed after privacy filtering below
+    posts, _ = get_user_workout_posts(
+        session=session,
+        user_id=user_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=False,
+    )
+    visible = [
+        WorkoutPostPublic.model_validate(
+            post,
+            update={
+                "user_full_name": user.full_name,
+                "is_mutual_follow": is_own_profile or is_mutual,
+            },
+        )
+        for post in posts
+        if is_own_profile or post.is_public or is_mutual
+    ]
+    page = WorkoutPostsPublic(
+        data=visible, count=len(visible), next_cursor=next_cursor(posts, limit)
+    )
+    response_cache.set(entry_key, page.model_dump(mode="json"))
+    return page
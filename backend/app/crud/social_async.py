@@ -0,0 +1,230 @@
+"""
+Async versions of the hot social read paths, used by the async routes when
+ASYNC_DB_ENABLED is set. They run the same statements as app.crud.social and
+app.crud.feed on an AsyncSession.
+"""
+import uuid
+from typing import List, Optional, Tuple
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.crud import social
+from app.crud.feed import exempt_followees_statement, feed_page_statements
+from app.crud.pagination import Cursor, next_cursor
+from app.crud.response_cache import response_cache
+from app.models.social import WorkoutPost, WorkoutPostPublic, WorkoutPostsPublic
+
+
+async def get_user_workout_posts(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
+    """
+    Get workout posts for a specific user.
+    The count is None when include_count is False.
+    """
+    statement, count_statement = social.user_workout_posts_statements(
+        user_id=user_id, skip=skip, limit=limit, cursor=cursor
+    )
+    count = (await session.exec(count_statement)).one() if include_count else None
+    posts = (await session.exec(statement)).all()
+    return list(posts), count
+
+
+async def get_feed_posts(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    feed_type: str = "personal",
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
+    """
+    Get workout posts based on feed type with privacy filtering.
+    """
+    kwargs = dict(
+        user_id=user_id,
+        skip=skip,
+        limit=limit,
+        cursor=cursor,
+        include_count=include_count,
+    )
+    if feed_type == "public":
+        return await get_public_feed_posts(session=session, **kwargs)
+    elif feed_type == "combined":
+        # The combined feed merges two result sets in Python; reuse the sync
+        # implementation on the async connection rather than duplicating it
+        return await session.run_sync(
+            lambda sync_session: social.get_combined_feed_posts(
+                session=sync_session, **kwargs
+            )
+        )
+    else:  # personal feed
+        return await get_personal_feed_posts(session=session, **kwargs)
+
+
+async def get_personal_feed_posts(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
+    """
+    Read a page of the user's materialized personal feed.
+    """
+    exempt_ids = (await session.exec(exempt_followees_statement(user_id))).all()
+    statement, count_statement = feed_page_statements(
+        user_id=user_id, exempt_ids=exempt_ids, skip=skip, limit=limit, cursor=cursor
+    )
+    count = (await session.exec(count_statement)).one() if include_count else None
+    posts = (await session.exec(statement)).all()
+    return list(posts), count
+
+
+async def get_public_feed_posts(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> Tuple[List[WorkoutPost], Optional[int]]:
+    """
+    Get all public workout posts from all users (discovery feed).
+    """
+    statement, count_statement = social.public_feed_statements(
+        skip=skip, limit=limit, cursor=cursor
+    )
+    count = (await session.exec(count_statement)).one() if include_count else None
+    posts = (await session.exec(statement)).all()
+    return list(posts), count
+
+
+async def get_public_feed_page_cached(
+    *,
+    session: AsyncSession,
+    viewer_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+    include_count: bool = True,
+) -> WorkoutPostsPublic:
+    """
+    Get a page of the public feed from the response cache, computing and
+    storing it on a miss. Author names and mutual follow flags are reloaded
+    on a hit, as in social.get_public_feed_page_cached.
+    """
+    entry_key = social.public_feed_cache_key(
+        cursor=cursor, skip=skip, limit=limit, include_count=include_count
+    )
+    cached = response_cache.get(entry_key)
+    if cached is None:
+        posts, count = await get_public_feed_posts(
+            session=session,
+            user_id=viewer_id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            include_count=include_count,
+        )
+        page = WorkoutPostsPublic(
+            data=await enrich_workout_posts(
+                session=session, posts=posts, viewer_id=viewer_id
+            ),
+            count=count,
+            next_cursor=next_cursor(posts, limit),
+        )
+        response_cache.set(entry_key, page.model_dump(mode="json"))
+        return page
+
+    page = WorkoutPostsPublic.model_validate(cached)
+    author_ids = {post.user_id for post in page.data}
+    if author_ids:
+        result = await session.exec(social.author_names_statement(author_ids))
+        social.set_author_names(page.data, full_names=dict(result.all()))
+    other_ids = author_ids - {viewer_id}
+    mutual_ids = set()
+    if other_ids:
+        result = await session.exec(
+            social.mutual_follow_ids_statement(viewer_id, other_ids)
+        )
+        mutual_ids = set(result.all())
+    social.set_mutual_follows(page.data, mutual_ids=mutual_ids, viewer_id=viewer_id)
+    return page
+
+
+async def enrich_workout_posts(
+    *, session: AsyncSession, posts: List[WorkoutPost], viewer_id: uuid.UUID
+) -> List[WorkoutPostPublic]:
+    """
+    Convert a page of posts to WorkoutPostPublic with the author's full name and
+    the viewer's mutual follow status.
+    """
+    author_ids = {post.user_id for post in posts}
+    other_ids = author_ids - {viewer_id}
+    full_names = {}
+    mutual_ids = set()
+    if author_ids:
+        result = await session.exec(social.author_names_statement(author_ids))
+        full_names = dict(result.all())
+    if other_ids:
+        result = await session.exec(
+            social.mutual_follow_ids_statement(viewer_id, other_ids)
+        )
+        mutual_ids = set(result.all())
+    return social.workout_posts_public(
+        posts, full_names=full_names, mutual_ids=mutual_ids, viewer_id=viewer_id
+    )
+
+
+async def get_followers_with_stats(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    viewer_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[dict], int]:
+    """
+    Get users who follow the specified user, with their social stats and
+    whether the viewer follows them.
+    """
+    count = (await session.exec(social.follower_count_statement(user_id))).first()
+    rows = await session.exec(
+        social.followers_with_stats_statement(
+            user_id=user_id, viewer_id=viewer_id, skip=skip, limit=limit
+        )
+    )
+    return [social.user_stats_dict(row) for row in rows.all()], count or 0
+
+
+async def get_following_with_stats(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    viewer_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+) -> Tuple[List[dict], int]:
+    """
+    Get users that the specified user follows, with their social stats and
+    whether the viewer follows them.
+    """
+    count = (await session.exec(social.following_count_statement(user_id))).first()
+    rows = await session.exec(
+        social.following_with_stats_statement(
+            user_id=user_id, viewer_id=viewer_id, skip=skip, limit=limit
+        )
+    )
+    return [social.user_stats_dict(row) for row in rows.all()], count or 0
@@ -0,0 +1,111 @@
+import uuid
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import Select
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, exists, func, select
+
+from app.core.cache import Cache
+from app.core.config import settings
+from app.models.social import UserFollow
+from app.models.user import User
+
+# Each user's top FOLLOW_SUGGESTIONS_CACHE_SIZE suggestions, as
+# [id, full_name, mutual_count] lists. Following someone removes them from
+# the cached list in place; unfollowing drops the entry.
+suggestions_cache = Cache(
+    "follow-suggestions",
+    maxsize=settings.FOLLOW_SUGGESTIONS_CACHE_MAX_SIZE,
+    ttl=settings.FOLLOW_SUGGESTIONS_CACHE_TTL_SECONDS,
+)
+
+
+def follow_suggestions_statement(*, user_id: uuid.UUID, limit: int) -> Select:
+    """
+    Build a SELECT of (User, mutual_count) for the users followed by the
+    people user_id follows, ranked by how many of them follow each one, in
+    a single aggregation. Only the FOLLOW_SUGGESTIONS_MAX_FRIENDS most
+    recent follows are walked, which bounds the cost for users following
+    many accounts. Users already followed, and the user, are excluded.
+    """
+    friends = (
+        select(UserFollow.followed_id)
+        .where(UserFollow.follower_id == user_id)
+        .order_by(UserFollow.created_at.desc())
+        .limit(settings.FOLLOW_SUGGESTIONS_MAX_FRIENDS)
+        .subquery()
+    )
+    friend_follow = aliased(UserFollow)
+    own_follow = aliased(UserFollow)
+    candidates = (
+        select(
+            friend_follow.followed_id.label("user_id"),
+            func.count().label("mutual_count"),
+        )
+        .join(friends, friends.c.followed_id == friend_follow.follower_id)
+        .where(friend_follow.followed_id != user_id)
+        .where(
+            ~exists().where(
+                own_follow.follower_id == user_id,
+                own_follow.followed_id == friend_follow.followed_id,
+            )
+        )
+        .group_by(friend_follow.followed_id)
+        .subquery()
+    )
+    return (
+        select(User, candidates.c.mutual_count)
+        .join(candidates, candidates.c.user_id == User.id)
+        .where(User.is_active == True)
+        .order_by(candidates.c.mutual_count.desc(), User.follower_count.desc(), User.id)
+        .limit(limit)
+    )
+
+
+def get_follow_suggestions(
+    *, session: Session, user_id: uuid.UUID, limit: int = 20
+) -> List[Dict[str, Any]]:
+    """
+    Suggest users to follow, as id, full_name and mutual_count (how many of
+    the user's follows follow them), best first. Computed by one query and
+    cached per user.
+    """
+    key = str(user_id)
+    suggestions = suggestions_cache.get(key)
+    if suggestions is None:
+        statement = follow_suggestions_statement(
+            user_id=user_id, limit=settings.FOLLOW_SUGGESTIONS_CACHE_SIZE
+        )
+        suggestions = [
+            [str(user.id), user.full_name, mutual_count]
+            for user, mutual_count in session.exec(statement)
+        ]
+        suggestions_cache.set(key, suggestions)
+    return [
+        {"id": uuid.UUID(suggested_id), "full_name": full_name, "mutual_count": mutual_count}
+        for suggested_id, full_name, mutual_count in suggestions[:limit]
+    ]
+
+
+def remove_follow_suggestions(user_id: uuid.UUID, followed_ids: Iterable[uuid.UUID]) -> None:
+    """
+    Drop users someone just followed from their cached suggestions, without
+    recomputing them. The new follows' own follows show up once the entry
+    expires.
+    """
+    key = str(user_id)
+    suggestions = suggestions_cache.get(key)
+    if suggestions is None:
+        return
+    followed = {str(followed_id) for followed_id in followed_ids}
+    remaining = [s for s in suggestions if s[0] not in followed]
+    if len(remaining) != len(suggestions):
+        suggestions_cache.set(key, remaining)
+
+
+def invalidate_follow_suggestions(user_id: uuid.UUID) -> None:
+    """
+    Drop a user's cached suggestions, e.g. after they unfollowed someone,
+    who may now be suggested again.
+    """
+    suggestions_cache.delete(str(user_id))
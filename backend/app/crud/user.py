@@ -1,10 +1,24 @@
 import uuid
+from types import SimpleNamespace
 from typing import Any, List, Optional
+from sqlalchemy.orm import make_transient_to_detached
 from sqlmodel import Session, select, func
 
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import Cache
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_and_update_password
+from app.crud.response_cache import invalidate_user_responses
 from app.models.user import User, UserCreate, UserUpdate
 
+# Column values of recently authenticated users, keyed by user id. The
+# password hash is left out so it never reaches a shared cache backend.
+UNCACHED_USER_FIELDS = {"hashed_password"}
+user_cache = Cache(
+    "user",
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
     """
@@ -32,6 +46,7 @@ def update_user(*, session: Session, db_user: User, user_in: UserUpdate) -> Any:
     db_user.sqlmodel_update(user_data, update=extra_data)
     session.add(db_user)
     session.commit()
+    invalidate_cached_user(db_user.id)
     session.refresh(db_user)
     return db_user
 
@@ -52,6 +67,56 @@ def get_user_by_id(*, session: Session, user_id: uuid.UUID) -> Optional[User]:
     return session.get(User, user_id)
 
 
+def cache_user(user: User) -> None:
+    """
+    Store a user's column values, except UNCACHED_USER_FIELDS, in the user cache.
+    """
+    user_cache.set(str(user.id), user.model_dump(mode="json", exclude=UNCACHED_USER_FIELDS))
+
+
+def get_cached_user(user_id: uuid.UUID) -> Optional[User]:
+    """
+    Build a detached User from the user cache, or return None on a miss.
+    Attach it to a session with session.merge(user, load=False); the
+    uncached fields are then loaded from the database on first access.
+    """
+    data = user_cache.get(str(user_id))
+    if data is None:
+        return None
+    # Validated from attributes rather than the dict: SQLModel looks up
+    # relationship names on the input, and `items` would resolve to dict.items
+    placeholders = dict.fromkeys(UNCACHED_USER_FIELDS, "")
+    user = User.model_validate(SimpleNamespace(**data, **placeholders), from_attributes=True)
+    make_transient_to_detached(user)
+    # Unset the placeholders so merge() leaves these attributes unloaded
+    for field in UNCACHED_USER_FIELDS:
+        user.__dict__.pop(field, None)
+    return user
+
+
+def invalidate_cached_user(user_id: uuid.UUID) -> None:
+    """
+    Drop a user from the user cache, along with cached responses built from
+    their row. Call after committing any change to the user's row.
+    """
+    user_cache.delete(str(user_id))
+    invalidate_user_responses(user_id)
+
+
+def get_user_by_id_cached(*, session: Session, user_id: uuid.UUID) -> Optional[User]:
+    """
+    Get a user by ID, served from the user cache when possible.
+    The user is attached to the session without a database round trip.
+    """
+    user = get_cached_user(user_id)
+    if user is not None:
+        return session.merge(user, load=False)
+    user = session.get(User, user_id)
+    if user is not None:
+        cache_user(user)
+    return user
+
+
 def authenticate(*, session: Session, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user.
@@ -59,8 +124,17 @@ def authenticate(*, session: Session, email: str, password: str) -> Optional[Use
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, db_user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Stored with a different cost than BCRYPT_ROUNDS; upgrade it while
+        # we have the plain password
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        session.commit()
+        invalidate_cached_user(db_user.id)
+        session.refresh(db_user)
     return db_user
 
 
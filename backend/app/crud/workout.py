@@ -0,0 +1,321 @@
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.crud.pagination import Cursor, apply_cursor, paginate
+from app.crudFuncs import upsert_personal_bests
+from app.models.workout import (
+    Exercise,
+    ExercisePublic,
+    PersonalBestCreate,
+    Workout,
+    WorkoutCreate,
+    WorkoutPublic,
+    WorkoutStats,
+    WorkoutWithExercisesPublic,
+)
+
+# Workouts marked completed through a plain update may lack a completed_date
+COMPLETED_SORT = func.coalesce(Workout.completed_date, Workout.created_at)
+
+
+def completed_sort_key(workout: Workout) -> datetime:
+    """
+    Python equivalent of COMPLETED_SORT, used to build the next cursor.
+    """
+    return workout.completed_date or workout.created_at
+
+
+def create_workout(
+    *,
+    session: Session,
+    workout_in: WorkoutCreate,
+    user_id: uuid.UUID,
+    personal_bests: Optional[List[PersonalBestCreate]] = None,
+) -> WorkoutWithExercisesPublic:
+    """
+    Create a workout, its exercises and any resulting personal bests in a
+    single transaction. The exercises go out in one batched INSERT, and the
+    response is built before the commit so nothing has to be re-read.
+    """
+    workout = Workout(
+        user_id=user_id,
+        name=workout_in.name,
+        description=workout_in.description,
+        scheduled_date=workout_in.scheduled_date,
+        duration_minutes=workout_in.duration_minutes,
+        is_completed=False,
+        created_at=datetime.utcnow(),
+    )
+    exercises = [
+        Exercise.model_validate(ex, update={"workout_id": workout.id})
+        for ex in workout_in.exercises
+    ]
+    session.add(workout)
+    session.add_all(exercises)
+    session.flush()
+    adjust_workout_stats(
+        session=session, user_id=user_id, after=workout_stats_contribution(workout)
+    )
+    if personal_bests:
+        upsert_personal_bests(session=session, user_id=user_id, pbs_in=personal_bests)
+
+    created = WorkoutWithExercisesPublic.model_validate(
+        workout,
+        update={"exercises": [ExercisePublic.model_validate(ex) for ex in exercises]},
+    )
+    session.commit()
+    return created
+
+
+# Statement builders shared by the sync and async workout routes
+
+def select_workouts_with_exercise_counts(user_id: uuid.UUID) -> Select:
+    """
+    Select a user's workouts as (Workout, exercise_count) rows. The counts
+    come from one grouped subquery over the user's exercises, joined in, so
+    a page needs no per-workout count query.
+    """
+    counts = (
+        select(Exercise.workout_id, func.count(Exercise.id).label("exercise_count"))
+        .join(Workout, Workout.id == Exercise.workout_id)
+        .where(Workout.user_id == user_id)
+        .group_by(Exercise.workout_id)
+        .subquery()
+    )
+    return (
+        select(Workout, func.coalesce(counts.c.exercise_count, 0).label("exercise_count"))
+        .outerjoin(counts, counts.c.workout_id == Workout.id)
+        .where(Workout.user_id == user_id)
+    )
+
+
+def workouts_public(rows: Sequence[Tuple[Workout, int]]) -> List[WorkoutPublic]:
+    """
+    Turn (Workout, exercise_count) rows into API models.
+    """
+    return [
+        WorkoutPublic.model_validate(workout, update={"exercise_count": exercise_count})
+        for workout, exercise_count in rows
+    ]
+
+
+def workouts_statement(
+    *,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+) -> Select:
+    """
+    Build a page of a user's workouts with their exercise counts, newest first.
+    """
+    statement = apply_cursor(
+        select_workouts_with_exercise_counts(user_id),
+        cursor,
+        Workout.created_at,
+        Workout.id,
+    )
+    return paginate(statement, cursor, skip, limit)
+
+
+def workouts_with_exercises_statement(
+    *,
+    user_id: uuid.UUID,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+) -> Select:
+    """
+    Build a page of a user's workouts created in [start, end), newest first.
+    The exercises of the whole page are loaded by one extra SELECT ... IN
+    query instead of one query per workout.
+    """
+    statement = select(Workout).where(Workout.user_id == user_id)
+    if start is not None:
+        statement = statement.where(Workout.created_at >= start)
+    if end is not None:
+        statement = statement.where(Workout.created_at < end)
+    statement = apply_cursor(
+        statement.options(selectinload(Workout.exercises)),
+        cursor,
+        Workout.created_at,
+        Workout.id,
+    )
+    return paginate(statement, cursor, skip, limit)
+
+
+def scheduled_workouts_statement(
+    *,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+) -> Select:
+    """
+    Build a page of a user's upcoming, uncompleted workouts with their
+    exercise counts, soonest first.
+    """
+    statement = apply_cursor(
+        select_workouts_with_exercise_counts(user_id)
+        .where(Workout.is_completed == False)
+        .where(Workout.scheduled_date != None)
+        .where(Workout.scheduled_date >= datetime.utcnow()),
+        cursor,
+        Workout.scheduled_date,
+        Workout.id,
+        descending=False,
+    )
+    return paginate(statement, cursor, skip, limit)
+
+
+def completed_workouts_statement(
+    *,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[Cursor] = None,
+) -> Select:
+    """
+    Build a page of a user's completed workouts with their exercise counts,
+    most recently completed first.
+    """
+    statement = apply_cursor(
+        select_workouts_with_exercise_counts(user_id)
+        .where(Workout.is_completed == True),
+        cursor,
+        COMPLETED_SORT,
+        Workout.id,
+    )
+    return paginate(statement, cursor, skip, limit)
+
+
+# Workout statistics
+
+def scheduled_filter(now: datetime) -> Any:
+    """
+    Condition for an upcoming, uncompleted workout.
+    """
+    return (
+        (Workout.is_completed == False)
+        & (Workout.scheduled_date != None)
+        & (Workout.scheduled_date >= now)
+    )
+
+
+def workout_stats_statement(*, user_id: uuid.UUID, now: datetime) -> Select:
+    """
+    Build every workout statistic of a user in one pass over their
+    workouts, using FILTER clauses instead of one query per figure.
+    """
+    return select(
+        func.count(Workout.id).label("total_workouts"),
+        func.count(Workout.id).filter(Workout.is_completed == True).label("completed_workouts"),
+        func.count(Workout.id).filter(scheduled_filter(now)).label("scheduled_workouts"),
+        func.coalesce(func.sum(Workout.duration_minutes), 0).label("total_duration_minutes"),
+        func.count(Workout.duration_minutes).label("timed_workouts"),
+    ).where(Workout.user_id == user_id)
+
+
+def workout_stats_rollup_statement(*, user_id: uuid.UUID, now: datetime) -> Select:
+    """
+    Read the statistics from the WorkoutStats rollup. Only the scheduled
+    count depends on the current time, so it is still counted, but over the
+    user's upcoming workouts only.
+    """
+    scheduled = (
+        select(func.count(Workout.id))
+        .where(Workout.user_id == user_id)
+        .where(scheduled_filter(now))
+        .scalar_subquery()
+    )
+    return select(
+        WorkoutStats.total_workouts,
+        WorkoutStats.completed_workouts,
+        scheduled.label("scheduled_workouts"),
+        WorkoutStats.total_duration_minutes,
+        WorkoutStats.timed_workouts,
+    ).where(WorkoutStats.user_id == user_id)
+
+
+def workout_stats_dict(row: Any) -> Dict[str, Any]:
+    """
+    Shape a row from either stats statement into the API response.
+    """
+    average = row.total_duration_minutes / row.timed_workouts if row.timed_workouts else 0
+    return {
+        "total_workouts": row.total_workouts,
+        "completed_workouts": row.completed_workouts,
+        "scheduled_workouts": row.scheduled_workouts,
+        "total_duration_minutes": row.total_duration_minutes,
+        "average_duration_minutes": round(average, 1),
+    }
+
+
+def get_workout_stats(*, session: Session, user_id: uuid.UUID) -> Dict[str, Any]:
+    """
+    Get a user's workout statistics, from the rollup when
+    WORKOUT_STATS_USE_ROLLUP is set and a rollup row exists.
+    """
+    now = datetime.utcnow()
+    if settings.WORKOUT_STATS_USE_ROLLUP:
+        row = session.exec(workout_stats_rollup_statement(user_id=user_id, now=now)).first()
+        if row is not None:
+            return workout_stats_dict(row)
+    row = session.exec(workout_stats_statement(user_id=user_id, now=now)).one()
+    return workout_stats_dict(row)
+
+
+def workout_stats_contribution(workout: Workout) -> Dict[str, int]:
+    """
+    What a single workout adds to its owner's WorkoutStats row.
+    """
+    return {
+        "total_workouts": 1,
+        "completed_workouts": int(bool(workout.is_completed)),
+        "total_duration_minutes": workout.duration_minutes or 0,
+        "timed_workouts": int(workout.duration_minutes is not None),
+    }
+
+
+def adjust_workout_stats(
+    *,
+    session: Session,
+    user_id: uuid.UUID,
+    before: Optional[Dict[str, int]] = None,
+    after: Optional[Dict[str, int]] = None,
+) -> None:
+    """
+    Apply the change of one workout's contribution, from `before` (None for
+    a new workout) to `after` (None for a deleted one), to the user's
+    rollup row with a single upsert. The increments happen in SQL so
+    concurrent requests don't overwrite each other. Does not commit.
+    """
+    delta = {
+        key: (after or {}).get(key, 0) - (before or {}).get(key, 0)
+        for key in ("total_workouts", "completed_workouts", "total_duration_minutes", "timed_workouts")
+    }
+    if not any(delta.values()):
+        return
+
+    if session.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+
+    stmt = insert(WorkoutStats).values(user_id=user_id, **delta)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            key: getattr(WorkoutStats, key) + getattr(stmt.excluded, key)
+            for key in delta
+        },
+    )
+    session.execute(stmt)
@@ -1,22 +1,13 @@
 import uuid
-from typing import Any, List
+from typing import Any, Iterable, List
 
-from sqlmodel import Session, select
+from sqlalchemy import delete, insert, tuple_, update
+from sqlmodel import Session, func, select
 from app.core.security import get_password_hash, verify_password
 from app.models import Item, ItemCreate, User, UserCreate, UserUpdate
-from app.models import Workout, Exercise, PersonalBest, PersonalBestCreate
-from app.models import User, PushToken, CustomReminder
-from datetime import date, datetime, timezone
-
-# Define metric keys for exercises we want to track personal bests for
-TRACKED_EXERCISES = {
-    "bench press": "bench-press",
-    "squat": "squat",
-    "deadlift": "deadlift",
-    "push-ups": "pushups",
-    "pull-ups": "pullups",
-    # extend as needed
-}
+from app.models import Workout, Exercise, ExerciseCreate, PersonalBest, PersonalBestCreate
+from app.models import User, PushTicket, PushToken, CustomReminder
+from datetime import datetime, timezone
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
     db_obj = User.model_validate(
@@ -72,26 +63,93 @@ def create_item(*, session: Session, item_in: ItemCreate, owner_id: uuid.UUID) -
 def create_or_update_personal_best(
     *, session: Session, user_id: uuid.UUID, pb_in: PersonalBestCreate
 ) -> PersonalBest:
-    # see if user already has a PB on this metric
+    upsert_personal_bests(session=session, user_id=user_id, pbs_in=[pb_in])
+    session.commit()
     stmt = select(PersonalBest).where(
         PersonalBest.user_id == user_id,
-        PersonalBest.exercise_name == pb_in.exercise_name
+        PersonalBest.exercise_name == pb_in.exercise_name,
+        PersonalBest.metric_type == pb_in.metric_type,
     )
-    existing = session.exec(stmt).one_or_none()
+    return session.exec(stmt).one()
 
-    # update if new value is "better" (you define the logic per metric)
-    if existing:
-        if pb_in.metric_value > existing.metric_value:
-            existing.metric_value = pb_in.metric_value
-            existing.date_achieved = pb_in.date_achieved
-            session.add(existing)
+def upsert_personal_bests(
+    *, session: Session, user_id: uuid.UUID, pbs_in: list[PersonalBestCreate]
+) -> list[PersonalBest]:
+    """
+    Record many personal bests in a single INSERT ... ON CONFLICT DO UPDATE,
+    keyed on (user_id, exercise_name, metric_type). Existing rows are only
+    overwritten when the new value is strictly better, so concurrent
+    workouts can't lose a PB to a read-then-write race.
+
+    Returns the rows that were inserted or improved. Does not commit, so it
+    joins the caller's transaction.
+    """
+    # A statement can't touch the same row twice: keep the best per key
+    best: dict[tuple[str, str], PersonalBestCreate] = {}
+    for pb_in in pbs_in:
+        key = (pb_in.exercise_name, pb_in.metric_type)
+        current = best.get(key)
+        if current is None or pb_in.metric_value > current.metric_value:
+            best[key] = pb_in
+    if not best:
+        return []
+
+    if session.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
     else:
-        existing = PersonalBest.model_validate(pb_in, update={"user_id": user_id})
-        session.add(existing)
+        from sqlalchemy.dialects.postgresql import insert
+
+    stmt = insert(PersonalBest).values(
+        [
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "exercise_name": pb_in.exercise_name,
+                "metric_type": pb_in.metric_type,
+                "metric_value": pb_in.metric_value,
+                "date_achieved": pb_in.date_achieved,
+            }
+            for pb_in in best.values()
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "exercise_name", "metric_type"],
+        set_={
+            "metric_value": stmt.excluded.metric_value,
+            "date_achieved": stmt.excluded.date_achieved,
+        },
+        where=stmt.excluded.metric_value > PersonalBest.metric_value,
+    ).returning(PersonalBest)
+    return list(
+        session.scalars(stmt, execution_options={"populate_existing": True}).all()
+    )
 
-    session.commit()
-    session.refresh(existing)
-    return existing
+def personal_best_candidates(
+    exercises: Iterable[Exercise | ExerciseCreate],
+    *,
+    tracked_exercises: dict[str, dict[str, str]],
+    achieved_at: datetime,
+) -> list[PersonalBestCreate]:
+    """
+    Turn the tracked exercises of a workout into personal best candidates.
+    `tracked_exercises` maps lower-cased exercise names to their metadata,
+    of which only "type" is used as the metric type.
+    """
+    candidates = []
+    for exercise in exercises:
+        metric_info = tracked_exercises.get(exercise.name.lower())
+        if not metric_info:
+            continue  # skip exercises we don't track
+        value = (exercise.sets or 0) * (exercise.reps or 0) * (exercise.weight or 0)  # Deciding Factor for upsert
+        candidates.append(
+            PersonalBestCreate(
+                exercise_name=exercise.name,
+                metric_type=metric_info["type"],
+                metric_value=value,
+                date_achieved=achieved_at,
+            )
+        )
+    return candidates
 
 def get_personal_bests(
     *, session: Session, user_id: uuid.UUID
@@ -108,34 +166,32 @@ def get_personal_best(
     )
     return session.exec(stmt).one_or_none()
 
-def update_personal_bests_after_workout(*, session: Session, workout: Workout):
-    user_id = workout.user_id
-
-    # Fetch all exercises associated with this workout
-    exercises = workout.exercises
-
-    for exercise in exercises:
-        name = exercise.name.lower()
-        metric_key = TRACKED_EXERCISES.get(name)
-        if not metric_key:
-            #
-            continue  # skip exercises we don't track
-
-        # Use weight * reps as performance metric for now
-        value = (exercise.weight or 0) * (exercise.reps or 0)
-        if value <= 0:
-            #continue
-            value = 0
-
-        pb_in = PersonalBestCreate(metric=metric_key, value=value, date=date.today())
-
-        from app.crud import create_or_update_personal_best  # to avoid circular imports
-        create_or_update_personal_best(session=session, user_id=user_id, pb_in=pb_in)
+def update_personal_bests_after_workout(
+    *,
+    session: Session,
+    workout: Workout,
+    tracked_exercises: dict[str, dict[str, str]],
+) -> list[PersonalBest]:
+    """
+    Record the personal bests set by a completed workout in one upsert.
+    Does not commit, so the PBs land with the workout's own update.
+    """
+    pbs_in = personal_best_candidates(
+        workout.exercises,
+        tracked_exercises=tracked_exercises,
+        achieved_at=workout.completed_date or datetime.utcnow(),
+    )
+    return upsert_personal_bests(
+        session=session, user_id=workout.user_id, pbs_in=pbs_in
+    )
 
 # ─────────────────────────────────────────────────────────────────────────────
 # PushToken & CustomReminder CRUD helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Postgres NOTIFY channel announcing newly scheduled reminders
+REMINDER_CHANNEL = "custom_reminders"
+
 
 def create_or_update_push_token(
     *,
@@ -169,6 +225,28 @@ def create_or_update_push_token(
         return new_token
 
 
+def count_push_tokens(*, session: Session) -> int:
+    return session.exec(select(func.count(PushToken.id))).one()
+
+
+def get_push_token_batch(
+    *,
+    session: Session,
+    after: uuid.UUID | None = None,
+    limit: int = 1000
+) -> List[tuple[uuid.UUID, str]]:
+    """
+    The next `limit` (id, expo_token) pairs in id order, continuing after
+    the id of the last pair of the previous batch. Each batch is a short
+    index range scan, however many tokens there are.
+    """
+    stmt = select(PushToken.id, PushToken.expo_token)
+    if after is not None:
+        stmt = stmt.where(PushToken.id > after)
+    stmt = stmt.order_by(PushToken.id).limit(limit)
+    return session.exec(stmt).all()
+
+
 def schedule_custom_reminder(
     *,
     session: Session,
@@ -178,8 +256,8 @@ def schedule_custom_reminder(
     message: str
 ) -> CustomReminder:
     """
-    Insert a new CustomReminder row. The background scheduler
-    (running every minute) will pick it up when remind_time <= now().
+    Insert a new CustomReminder row. The reminder dispatcher
+    (app.reminders) sends it once remind_time <= now().
     """
     # (Optional) Confirm the user exists
     user_exists = session.exec(select(User).where(User.id == user_id)).first()
@@ -194,11 +272,38 @@ def schedule_custom_reminder(
         sent_at=None,
     )
     session.add(new_reminder)
+    if session.get_bind().dialect.name == "postgresql":
+        # Wake the reminder dispatchers (app.reminders); delivered on commit
+        session.execute(
+            select(func.pg_notify(REMINDER_CHANNEL, remind_time.isoformat()))
+        )
     session.commit()
     session.refresh(new_reminder)
     return new_reminder
 
 
+def get_upcoming_reminder_times(
+    *,
+    session: Session,
+    until: datetime,
+    limit: int = 10_000
+) -> List[datetime]:
+    """
+    Due times of the unsent reminders due by `until` (including overdue
+    ones), earliest first. Served by the partial index on unsent rows.
+    """
+    stmt = (
+        select(CustomReminder.remind_time)
+        .where(
+            CustomReminder.sent_at.is_(None),
+            CustomReminder.remind_time <= until,
+        )
+        .order_by(CustomReminder.remind_time)
+        .limit(limit)
+    )
+    return session.exec(stmt).all()
+
+
 def get_due_custom_reminders(*, session: Session) -> List[CustomReminder]:
     """
     Return all CustomReminder rows where:
@@ -231,3 +336,145 @@ def mark_reminder_as_sent(
     session.commit()
     session.refresh(reminder)
     return reminder
+
+
+def claim_due_custom_reminders(
+    *,
+    session: Session,
+    limit: int = 500
+) -> List[CustomReminder]:
+    """
+    Atomically claim up to `limit` due reminders by setting their sent_at,
+    and return them. One UPDATE ... RETURNING does the work; on PostgreSQL
+    the rows are picked with FOR UPDATE SKIP LOCKED, so concurrent
+    dispatchers each claim a different batch instead of waiting for or
+    duplicating one another. A claimed reminder is never handed out again,
+    even if sending it fails (at-most-once delivery).
+    """
+    now_utc = datetime.now(timezone.utc)
+    due = (
+        select(CustomReminder.id)
+        .where(
+            CustomReminder.remind_time <= now_utc,
+            CustomReminder.sent_at.is_(None),
+        )
+        .order_by(CustomReminder.remind_time)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    stmt = (
+        update(CustomReminder)
+        .where(CustomReminder.id.in_(due.scalar_subquery()))
+        .values(sent_at=now_utc)
+        .returning(CustomReminder)
+        .execution_options(synchronize_session=False)
+    )
+    claimed = session.scalars(stmt).all()
+    # Detach so the commit doesn't expire them into one SELECT per row
+    for reminder in claimed:
+        session.expunge(reminder)
+    session.commit()
+    return claimed
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PushTicket helpers (Expo delivery receipts)
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def record_push_tickets(
+    *,
+    session: Session,
+    tickets: list[tuple[str, str]]
+) -> None:
+    """
+    Store (ticket_id, expo_token) pairs of accepted pushes in one bulk
+    INSERT, so their receipts can be checked later.
+    """
+    if not tickets:
+        return
+    now_utc = datetime.now(timezone.utc)
+    session.execute(
+        insert(PushTicket),
+        [
+            {"id": ticket_id, "expo_token": expo_token, "created_at": now_utc}
+            for ticket_id, expo_token in tickets
+        ],
+    )
+    session.commit()
+
+
+def get_unchecked_push_tickets(
+    *,
+    session: Session,
+    sent_before: datetime,
+    after: tuple[datetime, str] | None = None,
+    limit: int = 1000
+) -> List[PushTicket]:
+    """
+    Oldest tickets sent before `sent_before` whose receipt hasn't been
+    recorded yet, continuing after the (created_at, id) of the last ticket
+    of the previous batch when `after` is given.
+    """
+    stmt = select(PushTicket).where(
+        PushTicket.checked_at.is_(None), PushTicket.created_at <= sent_before
+    )
+    if after is not None:
+        stmt = stmt.where(tuple_(PushTicket.created_at, PushTicket.id) > tuple_(*after))
+    stmt = stmt.order_by(PushTicket.created_at, PushTicket.id).limit(limit)
+    return session.exec(stmt).all()
+
+
+def record_push_receipts(
+    *,
+    session: Session,
+    receipts: dict[str, tuple[str, str | None]]
+) -> None:
+    """
+    Record receipts, given as ticket_id -> (status, error code), with one
+    UPDATE per distinct outcome rather than one per ticket.
+    """
+    by_outcome: dict[tuple[str, str | None], list[str]] = {}
+    for ticket_id, outcome in receipts.items():
+        by_outcome.setdefault(outcome, []).append(ticket_id)
+    now_utc = datetime.now(timezone.utc)
+    for (status, error), ticket_ids in by_outcome.items():
+        session.execute(
+            update(PushTicket)
+            .where(PushTicket.id.in_(ticket_ids))
+            .values(checked_at=now_utc, receipt_status=status, receipt_error=error)
+        )
+    session.commit()
+
+
+def delete_push_tokens(
+    *,
+    session: Session,
+    expo_tokens: list[str]
+) -> int:
+    """
+    Bulk-delete the PushToken rows of devices Expo reports as no longer
+    registered. Returns the number of rows deleted.
+    """
+    if not expo_tokens:
+        return 0
+    result = session.execute(
+        delete(PushToken).where(PushToken.expo_token.in_(expo_tokens))
+    )
+    session.commit()
+    return result.rowcount
+
+
+def delete_push_tickets_before(
+    *,
+    session: Session,
+    created_before: datetime
+) -> int:
+    """
+    Drop tickets older than Expo keeps receipts for, checked or not.
+    """
+    result = session.execute(
+        delete(PushTicket).where(PushTicket.created_at < created_before)
+    )
+    session.commit()
+    return result.rowcount
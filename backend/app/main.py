@@ -1,10 +1,12 @@
 import sentry_sdk
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.routing import APIRoute
 from starlette.middleware.cors import CORSMiddleware
 
 from app.api.main import api_router
 from app.core.config import settings
+from app.core.security import PasswordHasherBusy
 from app.scheduler import start_scheduler           
 from app.core.db import engine                           
 from sqlmodel import SQLModel 
@@ -31,6 +33,7 @@ if settings.ENVIRONMENT == "local":
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 elif settings.all_cors_origins:
     app.add_middleware(
@@ -39,14 +42,28 @@ elif settings.all_cors_origins:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+@app.exception_handler(PasswordHasherBusy)
+def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy) -> JSONResponse:
+    # Too many logins/signups queued on this worker; ask the client to retry
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.on_event("startup")
 def on_startup():
     # 1) Create any tables that don’t yet exist (including push_tokens & custom_reminders)
     SQLModel.metadata.create_all(engine)
 
-    # 2) Start APScheduler’s background jobs
-    start_scheduler()
\ No newline at end of file
+    # 2) Start APScheduler’s background jobs, unless a separate scheduler
+    #    process (python -m app.scheduler) runs them
+    if settings.SCHEDULER_ENABLED_IN_API:
+        start_scheduler()
\ No newline at end of file
@@ -1,7 +1,7 @@
 from sqlmodel import SQLModel  # Re-export SQLModel for Alembic
 
 from app.models.token import Message, NewPassword, Token, TokenPayload
-from app.models.notifications import PushToken, CustomReminder
+from app.models.notifications import PushTicket, PushToken, CustomReminder
 from app.models.user import (
     UpdatePassword,
     User,
@@ -23,6 +23,7 @@ from app.models.item import (
     ItemUpdate,
 )
 from app.models.social import (
+    FeedItem,
     UserFollow,
     WorkoutPost,
     WorkoutPostCreate,
@@ -42,6 +43,7 @@ from app.models.workout import (
     PersonalBest,
     PersonalBestCreate,
     PersonalBestPublic,
+    WorkoutStats,
     WorkoutWithExercisesPublic
 )
 # not needed - from app.models.personal_best import PersonalBest, PersonalBestCreate
@@ -76,6 +78,7 @@ __all__ = [
     "Message",
     
     # Social models
+    "FeedItem",
     "UserFollow",
     "WorkoutPost",
     "WorkoutPostCreate",
@@ -95,5 +98,6 @@ __all__ = [
     "PersonalBest",
     "PersonalBestCreate",
     "PersonalBestPublic",
+    "WorkoutStats",
     "WorkoutWithExercisesPublic"
 ]
\ No newline at end of file
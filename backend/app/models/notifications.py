@@ -1,11 +1,11 @@
 # app/models/notifications.py
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
 from sqlmodel import Field, SQLModel
-from sqlalchemy import Column, DateTime, String
+from sqlalchemy import Column, DateTime, Index, String, text
 
 
 class PushToken(SQLModel, table=True):
@@ -44,6 +44,15 @@ class CustomReminder(CustomReminderBase, table=True):
     A one-off reminder. Once sent, we’ll set sent_at so it isn’t sent again.
     """
     __tablename__ = "custom_reminders"
+    __table_args__ = (
+        # Only unsent reminders are ever looked up by time
+        Index(
+            "ix_custom_reminders_unsent_remind_time",
+            "remind_time",
+            postgresql_where=text("sent_at IS NULL"),
+            sqlite_where=text("sent_at IS NULL"),
+        ),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     sent_at: Optional[datetime] = Field(
@@ -51,3 +60,26 @@ class CustomReminder(CustomReminderBase, table=True):
         sa_column=Column(DateTime(timezone=True)),
         description="Set to now() after sending",
     )
+
+
+class PushTicket(SQLModel, table=True):
+    """
+    A push accepted by Expo, kept until its delivery receipt is checked.
+    Receipts become available about 15 minutes after sending and are
+    kept by Expo for 24 hours.
+    """
+    __tablename__ = "push_tickets"
+
+    id: str = Field(primary_key=True, description="Expo ticket id")
+    expo_token: str = Field(index=True)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False, index=True),
+    )
+    checked_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
+    receipt_status: Optional[str] = Field(default=None, description='"ok" or "error"')
+    receipt_error: Optional[str] = Field(
+        default=None, description="Expo error code, e.g. DeviceNotRegistered"
+    )
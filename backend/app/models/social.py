@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import Index
 from sqlmodel import Field, Relationship, SQLModel
 
 # Import directly from user module to avoid circular imports
@@ -52,6 +53,36 @@ class WorkoutPost(SQLModel, table=True):
     user: User = Relationship(back_populates="workout_posts")
 
 
+# Materialized Feed Entry Model
+class FeedItem(SQLModel, table=True):
+    """
+    Model representing one post in one user's materialized personal feed.
+
+    Rows are written when a post is created (fan-out on write) for the author
+    and every follower allowed to see it, so reading a feed page is a single
+    range scan over (owner_id, created_at).
+    """
+    __table_args__ = (
+        Index("ix_feeditem_owner_id_created_at", "owner_id", "created_at"),
+    )
+
+    owner_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, nullable=False, ondelete="CASCADE"
+    )
+    post_id: uuid.UUID = Field(
+        foreign_key="workoutpost.id",
+        primary_key=True,
+        nullable=False,
+        index=True,
+        ondelete="CASCADE",
+    )
+    author_id: uuid.UUID = Field(
+        foreign_key="user.id", nullable=False, index=True, ondelete="CASCADE"
+    )
+    is_public: bool = Field(default=True)
+    created_at: datetime = Field(nullable=False)  # Copied from the post
+
+
 # Workout Post Create Schema
 class WorkoutPostCreate(SQLModel):
     """
@@ -103,7 +134,8 @@ class WorkoutPostsPublic(SQLModel):
     Schema for returning multiple workout posts via API.
     """
     data: List[WorkoutPostPublic]
-    count: int
+    count: Optional[int] = None  # None when the client passed include_count=false
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
 
 
 # User Search Result Schema
@@ -132,4 +164,51 @@ class UserSearchResultsPublic(SQLModel):
     Schema for returning multiple user search results via API.
     """
     data: List[UserSearchResult]
-    count: int
\ No newline at end of file
+    count: int
+
+
+# Typeahead suggestions: just enough to render a suggestion row
+class UserTypeaheadResult(SQLModel):
+    id: uuid.UUID
+    full_name: Optional[str] = None
+
+
+class UserTypeaheadPublic(SQLModel):
+    data: List[UserTypeaheadResult]
+
+
+# Bulk follow / unfollow
+class BulkFollowRequest(SQLModel):
+    """
+    Users to follow, by id and/or by hashed email (SHA-256 hex of the
+    trimmed, lowercased address) from a contact import.
+    """
+    user_ids: List[uuid.UUID] = []
+    email_hashes: List[str] = []
+
+
+class BulkUnfollowRequest(SQLModel):
+    user_ids: List[uuid.UUID]
+
+
+class BulkFollowResult(SQLModel):
+    user_id: Optional[uuid.UUID] = None
+    email_hash: Optional[str] = None
+    # followed, already_following, unfollowed, not_following, not_found or self
+    status: str
+
+
+class BulkFollowResultsPublic(SQLModel):
+    data: List[BulkFollowResult]
+    count: int  # follows created or removed
+
+
+# Friends-of-friends follow suggestions
+class FollowSuggestion(SQLModel):
+    id: uuid.UUID
+    full_name: Optional[str] = None
+    mutual_count: int  # how many of the viewer's follows follow this user
+
+
+class FollowSuggestionsPublic(SQLModel):
+    data: List[FollowSuggestion]
@@ -1,7 +1,9 @@
+import hashlib
 import uuid
 from typing import List, Optional
 
 from pydantic import EmailStr
+from sqlalchemy import event, inspect
 from sqlmodel import Field, Relationship, SQLModel
 
 # Shared properties
@@ -53,6 +55,16 @@ class UpdatePassword(SQLModel):
 class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     hashed_password: str
+    # Set for accounts with more followers than FEED_FANOUT_MAX_FOLLOWERS;
+    # their posts are read at query time instead of fanned out to followers
+    fanout_exempt: bool = Field(default=False, index=True)
+    # Denormalized social stats, kept in step with UserFollow by
+    # follow_user/unfollow_user so lists don't need to count per row
+    follower_count: int = Field(default=0)
+    following_count: int = Field(default=0)
+    # hash_email(email), kept in step by the listener below, so contact
+    # imports can match addresses without sending them in the clear
+    email_hash: Optional[str] = Field(default=None, max_length=64, index=True)
     
     # Relationships
     items: List["Item"] = Relationship(back_populates="owner", cascade_delete=True)
@@ -78,6 +90,20 @@ class User(UserBase, table=True):
     )
 
 
+def hash_email(email: str) -> str:
+    """
+    Hex SHA-256 of a trimmed, lowercased email address.
+    """
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()
+
+
+@event.listens_for(User, "before_insert")
+@event.listens_for(User, "before_update")
+def _set_email_hash(mapper, connection, target: User) -> None:
+    if target.email_hash is None or inspect(target).attrs.email.history.has_changes():
+        target.email_hash = hash_email(target.email)
+
+
 # Properties to return via API, id is always required
 class UserPublic(UserBase):
     id: uuid.UUID
@@ -2,6 +2,7 @@ import uuid
 from uuid import UUID, uuid4
 from datetime import datetime
 from typing import List, Optional
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 # Import directly from user module to avoid circular imports
@@ -28,6 +29,23 @@ class Workout(SQLModel, table=True):
     exercises: List["Exercise"] = Relationship(back_populates="workout", cascade_delete=True)
 
 
+# Workout Stats Model
+class WorkoutStats(SQLModel, table=True):
+    """
+    Per-user running totals over the user's workouts, adjusted by deltas
+    whenever a workout is created, updated, completed or deleted, so the
+    stats endpoint doesn't have to aggregate every workout on each load.
+    """
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id", primary_key=True, nullable=False, ondelete="CASCADE"
+    )
+    total_workouts: int = Field(default=0)
+    completed_workouts: int = Field(default=0)
+    total_duration_minutes: int = Field(default=0)
+    # Workouts with a duration, the denominator of the average duration
+    timed_workouts: int = Field(default=0)
+
+
 # Exercise Model
 class Exercise(SQLModel, table=True):
     """
@@ -148,6 +166,13 @@ class WorkoutWithExercisesPublic(SQLModel):
 
 #Personal Bests Model - Related to Workouts
 class PersonalBest(SQLModel, table=True):
+    # One row per metric; the upsert in crudFuncs conflicts on this key
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "exercise_name", "metric_type", name="uq_personalbest_user_exercise_metric"
+        ),
+    )
+
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: UUID = Field(foreign_key="user.id")
     exercise_name: str
@@ -0,0 +1,313 @@
+"""
+Expo push delivery.
+
+Messages are sent in Expo's batch format (up to 100 per request) over one
+pooled HTTP client, with several batches in flight at once and a token
+bucket keeping the overall rate under Expo's per-project limit. Every
+message gets a PushResult, built from the ticket Expo returns for it.
+Ticket ids are later exchanged for delivery receipts (PushReceipt).
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Expo rejects requests with more than 100 messages or 1000 receipt ids
+EXPO_BATCH_SIZE = 100
+EXPO_RECEIPTS_BATCH_SIZE = 1000
+
+T = TypeVar("T")
+
+
+@dataclass
+class PushMessage:
+    to: str
+    title: str
+    body: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    sound: Optional[str] = "default"
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "to": self.to,
+            "title": self.title,
+            "body": self.body,
+            "data": self.data,
+            "sound": self.sound,
+        }
+
+
+@dataclass
+class PushResult:
+    """
+    Outcome of one message: status "ok" with the ticket id to poll for the
+    receipt, or "error" with Expo's error code (e.g. "DeviceNotRegistered")
+    when it has one.
+    """
+    to: str
+    status: str
+    ticket_id: Optional[str] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+@dataclass
+class PushReceipt:
+    """
+    Delivery outcome of a ticket, as reported by Expo's receipts endpoint.
+    """
+    status: str
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: acquire(n) blocks until n tokens are
+    available, refilling at `rate` tokens per second up to `capacity`.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1) -> None:
+        if self.rate <= 0:
+            return
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def chunked(items: Iterable[T], size: int = EXPO_BATCH_SIZE) -> Iterator[List[T]]:
+    chunk: List[T] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class PushClient:
+    """
+    Sends push messages to Expo. Safe to share between threads; use
+    get_push_client() for the process-wide instance.
+    """
+
+    def __init__(
+        self,
+        *,
+        url: Optional[str] = None,
+        receipts_url: Optional[str] = None,
+        access_token: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ) -> None:
+        # Unset arguments come from settings
+        self.url = url or settings.EXPO_PUSH_URL
+        self.receipts_url = receipts_url or settings.EXPO_PUSH_RECEIPTS_URL
+        access_token = access_token or settings.EXPO_ACCESS_TOKEN
+        self.concurrency = max(1, concurrency or settings.EXPO_PUSH_CONCURRENCY)
+        self.max_retries = (
+            settings.EXPO_PUSH_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.bucket = TokenBucket(
+            settings.EXPO_PUSH_RATE_PER_SECOND if rate_per_second is None else rate_per_second
+        )
+        headers = {
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Content-Type": "application/json",
+        }
+        if access_token:
+            headers["Authorization"] = f"Bearer {access_token}"
+        # One keep-alive connection per concurrent batch
+        self._http = httpx.Client(
+            headers=headers,
+            timeout=timeout or settings.EXPO_PUSH_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="expo-push"
+        )
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._http.close()
+
+    def send(self, messages: Iterable[PushMessage]) -> List[PushResult]:
+        """
+        Send messages in batches, up to `concurrency` batches at a time.
+        Returns one result per message, in order.
+        """
+        # Submit lazily so at most a few windows of batches are held in memory
+        results: List[PushResult] = []
+        pending: Deque[Future] = deque()
+        for chunk in chunked(messages):
+            pending.append(self._executor.submit(self._send_chunk, chunk))
+            if len(pending) >= self.concurrency * 2:
+                results.extend(pending.popleft().result())
+        for future in pending:
+            results.extend(future.result())
+        return results
+
+    def _post(self, url: str, payload: Any) -> Tuple[Optional[httpx.Response], str]:
+        """
+        POST with retries on connection errors, throttling and server
+        errors. Returns the final response, or None and the last error.
+        """
+        error = "request failed"
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                time.sleep(min(2 ** (attempt - 1), 30))
+            try:
+                response = self._http.post(url, json=payload)
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"
+                continue
+            if response.status_code == 429 or response.status_code >= 500:
+                error = f"HTTP {response.status_code}"
+                continue
+            return response, ""
+        return None, error
+
+    def _send_chunk(self, chunk: List[PushMessage]) -> List[PushResult]:
+        self.bucket.acquire(len(chunk))
+        response, error = self._post(self.url, [message.to_json() for message in chunk])
+        if response is None:
+            logger.warning("Expo push batch of %d failed: %s", len(chunk), error)
+            return [PushResult(to=m.to, status="error", message=error) for m in chunk]
+        return self._parse_tickets(chunk, response)
+
+    @staticmethod
+    def _parse_tickets(chunk: List[PushMessage], response: httpx.Response) -> List[PushResult]:
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        tickets = body.get("data") if isinstance(body, dict) else None
+        if response.status_code != 200 or not isinstance(tickets, list):
+            # Request-level error, e.g. a malformed batch
+            errors = body.get("errors") if isinstance(body, dict) else None
+            message = str(errors or f"HTTP {response.status_code}: {response.text[:200]}")
+            logger.warning("Expo rejected push batch of %d: %s", len(chunk), message)
+            return [PushResult(to=m.to, status="error", message=message) for m in chunk]
+
+        results = []
+        for index, message in enumerate(chunk):
+            ticket = tickets[index] if index < len(tickets) else {}
+            if ticket.get("status") == "ok":
+                results.append(
+                    PushResult(to=message.to, status="ok", ticket_id=ticket.get("id"))
+                )
+            else:
+                results.append(
+                    PushResult(
+                        to=message.to,
+                        status="error",
+                        error=(ticket.get("details") or {}).get("error"),
+                        message=ticket.get("message", "missing ticket"),
+                    )
+                )
+        return results
+
+    def get_receipts(self, ticket_ids: Iterable[str]) -> Dict[str, PushReceipt]:
+        """
+        Fetch the receipts of many tickets, 1000 ids per request. Tickets
+        whose receipt isn't available yet are missing from the result.
+        """
+        futures = [
+            self._executor.submit(self._get_receipts_chunk, chunk)
+            for chunk in chunked(ticket_ids, EXPO_RECEIPTS_BATCH_SIZE)
+        ]
+        receipts: Dict[str, PushReceipt] = {}
+        for future in futures:
+            receipts.update(future.result())
+        return receipts
+
+    def _get_receipts_chunk(self, ticket_ids: List[str]) -> Dict[str, PushReceipt]:
+        response, error = self._post(self.receipts_url, {"ids": ticket_ids})
+        if response is None or response.status_code != 200:
+            logger.warning(
+                "Expo receipts request for %d tickets failed: %s",
+                len(ticket_ids),
+                error or f"HTTP {response.status_code}",
+            )
+            return {}
+        try:
+            data = response.json().get("data") or {}
+        except (ValueError, AttributeError):
+            return {}
+        return {
+            ticket_id: PushReceipt(
+                status=receipt.get("status", "error"),
+                error=(receipt.get("details") or {}).get("error"),
+                message=receipt.get("message"),
+            )
+            for ticket_id, receipt in data.items()
+        }
+
+
+_client: Optional[PushClient] = None
+_client_lock = threading.Lock()
+
+
+def get_push_client() -> PushClient:
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = PushClient()
+            atexit.register(_client.close)
+        return _client
+
+
+def send_push_messages(messages: Iterable[PushMessage]) -> List[PushResult]:
+    """
+    Send messages with the process-wide client.
+    """
+    return get_push_client().send(messages)
+
+
+def get_push_receipts(ticket_ids: Iterable[str]) -> Dict[str, PushReceipt]:
+    """
+    Fetch delivery receipts with the process-wide client.
+    """
+    return get_push_client().get_receipts(ticket_ids)
@@ -0,0 +1,175 @@
+"""
+Precise delivery of custom reminders.
+
+ReminderDispatcher keeps a min-heap of the due times of unsent reminders
+in the next REMINDER_WINDOW_SECONDS, loaded through the partial index on
+unsent rows, and sleeps until the earliest one. New reminders are pushed
+onto the heap as they are scheduled: schedule_custom_reminder sends a
+Postgres NOTIFY on REMINDER_CHANNEL, which the dispatcher LISTENs to. The
+heap only decides when to wake up; what is sent is decided by the atomic
+claim in the dispatch callable, so any number of dispatchers can run.
+"""
+import heapq
+import logging
+import select
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.crudFuncs import REMINDER_CHANNEL, get_upcoming_reminder_times
+
+if TYPE_CHECKING:
+    import psycopg
+
+logger = logging.getLogger(__name__)
+
+# How long the listener waits on the socket before checking for stop()
+LISTEN_POLL_SECONDS = 5.0
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite hands back naive datetimes; they are stored as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class ReminderDispatcher:
+    """
+    Runs `dispatch` as soon as a reminder is due, on a background thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        engine: Engine,
+        dispatch: Callable[[], None],
+        window_seconds: Optional[float] = None,
+        window_limit: Optional[int] = None,
+    ) -> None:
+        self.engine = engine
+        self.dispatch = dispatch
+        self.window_seconds = window_seconds or settings.REMINDER_WINDOW_SECONDS
+        self.window_limit = window_limit or settings.REMINDER_WINDOW_LIMIT
+        self._heap: List[float] = []
+        self._reload_at = 0.0
+        self._condition = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        self._threads = [
+            threading.Thread(target=self._run, name="reminder-dispatcher", daemon=True)
+        ]
+        if self.engine.dialect.name == "postgresql":
+            self._threads.append(
+                threading.Thread(target=self._listen, name="reminder-listener", daemon=True)
+            )
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        with self._condition:
+            self._condition.notify()
+        for thread in self._threads:
+            thread.join()
+
+    def notify(self, remind_time: datetime) -> None:
+        """
+        Add a newly scheduled reminder. Times past the current window are
+        left to the reload at the end of the window.
+        """
+        due = _timestamp(remind_time)
+        with self._condition:
+            if due < self._reload_at:
+                heapq.heappush(self._heap, due)
+                self._condition.notify()
+
+    def _reload(self) -> None:
+        """
+        Replace the heap with the due times of the next window. When the
+        window holds more than window_limit reminders, it ends at the last
+        one loaded so the rest are loaded once it is reached.
+        """
+        now = time.time()
+        until = datetime.fromtimestamp(now + self.window_seconds, timezone.utc)
+        with Session(self.engine) as session:
+            times = get_upcoming_reminder_times(
+                session=session, until=until, limit=self.window_limit
+            )
+        heap = [_timestamp(t) for t in times]
+        if len(heap) >= self.window_limit:
+            reload_at = heap[-1]
+        else:
+            reload_at = now + self.window_seconds
+        heapq.heapify(heap)
+        with self._condition:
+            self._heap = heap
+            self._reload_at = reload_at
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                if time.time() >= self._reload_at:
+                    self._reload()
+                if self._wait_until_due():
+                    self.dispatch()
+            except Exception:
+                logger.exception("Reminder dispatch failed")
+                self._stopped.wait(1)
+
+    def _wait_until_due(self) -> bool:
+        """
+        Sleep until the earliest reminder is due, the window ends or a
+        sooner reminder is added. Returns whether reminders are due, after
+        popping them.
+        """
+        with self._condition:
+            now = time.time()
+            if self._heap and self._heap[0] <= now:
+                while self._heap and self._heap[0] <= now:
+                    heapq.heappop(self._heap)
+                return True
+            wake_at = min(self._heap[0], self._reload_at) if self._heap else self._reload_at
+            self._condition.wait(max(0.0, wake_at - now))
+            return False
+
+    def _listen(self) -> None:
+        """
+        Feed NOTIFYs from schedule_custom_reminder into the heap. Needs a
+        direct connection (LISTEN doesn't survive PgBouncer's transaction
+        pooling); without one, new reminders are still found at the next
+        window reload.
+        """
+        import psycopg
+
+        conninfo = self.engine.url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        while not self._stopped.is_set():
+            try:
+                with psycopg.connect(conninfo, autocommit=True) as conn:
+                    conn.add_notify_handler(self._on_notify)
+                    conn.execute(f"LISTEN {REMINDER_CHANNEL}")
+                    while not self._stopped.is_set():
+                        readable, _, _ = select.select([conn.fileno()], [], [], LISTEN_POLL_SECONDS)
+                        if readable:
+                            # Any statement reads the pending notifications
+                            # and runs the handler for each
+                            conn.execute("SELECT 1")
+            except Exception:
+                logger.exception("Reminder listener failed, reconnecting")
+                self._stopped.wait(LISTEN_POLL_SECONDS)
+
+    def _on_notify(self, notify: "psycopg.Notify") -> None:
+        try:
+            remind_time = datetime.fromisoformat(notify.payload)
+        except ValueError:
+            return
+        self.notify(remind_time)
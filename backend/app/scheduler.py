@@ -1,20 +1,34 @@
 # ─── app/scheduler.py ──────────────────────────────────────────────────────────
 
 import random
-import requests
-from datetime import datetime, timezone
+import signal
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.schedulers.base import BaseScheduler
+from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
 
-from sqlmodel import Session, select
+from sqlmodel import Session
 from app.core.db import engine            # your SQLModel engine from db.py
+from app.core.config import settings
 from app.crudFuncs import (
-    get_due_custom_reminders,
-    mark_reminder_as_sent
+    claim_due_custom_reminders,
+    count_push_tokens,
+    delete_push_tickets_before,
+    delete_push_tokens,
+    get_push_token_batch,
+    get_unchecked_push_tickets,
+    record_push_receipts,
+    record_push_tickets,
 )
-from app.models import PushToken     # to fetch all tokens for daily quotes
+from app.reminders import ReminderDispatcher
+from app.push import PushMessage, PushResult, get_push_receipts, send_push_messages
 
-EXPO_PUSH_URL = "https://exp.host/--/api/v2/push/send"
+# Expo's error code for uninstalled apps and expired tokens
+DEVICE_NOT_REGISTERED = "DeviceNotRegistered"
 
 # A small list of motivational quotes
 QUOTES = [
@@ -32,72 +46,168 @@ def send_expo_push(expo_token: str, title: str, body: str, data: dict = None):
     """
     Send a single push via Expo’s REST API.
     """
-    message = {
-        "to": expo_token,
-        "sound": "default",
-        "title": title,
-        "body": body,
-        "data": data or {},
-    }
-    resp = requests.post(
-        EXPO_PUSH_URL,
-        json=message,
-        headers={"Accept": "application/json", "Content-Type": "application/json"},
+    [result] = send_push_messages([PushMessage(expo_token, title, body, data or {})])
+    if not result.ok:
+        print(f"[Scheduler] Failed to send push to {expo_token}: {result.error or result.message}")
+
+
+def report_push_results(job: str, results: list[PushResult]) -> None:
+    """
+    Print a one-line summary of a push run, with counts per error code.
+    """
+    errors: dict[str, int] = {}
+    for result in results:
+        if not result.ok:
+            key = result.error or "RequestFailed"
+            errors[key] = errors.get(key, 0) + 1
+    sent = len(results) - sum(errors.values())
+    print(
+        f"[{datetime.now(timezone.utc)}] {job}: {sent}/{len(results)} pushes accepted"
+        + (f", errors: {errors}" if errors else "")
     )
-    if resp.status_code != 200:
-        print(
-            f"[Scheduler] Failed to send push to {expo_token}: "
-            f"{resp.status_code} → {resp.text}"
-        )
+
+
+def handle_push_results(session: Session, job: str, results: list[PushResult]) -> None:
+    """
+    Store the tickets of accepted pushes for the receipts job, drop tokens
+    Expo already rejected as unregistered, and print a summary.
+    """
+    record_push_tickets(
+        session=session,
+        tickets=[(r.ticket_id, r.to) for r in results if r.ok and r.ticket_id],
+    )
+    dead = [r.to for r in results if r.error == DEVICE_NOT_REGISTERED]
+    if dead:
+        delete_push_tokens(session=session, expo_tokens=dead)
+    report_push_results(job, results)
 
 
 def job_send_custom_reminders():
     """
-    Runs every minute: finds all due reminders, sends them, and marks them as sent.
+    Run by the ReminderDispatcher whenever a reminder falls due: claims due
+    reminders in batches and sends them. Each batch is claimed atomically
+    (see claim_due_custom_reminders), so every API worker can run this job
+    without sending a reminder twice.
     """
     with Session(engine) as session:
-        due_list = get_due_custom_reminders(session=session)
-        for reminder in due_list:
-            send_expo_push(
-                reminder.expo_token,
-                "⏰ Reminder",
-                reminder.message,
-                {"type": "custom_reminder", "reminder_id": str(reminder.id)},
+        while True:
+            claimed = claim_due_custom_reminders(
+                session=session, limit=settings.REMINDER_CLAIM_BATCH_SIZE
+            )
+            if not claimed:
+                return
+            results = send_push_messages(
+                PushMessage(
+                    reminder.expo_token,
+                    "⏰ Reminder",
+                    reminder.message,
+                    {"type": "custom_reminder", "reminder_id": str(reminder.id)},
+                )
+                for reminder in claimed
             )
-            mark_reminder_as_sent(session=session, reminder_id=reminder.id)
-            print(f"[{datetime.now(timezone.utc)}] Sent reminder {reminder.id}")
+            handle_push_results(session, "custom reminders", results)
+            if len(claimed) < settings.REMINDER_CLAIM_BATCH_SIZE:
+                return
+
+
+def iter_push_token_batches(batch_size: int) -> Iterator[list[str]]:
+    """
+    Yield every Expo token in batches, each read by its own keyset query
+    and short-lived session, so memory stays flat and no connection is
+    held between batches.
+    """
+    after = None
+    while True:
+        with Session(engine) as session:
+            rows = get_push_token_batch(session=session, after=after, limit=batch_size)
+        if not rows:
+            return
+        after = rows[-1][0]
+        yield [token for _, token in rows]
+        if len(rows) < batch_size:
+            return
 
 
 def job_send_quote_of_the_day():
     """
-    Runs once per day at 15:00 UTC: picks a random quote and sends it
-    to every Expo token in push_tokens.
+    Runs once per day at 15:00 UTC: picks a random quote and sends it to
+    every Expo token in push_tokens. Batches are spread evenly over
+    DAILY_QUOTE_WINDOW_MINUTES instead of going out in one burst.
     """
+    quote = random.choice(QUOTES)
+    title = "🌟 Motivation of the Day 🌟"
+    body = quote
+    batch_size = settings.DAILY_QUOTE_BATCH_SIZE
     with Session(engine) as session:
-        quote = random.choice(QUOTES)
-        title = "🌟 Motivation of the Day 🌟"
-        body = quote
-        tokens = session.exec(select(PushToken)).all()
-        for tok in tokens:
-            send_expo_push(tok.expo_token, title, body, {"type": "daily_quote"})
-        print(f"[{datetime.now(timezone.utc)}] Sent daily quote to {len(tokens)} users.")
+        total = count_push_tokens(session=session)
+    batches = max(1, -(-total // batch_size))
+    interval = settings.DAILY_QUOTE_WINDOW_MINUTES * 60 / batches
 
+    start = time.monotonic()
+    for index, tokens in enumerate(iter_push_token_batches(batch_size)):
+        # Batch i starts i intervals into the window
+        delay = start + index * interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        results = send_push_messages(
+            PushMessage(token, title, body, {"type": "daily_quote"}) for token in tokens
+        )
+        with Session(engine) as session:
+            handle_push_results(session, "daily quote", results)
 
-def start_scheduler():
+
+def job_check_push_receipts():
     """
-    Initialize APScheduler (non-blocking).  
-     - job_send_custom_reminders runs every minute
-     - job_send_quote_of_the_day runs daily at 15:00 UTC
+    Runs every 15 minutes: fetches the receipts of tickets old enough to
+    have one, records the outcomes, and deletes the tokens of devices that
+    are no longer registered, so later fan-outs only reach live devices.
     """
-    scheduler = BackgroundScheduler(timezone=timezone.utc)
-
-    scheduler.add_job(
-        job_send_custom_reminders,
-        CronTrigger(minute="*"),
-        id="custom_reminders",
-        replace_existing=True,
+    now = datetime.now(timezone.utc)
+    sent_before = now - timedelta(minutes=settings.EXPO_RECEIPT_DELAY_MINUTES)
+    checked = dead_tokens = 0
+    with Session(engine) as session:
+        after = None
+        while True:
+            tickets = get_unchecked_push_tickets(
+                session=session, sent_before=sent_before, after=after
+            )
+            if not tickets:
+                break
+            after = (tickets[-1].created_at, tickets[-1].id)
+            tokens = {ticket.id: ticket.expo_token for ticket in tickets}
+            receipts = get_push_receipts(tokens)
+            # Tickets without a receipt yet are retried on the next run
+            # until they expire below
+            record_push_receipts(
+                session=session,
+                receipts={
+                    ticket_id: (receipt.status, receipt.error)
+                    for ticket_id, receipt in receipts.items()
+                },
+            )
+            checked += len(receipts)
+            dead = [
+                tokens[ticket_id]
+                for ticket_id, receipt in receipts.items()
+                if receipt.error == DEVICE_NOT_REGISTERED and ticket_id in tokens
+            ]
+            dead_tokens += delete_push_tokens(session=session, expo_tokens=dead)
+        # Expo only keeps receipts for 24 hours
+        delete_push_tickets_before(session=session, created_before=now - timedelta(hours=24))
+    print(
+        f"[{datetime.now(timezone.utc)}] Checked {checked} push receipts, "
+        f"removed {dead_tokens} unregistered tokens."
     )
 
+
+def add_jobs(scheduler: BaseScheduler) -> None:
+    """
+    Register the periodic jobs:
+     - job_send_quote_of_the_day runs daily at 15:00 UTC
+     - job_check_push_receipts runs every 15 minutes
+    Custom reminders are sent by the ReminderDispatcher instead, at their
+    due time.
+    """
     scheduler.add_job(
         job_send_quote_of_the_day,
         CronTrigger(hour=15, minute=0),
@@ -105,8 +215,56 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    scheduler.add_job(
+        job_check_push_receipts,
+        CronTrigger(minute="*/15"),
+        id="push_receipts",
+        replace_existing=True,
+    )
+
+
+def create_reminder_dispatcher() -> ReminderDispatcher:
+    return ReminderDispatcher(engine=engine, dispatch=job_send_custom_reminders)
+
+
+def start_scheduler():
+    """
+    Initialize APScheduler and the reminder dispatcher (non-blocking)
+    inside the current process, e.g. an API worker.
+    """
+    scheduler = BackgroundScheduler(timezone=timezone.utc)
+    add_jobs(scheduler)
     scheduler.start()
+    create_reminder_dispatcher().start()
     print(
-        "Scheduler started: custom reminders (every minute), "
-        "daily quote (15:00 UTC)"
+        "Scheduler started: custom reminders (at their due time), "
+        "daily quote (15:00 UTC), push receipts (every 15 minutes)"
     )
+
+
+def run_scheduler():
+    """
+    Run the jobs in the foreground until interrupted. This is the entry
+    point of the dedicated job runner (`python -m app.scheduler`), which
+    keeps the jobs off the API workers' threads and connection pools.
+    """
+    scheduler = BlockingScheduler(timezone=timezone.utc)
+    add_jobs(scheduler)
+    dispatcher = create_reminder_dispatcher()
+    # Container runtimes stop processes with SIGTERM
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print("Scheduler process started")
+    dispatcher.start()
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        if scheduler.running:
+            scheduler.shutdown()
+        dispatcher.stop()
+    print("Scheduler process stopped")
+
+
+if __name__ == "__main__":
+    run_scheduler()
@@ -8,10 +8,11 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel, create_engine, delete
 from sqlalchemy.pool import StaticPool
 
+from app.core.cache import clear_all_caches
 from app.core.config import settings
 from app.core.db import init_db
 from app.main import app
-from app.models import Item, User, WorkoutPost, UserFollow, Workout, Exercise
+from app.models import Item, User, WorkoutPost, UserFollow, Workout, Exercise, FeedItem, PersonalBest, WorkoutStats, PushTicket, PushToken, CustomReminder
 from app.tests.utils.user import authentication_token_from_email
 from app.tests.utils.utils import get_superuser_token_headers
 from app.tests.utils.test_client import TestClientWrapper, get_test_client_wrapper
@@ -51,11 +52,12 @@ def db(test_engine) -> Generator[Session, None, None]:
         yield session
         
         # Clean up all test data after each test
-        for model in [Exercise, Workout, WorkoutPost, UserFollow, Item, User]:
+        for model in [Exercise, Workout, WorkoutStats, PersonalBest, PushTicket, PushToken, CustomReminder, FeedItem, WorkoutPost, UserFollow, Item, User]:
             statement = delete(model)
             session.execute(statement)
         
         session.commit()
+        clear_all_caches()
 
 
 @pytest.fixture(scope="function")
@@ -0,0 +1,49 @@
+import time
+
+from app.core.cache import Cache, MemoryCache, TaggedCache
+
+
+def test_memory_cache_evicts_least_recently_used() -> None:
+    cache = MemoryCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_memory_cache_expires_entries() -> None:
+    cache = MemoryCache(maxsize=10)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_zero_ttl_disables_cache() -> None:
+    cache = Cache("test-disabled", maxsize=10, ttl=0)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+
+
+def test_tagged_cache_invalidates_by_tag() -> None:
+    cache = TaggedCache("test-tagged", maxsize=10, ttl=60)
+    feed_key = cache.entry_key("feed", ["posts:1", "public"])
+    profile_key = cache.entry_key("profile", ["user:1"])
+    cache.set(feed_key, [1])
+    cache.set(profile_key, {"name": "a"})
+
+    cache.invalidate("public")
+
+    assert cache.get(cache.entry_key("feed", ["posts:1", "public"])) is None
+    assert cache.get(cache.entry_key("profile", ["user:1"])) == {"name": "a"}
+
+
+def test_tagged_cache_drops_values_computed_before_invalidation() -> None:
+    cache = TaggedCache("test-tagged-race", maxsize=10, ttl=60)
+    entry_key = cache.entry_key("feed", ["public"])
+    # A write lands while the value is being computed
+    cache.invalidate("public")
+    cache.set(entry_key, ["stale"])
+    assert cache.get(cache.entry_key("feed", ["public"])) is None
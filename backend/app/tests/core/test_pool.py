@@ -0,0 +1,35 @@
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.pool import TimedQueuePool, pool_status
+
+
+def _pool(**kwargs) -> TimedQueuePool:
+    return TimedQueuePool(lambda: sqlite3.connect(":memory:"), **kwargs)
+
+
+def test_pool_status_reports_occupancy() -> None:
+    pool = _pool(pool_size=2, max_overflow=1)
+    first = pool.connect()
+    second = pool.connect()
+    status = pool_status(pool)
+    assert status["checked_out"] == 2
+    assert status["checkouts"] == 2
+    first.close()
+    status = pool_status(pool)
+    assert status["checked_out"] == 1
+    assert status["idle"] == 1
+    second.close()
+
+
+def test_pool_records_timeouts() -> None:
+    pool = _pool(pool_size=1, max_overflow=0, timeout=0.01)
+    held = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    status = pool_status(pool)
+    assert status["timeouts"] == 1
+    assert status["wait_seconds_max"] >= 0.01
+    held.close()
@@ -0,0 +1,22 @@
+import threading
+
+import pytest
+
+from app.core import security
+from app.core.config import settings
+
+
+def test_hash_in_process_pool(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    hashed = security.get_password_hash("correct horse")
+    assert security.verify_password("correct horse", hashed)
+    assert not security.verify_password("wrong horse", hashed)
+
+
+def test_busy_hasher_rejects_work(monkeypatch) -> None:
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 1)
+    pending = threading.BoundedSemaphore(1)
+    pending.acquire()  # the only slot is taken
+    monkeypatch.setattr(security, "_pending", pending)
+    with pytest.raises(security.PasswordHasherBusy):
+        security.get_password_hash("correct horse")
@@ -0,0 +1,159 @@
+from sqlmodel import Session, delete, select
+
+from app import crud
+from app.core.config import settings
+from app.models import FeedItem, WorkoutPostUpdate
+from app.tests.utils.test_db import (
+    create_test_follow_relationship,
+    create_test_user,
+    create_test_workout_post,
+)
+from app.tests.utils.utils import random_email
+
+
+def _feed_titles(db: Session, user_id) -> list[str]:
+    posts, _ = crud.get_personal_feed_posts(session=db, user_id=user_id)
+    return [post.title for post in posts]
+
+
+def test_feed_contains_own_and_followed_posts(db: Session) -> None:
+    reader = create_test_user(db, email=random_email())
+    author = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=reader.id, followed_id=author.id)
+
+    create_test_workout_post(db, user_id=author.id, title="Author run")
+    create_test_workout_post(db, user_id=reader.id, title="Reader run")
+
+    posts, count = crud.get_personal_feed_posts(session=db, user_id=reader.id)
+    assert count == 2
+    assert [post.title for post in posts] == ["Reader run", "Author run"]
+
+
+def test_private_posts_require_mutual_follow(db: Session) -> None:
+    reader = create_test_user(db, email=random_email())
+    author = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=reader.id, followed_id=author.id)
+
+    post = create_test_workout_post(db, user_id=author.id, title="Private run")
+    crud.update_workout_post(
+        session=db, db_post=post, post_in=WorkoutPostUpdate(is_public=False)
+    )
+    assert "Private run" not in _feed_titles(db, reader.id)
+
+    # Following back makes the pair mutual and backfills the private post
+    create_test_follow_relationship(db, follower_id=author.id, followed_id=reader.id)
+    assert "Private run" in _feed_titles(db, reader.id)
+
+
+def test_unfollow_prunes_feed(db: Session) -> None:
+    reader = create_test_user(db, email=random_email())
+    author = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=reader.id, followed_id=author.id)
+    create_test_workout_post(db, user_id=author.id, title="Author run")
+
+    crud.unfollow_user(session=db, follower_id=reader.id, followed_id=author.id)
+    assert _feed_titles(db, reader.id) == []
+
+
+def test_exempt_author_is_read_at_query_time(db: Session, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 1)
+    author = create_test_user(db, email=random_email())
+    first = create_test_user(db, email=random_email())
+    second = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=first.id, followed_id=author.id)
+    create_test_follow_relationship(db, follower_id=second.id, followed_id=author.id)
+    db.refresh(author)
+    assert author.fanout_exempt
+
+    create_test_workout_post(db, user_id=author.id, title="Celebrity run")
+    fanned_out = db.exec(
+        select(FeedItem).where(FeedItem.owner_id.in_([first.id, second.id]))
+    ).all()
+    assert fanned_out == []
+    assert _feed_titles(db, first.id) == ["Celebrity run"]
+    assert _feed_titles(db, second.id) == ["Celebrity run"]
+
+
+def test_author_under_threshold_is_fanned_out_again(db: Session, monkeypatch) -> None:
+    monkeypatch.setattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 1)
+    author = create_test_user(db, email=random_email())
+    first = create_test_user(db, email=random_email())
+    second = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=first.id, followed_id=author.id)
+    create_test_follow_relationship(db, follower_id=second.id, followed_id=author.id)
+    create_test_follow_relationship(db, follower_id=author.id, followed_id=first.id)
+    create_test_workout_post(db, user_id=author.id, title="Public run")
+    private = create_test_workout_post(db, user_id=author.id, title="Private run")
+    crud.update_workout_post(
+        session=db, db_post=private, post_in=WorkoutPostUpdate(is_public=False)
+    )
+
+    crud.unfollow_user(session=db, follower_id=second.id, followed_id=author.id)
+    db.refresh(author)
+    assert not author.fanout_exempt
+    materialized = db.exec(
+        select(FeedItem.post_id).where(FeedItem.owner_id == first.id)
+    ).all()
+    assert len(materialized) == 2  # first is mutual, so the private post too
+
+
+def test_bulk_follows_update_feeds(db: Session) -> None:
+    reader = create_test_user(db, email=random_email())
+    friend = create_test_user(db, email=random_email())
+    author = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=friend.id, followed_id=reader.id)
+    create_test_workout_post(db, user_id=author.id, title="Author run")
+    private = create_test_workout_post(db, user_id=friend.id, title="Friend private run")
+    crud.update_workout_post(
+        session=db, db_post=private, post_in=WorkoutPostUpdate(is_public=False)
+    )
+    reader_private = create_test_workout_post(db, user_id=reader.id, title="Reader private run")
+    crud.update_workout_post(
+        session=db, db_post=reader_private, post_in=WorkoutPostUpdate(is_public=False)
+    )
+
+    crud.follow_users(session=db, follower_id=reader.id, followed_ids=[friend.id, author.id])
+    assert set(_feed_titles(db, reader.id)) == {
+        "Author run",
+        "Friend private run",
+        "Reader private run",
+    }
+    assert "Reader private run" in _feed_titles(db, friend.id)
+
+    crud.unfollow_users(session=db, follower_id=reader.id, followed_ids=[friend.id, author.id])
+    assert _feed_titles(db, reader.id) == ["Reader private run"]
+    assert "Reader private run" not in _feed_titles(db, friend.id)
+
+
+def test_backfill_feeds(db: Session) -> None:
+    reader = create_test_user(db, email=random_email())
+    author = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=reader.id, followed_id=author.id)
+    create_test_workout_post(db, user_id=author.id, title="Author run")
+    db.exec(delete(FeedItem))
+    db.commit()
+
+    inserted = crud.backfill_feeds(session=db, batch_size=1)
+    assert inserted == 2  # Author's own feed and the reader's feed
+    assert _feed_titles(db, reader.id) == ["Author run"]
+    assert crud.backfill_feeds(session=db) == 0
+
+
+def test_enrich_workout_posts(db: Session) -> None:
+    reader = create_test_user(db, email=random_email())
+    mutual = create_test_user(db, email=random_email())
+    followed = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=reader.id, followed_id=mutual.id)
+    create_test_follow_relationship(db, follower_id=mutual.id, followed_id=reader.id)
+    create_test_follow_relationship(db, follower_id=reader.id, followed_id=followed.id)
+    create_test_workout_post(db, user_id=reader.id, title="Own run")
+    create_test_workout_post(db, user_id=mutual.id, title="Mutual run")
+    create_test_workout_post(db, user_id=followed.id, title="Followed run")
+
+    posts, _ = crud.get_personal_feed_posts(session=db, user_id=reader.id)
+    enriched = crud.enrich_workout_posts(session=db, posts=posts, viewer_id=reader.id)
+    by_title = {post.title: post for post in enriched}
+    assert by_title["Own run"].is_mutual_follow
+    assert by_title["Mutual run"].is_mutual_follow
+    assert not by_title["Followed run"].is_mutual_follow
+    assert by_title["Mutual run"].user_full_name == mutual.full_name
@@ -0,0 +1,64 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.crud.pagination import decode_cursor, encode_cursor, next_cursor
+from app.tests.utils.test_db import create_test_user, create_test_workout_post
+from app.tests.utils.utils import random_email
+
+
+def test_cursor_round_trip() -> None:
+    sort_value = datetime(2025, 6, 1, 12, 30, 15, 123456)
+    row_id = uuid.uuid4()
+    cursor = decode_cursor(encode_cursor(sort_value, row_id))
+    assert cursor.sort_value == sort_value
+    assert cursor.id == row_id
+
+
+def test_decode_invalid_cursor() -> None:
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_cursor_pages_match_offset_pages(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    for i in range(5):
+        create_test_workout_post(db, user_id=user.id, title=f"Run {i}")
+
+    all_posts, count = crud.get_user_workout_posts(session=db, user_id=user.id)
+    assert count == 5
+
+    seen = []
+    cursor = None
+    while True:
+        posts, count = crud.get_user_workout_posts(
+            session=db,
+            user_id=user.id,
+            limit=2,
+            cursor=decode_cursor(cursor) if cursor else None,
+            include_count=False,
+        )
+        assert count is None
+        seen.extend(posts)
+        cursor = next_cursor(posts, 2)
+        if cursor is None:
+            break
+
+    assert [post.id for post in seen] == [post.id for post in all_posts]
+
+
+def test_personal_feed_cursor(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    for i in range(3):
+        create_test_workout_post(db, user_id=user.id, title=f"Run {i}")
+
+    first_page, _ = crud.get_personal_feed_posts(session=db, user_id=user.id, limit=2)
+    cursor = decode_cursor(next_cursor(first_page, 2))
+    second_page, _ = crud.get_personal_feed_posts(
+        session=db, user_id=user.id, limit=2, cursor=cursor
+    )
+    assert len(second_page) == 1
+    assert second_page[0].id not in {post.id for post in first_page}
@@ -0,0 +1,282 @@
+import uuid
+
+import pytest
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.crud import follow_graph
+from app.models import UserUpdate, WorkoutPostCreate
+from app.models.user import hash_email
+from app.tests.utils.test_db import (
+    create_test_follow_relationship,
+    create_test_user,
+    create_test_workout_post,
+)
+from app.tests.utils.utils import random_email
+
+
+def test_follow_counters_track_follows(db: Session) -> None:
+    follower = create_test_user(db, email=random_email())
+    followed = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=follower.id, followed_id=followed.id)
+    db.refresh(follower)
+    db.refresh(followed)
+    assert (follower.following_count, followed.follower_count) == (1, 1)
+
+    crud.unfollow_user(session=db, follower_id=follower.id, followed_id=followed.id)
+    db.refresh(follower)
+    db.refresh(followed)
+    assert (follower.following_count, followed.follower_count) == (0, 0)
+
+
+@pytest.mark.parametrize("use_counters", [True, False])
+def test_followers_with_stats(db: Session, monkeypatch, use_counters: bool) -> None:
+    monkeypatch.setattr(settings, "SOCIAL_STATS_USE_COUNTERS", use_counters)
+    viewer = create_test_user(db, email=random_email())
+    fan = create_test_user(db, email=random_email())
+    other = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=fan.id, followed_id=viewer.id)
+    create_test_follow_relationship(db, follower_id=other.id, followed_id=viewer.id)
+    create_test_follow_relationship(db, follower_id=viewer.id, followed_id=fan.id)
+    create_test_follow_relationship(db, follower_id=other.id, followed_id=fan.id)
+
+    followers, count = crud.get_followers_with_stats(
+        session=db, user_id=viewer.id, viewer_id=viewer.id
+    )
+    assert count == 2
+    by_id = {user["id"]: user for user in followers}
+    assert by_id[fan.id]["follower_count"] == 2
+    assert by_id[fan.id]["following_count"] == 1
+    assert by_id[fan.id]["is_following"]
+    assert by_id[other.id]["following_count"] == 2
+    assert not by_id[other.id]["is_following"]
+
+
+def test_search_users_includes_stats(db: Session) -> None:
+    viewer = create_test_user(db, email=random_email())
+    target = create_test_user(db, email=random_email(), full_name="Searchable Runner")
+    create_test_follow_relationship(db, follower_id=viewer.id, followed_id=target.id)
+
+    results, count = crud.search_users(
+        session=db, query="searchable runner", current_user_id=viewer.id
+    )
+    assert count == 1
+    assert results[0]["id"] == target.id
+    assert results[0]["follower_count"] == 1
+    assert results[0]["is_following"]
+
+
+def test_user_profile_cache_tracks_follows(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    fan = create_test_user(db, email=random_email())
+    assert crud.get_user_profile_cached(session=db, user_id=user.id).follower_count == 0
+
+    create_test_follow_relationship(db, follower_id=fan.id, followed_id=user.id)
+    assert crud.get_user_profile_cached(session=db, user_id=user.id).follower_count == 1
+    assert crud.get_user_profile_cached(session=db, user_id=fan.id).following_count == 1
+
+
+def test_user_workout_posts_cache_respects_privacy(db: Session) -> None:
+    author = create_test_user(db, email=random_email())
+    friend = create_test_user(db, email=random_email())
+    stranger = create_test_user(db, email=random_email())
+    create_test_follow_relationship(db, follower_id=author.id, followed_id=friend.id)
+    create_test_follow_relationship(db, follower_id=friend.id, followed_id=author.id)
+    crud.create_workout_post(
+        session=db,
+        post_in=WorkoutPostCreate(
+            title="Private", workout_type="Run", duration_minutes=20, is_public=False
+        ),
+        user_id=author.id,
+    )
+
+    def visible_to(viewer) -> int:
+        page = crud.get_user_workout_posts_page_cached(
+            session=db, user_id=author.id, viewer_id=viewer.id
+        )
+        return page.count
+
+    # Each relation class is cached separately
+    assert visible_to(friend) == 1
+    assert visible_to(stranger) == 0
+    assert visible_to(author) == 1
+
+    create_test_workout_post(db, user_id=author.id, title="Public")
+    assert visible_to(stranger) == 1
+    assert visible_to(friend) == 2
+
+
+def test_public_feed_cache(db: Session) -> None:
+    author = create_test_user(db, email=random_email())
+    viewer = create_test_user(db, email=random_email())
+    create_test_workout_post(db, user_id=author.id)
+
+    page = crud.get_public_feed_page_cached(session=db, viewer_id=viewer.id)
+    assert page.count == 1
+    assert not page.data[0].is_mutual_follow
+
+    # Follows don't invalidate the page, but the mutual flag is per viewer
+    create_test_follow_relationship(db, follower_id=author.id, followed_id=viewer.id)
+    create_test_follow_relationship(db, follower_id=viewer.id, followed_id=author.id)
+    page = crud.get_public_feed_page_cached(session=db, viewer_id=viewer.id)
+    assert page.data[0].is_mutual_follow
+
+    # Nor do renames, but a hit serves the author's current name
+    crud.update_user(session=db, db_user=author, user_in=UserUpdate(full_name="Renamed"))
+    page = crud.get_public_feed_page_cached(session=db, viewer_id=viewer.id)
+    assert page.data[0].user_full_name == "Renamed"
+
+    post = create_test_workout_post(db, user_id=author.id)
+    assert crud.get_public_feed_page_cached(session=db, viewer_id=viewer.id).count == 2
+    crud.delete_workout_post(session=db, post_id=post.id)
+    assert crud.get_public_feed_page_cached(session=db, viewer_id=viewer.id).count == 1
+
+
+def test_search_users_ranks_prefix_matches_first(db: Session) -> None:
+    viewer = create_test_user(db, email=random_email())
+    inner = create_test_user(db, email="amy.r@example.com", full_name="Amy Rowan")
+    prefix = create_test_user(db, email="r.ames@example.com", full_name="Rowan Ames")
+
+    results, count = crud.search_users(session=db, query="  ROWAN ", current_user_id=viewer.id)
+    assert count == 2
+    assert [r["id"] for r in results] == [prefix.id, inner.id]
+
+    # Too short for a substring match: prefixes only
+    results, _ = crud.search_users(session=db, query="ro", current_user_id=viewer.id)
+    assert [r["id"] for r in results] == [prefix.id]
+
+    # LIKE wildcards in the query are matched literally
+    _, count = crud.search_users(session=db, query="%", current_user_id=viewer.id)
+    assert count == 0
+
+
+def test_typeahead_users_shares_cached_prefixes(db: Session) -> None:
+    viewer = create_test_user(db, email="zed.viewer@example.com", full_name="Zed Viewer")
+    other = create_test_user(db, email="zed.other@example.com", full_name="Zed Other")
+
+    suggestions = crud.typeahead_users(session=db, query="Zed", viewer_id=viewer.id)
+    assert suggestions == [{"id": other.id, "full_name": "Zed Other"}]
+
+    # Served from the cache, with each viewer removed from their own results
+    crud.update_user(session=db, db_user=other, user_in=UserUpdate(full_name="Renamed"))
+    suggestions = crud.typeahead_users(session=db, query="zed", viewer_id=other.id)
+    assert suggestions == [{"id": viewer.id, "full_name": "Zed Viewer"}]
+
+
+def test_follow_graph_cache_tracks_follows(db: Session) -> None:
+    alice = create_test_user(db, email=random_email())
+    bob = create_test_user(db, email=random_email())
+    assert not crud.is_mutual_follow(session=db, user1_id=alice.id, user2_id=bob.id)
+
+    create_test_follow_relationship(db, follower_id=alice.id, followed_id=bob.id)
+    assert crud.is_following(session=db, follower_id=alice.id, followed_id=bob.id)
+    assert not crud.is_mutual_follow(session=db, user1_id=alice.id, user2_id=bob.id)
+
+    create_test_follow_relationship(db, follower_id=bob.id, followed_id=alice.id)
+    assert crud.is_mutual_follow(session=db, user1_id=alice.id, user2_id=bob.id)
+    # Both following sets are cached now; no further queries are needed
+    assert follow_graph.follow_graph_cache.get(follow_graph.following_key(alice.id)) == [
+        str(bob.id)
+    ]
+
+    crud.unfollow_user(session=db, follower_id=bob.id, followed_id=alice.id)
+    assert not crud.is_mutual_follow(session=db, user1_id=alice.id, user2_id=bob.id)
+
+
+def test_follow_graph_drops_sets_read_before_a_follow(db: Session) -> None:
+    alice = create_test_user(db, email=random_email())
+    bob = create_test_user(db, email=random_email())
+    # A reader resolves its key and reads the empty set, then a follow commits
+    # and invalidates before the reader stores what it read
+    stale_key = follow_graph.following_key(alice.id)
+    create_test_follow_relationship(db, follower_id=alice.id, followed_id=bob.id)
+    follow_graph.follow_graph_cache.set(stale_key, [])
+
+    assert crud.is_following(session=db, follower_id=alice.id, followed_id=bob.id)
+
+
+def test_follow_graph_skips_large_following_sets(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "FOLLOW_GRAPH_MAX_SET_SIZE", 1)
+    fan = create_test_user(db, email=random_email())
+    stars = [create_test_user(db, email=random_email()) for _ in range(2)]
+    for star in stars:
+        create_test_follow_relationship(db, follower_id=fan.id, followed_id=star.id)
+
+    assert follow_graph.get_following_ids(session=db, user_id=fan.id) is None
+    assert crud.is_following(session=db, follower_id=fan.id, followed_id=stars[1].id)
+    assert follow_graph.follow_graph_cache.get(follow_graph.following_key(fan.id)) is None
+
+
+def test_follow_users_in_bulk(db: Session) -> None:
+    follower = create_test_user(db, email=random_email())
+    already, new = (create_test_user(db, email=random_email()) for _ in range(2))
+    missing = uuid.uuid4()
+    create_test_follow_relationship(db, follower_id=follower.id, followed_id=already.id)
+
+    statuses = crud.follow_users(
+        session=db,
+        follower_id=follower.id,
+        followed_ids=[already.id, new.id, new.id, missing, follower.id],
+    )
+    assert statuses == {
+        already.id: "already_following",
+        new.id: "followed",
+        missing: "not_found",
+        follower.id: "self",
+    }
+    db.refresh(follower)
+    db.refresh(new)
+    assert follower.following_count == 2
+    assert new.follower_count == 1
+    assert crud.is_following(session=db, follower_id=follower.id, followed_id=new.id)
+
+    statuses = crud.unfollow_users(
+        session=db, follower_id=follower.id, followed_ids=[new.id, missing]
+    )
+    assert statuses == {new.id: "unfollowed", missing: "not_following"}
+    db.refresh(follower)
+    assert follower.following_count == 1
+    assert not crud.is_following(session=db, follower_id=follower.id, followed_id=new.id)
+
+
+def test_get_user_ids_by_email_hash(db: Session) -> None:
+    user = create_test_user(db, email="Contact.Match@example.com")
+    found = crud.get_user_ids_by_email_hash(
+        session=db,
+        email_hashes=[hash_email(" contact.match@EXAMPLE.com"), hash_email("nobody@example.com")],
+    )
+    assert found == {hash_email("contact.match@example.com"): user.id}
+
+
+def test_follow_suggestions_rank_friends_of_friends(db: Session) -> None:
+    user, friend1, friend2, popular, niche, followed = (
+        create_test_user(db, email=random_email()) for _ in range(6)
+    )
+    for follower, target in [
+        (user, friend1),
+        (user, friend2),
+        (user, followed),
+        (friend1, popular),
+        (friend2, popular),
+        (friend1, niche),
+        (friend1, followed),
+        (friend2, user),
+    ]:
+        create_test_follow_relationship(db, follower_id=follower.id, followed_id=target.id)
+
+    suggestions = crud.get_follow_suggestions(session=db, user_id=user.id)
+    assert [(s["id"], s["mutual_count"]) for s in suggestions] == [
+        (popular.id, 2),
+        (niche.id, 1),
+    ]
+
+    # Following a suggestion updates the cached list; unfollowing brings it back
+    create_test_follow_relationship(db, follower_id=user.id, followed_id=popular.id)
+    suggestions = crud.get_follow_suggestions(session=db, user_id=user.id)
+    assert [s["id"] for s in suggestions] == [niche.id]
+    crud.unfollow_user(session=db, follower_id=user.id, followed_id=popular.id)
+    suggestions = crud.get_follow_suggestions(session=db, user_id=user.id)
+    assert [s["id"] for s in suggestions] == [popular.id, niche.id]
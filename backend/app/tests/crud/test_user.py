@@ -1,8 +1,11 @@
+import bcrypt
 from fastapi.encoders import jsonable_encoder
-from sqlmodel import Session
+from sqlmodel import Session, update
 
 from app import crud
+from app.core.config import settings
 from app.core.security import verify_password
+from app.crud.user import user_cache
 from app.models import User, UserCreate, UserUpdate
 from app.tests.utils.utils import random_email, random_lower_string
 
@@ -26,6 +29,27 @@ def test_authenticate_user(db: Session) -> None:
     assert user.email == authenticated_user.email
 
 
+def test_authenticate_rehashes_other_cost(db: Session) -> None:
+    email = random_email()
+    password = random_lower_string()
+    user = crud.create_user(
+        session=db, user_create=UserCreate(email=email, password=password)
+    )
+    other_rounds = settings.BCRYPT_ROUNDS + 1
+    user.hashed_password = bcrypt.hashpw(
+        password.encode(), bcrypt.gensalt(other_rounds)
+    ).decode()
+    db.add(user)
+    db.commit()
+
+    authenticated_user = crud.authenticate(session=db, email=email, password=password)
+    assert authenticated_user
+    assert authenticated_user.hashed_password.startswith(
+        f"$2b${settings.BCRYPT_ROUNDS:02d}$"
+    )
+    assert verify_password(password, authenticated_user.hashed_password)
+
+
 def test_not_authenticate_user(db: Session) -> None:
     email = random_email()
     password = random_lower_string()
@@ -89,3 +113,60 @@ def test_update_user(db: Session) -> None:
     assert user_2
     assert user.email == user_2.email
     assert verify_password(new_password, user_2.hashed_password)
+
+
+def test_get_user_by_id_cached(db: Session) -> None:
+    user = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    user_id = user.id
+    assert crud.get_user_by_id_cached(session=db, user_id=user_id).id == user_id
+
+    # A change made behind the cache's back is not seen until invalidation
+    db.exec(update(User).where(User.id == user_id).values(full_name="Renamed"))
+    db.commit()
+    db.expunge_all()
+    cached = crud.get_user_by_id_cached(session=db, user_id=user_id)
+    assert cached.full_name != "Renamed"
+
+    db.expunge_all()
+    crud.invalidate_cached_user(user_id)
+    assert crud.get_user_by_id_cached(session=db, user_id=user_id).full_name == "Renamed"
+
+
+def test_update_user_invalidates_cache(db: Session) -> None:
+    user = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    crud.get_user_by_id_cached(session=db, user_id=user.id)
+    user_id = user.id
+    crud.update_user(session=db, db_user=user, user_in=UserUpdate(full_name="New name"))
+    db.expunge_all()
+    assert crud.get_user_by_id_cached(session=db, user_id=user_id).full_name == "New name"
+
+
+def test_cached_user_keeps_column_types(db: Session) -> None:
+    user = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    crud.get_user_by_id_cached(session=db, user_id=user.id)
+    cached = crud.get_cached_user(user.id)
+    assert cached.id == user.id
+
+
+def test_password_hash_is_not_cached(db: Session) -> None:
+    user = crud.create_user(
+        session=db,
+        user_create=UserCreate(email=random_email(), password=random_lower_string()),
+    )
+    user_id, hashed_password = user.id, user.hashed_password
+    crud.get_user_by_id_cached(session=db, user_id=user_id)
+    assert "hashed_password" not in user_cache.get(str(user_id))
+
+    # Read from the database once the cached user is attached
+    db.expunge_all()
+    cached = crud.get_user_by_id_cached(session=db, user_id=user_id)
+    assert cached.hashed_password == hashed_password
@@ -0,0 +1,228 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, select
+
+from app import crud, crudFuncs
+from app.core.config import settings
+from app.crud.workout import (
+    workouts_public,
+    workouts_statement,
+    workouts_with_exercises_statement,
+)
+from app.models import (
+    Exercise,
+    ExerciseCreate,
+    PersonalBest,
+    PersonalBestCreate,
+    Workout,
+    WorkoutCreate,
+    WorkoutStats,
+)
+from app.tests.utils.test_db import create_test_user
+from app.tests.utils.utils import random_email
+
+
+def _bench_pb(value: float) -> PersonalBestCreate:
+    return PersonalBestCreate(
+        exercise_name="Bench Press",
+        metric_type="strength",
+        metric_value=value,
+        date_achieved=None,
+    )
+
+
+def test_create_workout_with_exercises(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    workout_in = WorkoutCreate(
+        name="Push day",
+        exercises=[
+            ExerciseCreate(name="Bench Press", category="strength", sets=3, reps=5, weight=80),
+            ExerciseCreate(name="Push-ups", category="strength", sets=3, reps=20),
+        ],
+    )
+
+    created = crud.create_workout(
+        session=db,
+        workout_in=workout_in,
+        user_id=user.id,
+        personal_bests=[_bench_pb(1200), _bench_pb(900)],
+    )
+
+    assert created.name == "Push day"
+    assert [ex.name for ex in created.exercises] == ["Bench Press", "Push-ups"]
+    stored = db.exec(select(Exercise).where(Exercise.workout_id == created.id)).all()
+    assert {ex.id for ex in stored} == {ex.id for ex in created.exercises}
+    pbs = db.exec(select(PersonalBest).where(PersonalBest.user_id == user.id)).all()
+    assert [(pb.exercise_name, pb.metric_value) for pb in pbs] == [("Bench Press", 1200)]
+
+
+def test_create_workout_keeps_better_personal_best(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    workout_in = WorkoutCreate(name="Bench")
+    crud.create_workout(
+        session=db, workout_in=workout_in, user_id=user.id, personal_bests=[_bench_pb(1000)]
+    )
+    crud.create_workout(
+        session=db, workout_in=workout_in, user_id=user.id, personal_bests=[_bench_pb(800)]
+    )
+    pb = db.exec(select(PersonalBest).where(PersonalBest.user_id == user.id)).one()
+    assert pb.metric_value == 1000
+
+
+def test_upsert_personal_bests_is_keyed_on_metric_type(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    cardio = PersonalBestCreate(
+        exercise_name="Bench Press", metric_type="cardio", metric_value=5, date_achieved=None
+    )
+
+    changed = crudFuncs.upsert_personal_bests(
+        session=db, user_id=user.id, pbs_in=[_bench_pb(1000), cardio]
+    )
+    assert {(pb.metric_type, pb.metric_value) for pb in changed} == {
+        ("strength", 1000),
+        ("cardio", 5),
+    }
+
+    # Only the improved row comes back
+    changed = crudFuncs.upsert_personal_bests(
+        session=db, user_id=user.id, pbs_in=[_bench_pb(1100), cardio]
+    )
+    db.commit()
+    assert [(pb.metric_type, pb.metric_value) for pb in changed] == [("strength", 1100)]
+    pbs = db.exec(select(PersonalBest).where(PersonalBest.user_id == user.id)).all()
+    assert len(pbs) == 2
+
+
+def test_update_personal_bests_after_workout(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    workout_in = WorkoutCreate(
+        name="Leg day",
+        exercises=[
+            ExerciseCreate(name="Squat", category="strength", sets=5, reps=5, weight=100),
+            ExerciseCreate(name="Stretching", category="mobility", sets=1, reps=1),
+        ],
+    )
+    created = crud.create_workout(session=db, workout_in=workout_in, user_id=user.id)
+    workout = db.get(Workout, created.id)
+
+    crudFuncs.update_personal_bests_after_workout(
+        session=db,
+        workout=workout,
+        tracked_exercises={"squat": {"type": "strength"}},
+    )
+    db.commit()
+
+    pb = db.exec(select(PersonalBest).where(PersonalBest.user_id == user.id)).one()
+    assert (pb.exercise_name, pb.metric_type, pb.metric_value) == ("Squat", "strength", 2500)
+
+
+def _stats_row(db: Session, user_id) -> WorkoutStats:
+    db.expire_all()
+    return db.get(WorkoutStats, user_id)
+
+
+@pytest.mark.parametrize("use_rollup", [True, False])
+def test_get_workout_stats(db: Session, monkeypatch: pytest.MonkeyPatch, use_rollup: bool) -> None:
+    monkeypatch.setattr(settings, "WORKOUT_STATS_USE_ROLLUP", use_rollup)
+    user = create_test_user(db, email=random_email())
+    upcoming = datetime.utcnow() + timedelta(days=1)
+    crud.create_workout(
+        session=db,
+        workout_in=WorkoutCreate(name="A", duration_minutes=30, scheduled_date=upcoming),
+        user_id=user.id,
+    )
+    crud.create_workout(
+        session=db, workout_in=WorkoutCreate(name="B", duration_minutes=45), user_id=user.id
+    )
+    crud.create_workout(session=db, workout_in=WorkoutCreate(name="C"), user_id=user.id)
+
+    assert crud.get_workout_stats(session=db, user_id=user.id) == {
+        "total_workouts": 3,
+        "completed_workouts": 0,
+        "scheduled_workouts": 1,
+        "total_duration_minutes": 75,
+        "average_duration_minutes": 37.5,
+    }
+
+
+def test_workout_stats_rollup_tracks_changes(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    created = crud.create_workout(
+        session=db, workout_in=WorkoutCreate(name="A", duration_minutes=30), user_id=user.id
+    )
+    crud.create_workout(session=db, workout_in=WorkoutCreate(name="B"), user_id=user.id)
+    stats = _stats_row(db, user.id)
+    assert (stats.total_workouts, stats.timed_workouts, stats.total_duration_minutes) == (2, 1, 30)
+
+    workout = db.get(Workout, created.id)
+    before = crud.workout_stats_contribution(workout)
+    workout.is_completed = True
+    workout.duration_minutes = 50
+    crud.adjust_workout_stats(
+        session=db,
+        user_id=user.id,
+        before=before,
+        after=crud.workout_stats_contribution(workout),
+    )
+    db.commit()
+    stats = _stats_row(db, user.id)
+    assert (stats.completed_workouts, stats.total_duration_minutes) == (1, 50)
+
+    workout = db.get(Workout, created.id)
+    crud.adjust_workout_stats(
+        session=db, user_id=user.id, before=crud.workout_stats_contribution(workout)
+    )
+    db.delete(workout)
+    db.commit()
+    stats = _stats_row(db, user.id)
+    assert (stats.total_workouts, stats.completed_workouts, stats.timed_workouts) == (1, 0, 0)
+    assert crud.get_workout_stats(session=db, user_id=user.id)["total_workouts"] == 1
+
+
+def test_workouts_with_exercises_statement(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    for name in ["Old", "Mid", "New"]:
+        crud.create_workout(
+            session=db,
+            workout_in=WorkoutCreate(
+                name=name,
+                exercises=[ExerciseCreate(name="Squat", category="strength")],
+            ),
+            user_id=user.id,
+        )
+    db.expire_all()
+    workouts = db.exec(select(Workout).where(Workout.user_id == user.id)).all()
+    created = {w.name: w.created_at for w in workouts}
+    db.expire_all()
+
+    page = db.exec(
+        workouts_with_exercises_statement(
+            user_id=user.id, start=created["Mid"], end=created["New"]
+        )
+    ).all()
+
+    assert [w.name for w in page] == ["Mid"]
+    # Exercises were loaded with the page, not lazily on access
+    assert "exercises" in page[0].__dict__
+    assert [ex.name for ex in page[0].exercises] == ["Squat"]
+
+
+def test_workouts_statement_includes_exercise_counts(db: Session) -> None:
+    user = create_test_user(db, email=random_email())
+    crud.create_workout(
+        session=db,
+        workout_in=WorkoutCreate(
+            name="Full",
+            exercises=[
+                ExerciseCreate(name="Squat", category="strength"),
+                ExerciseCreate(name="Plank", category="core"),
+            ],
+        ),
+        user_id=user.id,
+    )
+    crud.create_workout(session=db, workout_in=WorkoutCreate(name="Empty"), user_id=user.id)
+
+    workouts = workouts_public(db.exec(workouts_statement(user_id=user.id)).all())
+
+    assert {w.name: w.exercise_count for w in workouts} == {"Full": 2, "Empty": 0}
@@ -0,0 +1,195 @@
+import json
+from datetime import datetime, timedelta, timezone
+import threading
+import time
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from sqlmodel import Session, select
+
+from app.crudFuncs import (
+    count_push_tokens,
+    delete_push_tokens,
+    get_push_token_batch,
+    get_unchecked_push_tickets,
+    record_push_receipts,
+    record_push_tickets,
+)
+from app.models import PushTicket, PushToken
+from app.push import PushClient, PushMessage, TokenBucket
+from app.tests.utils.user import create_random_user
+
+
+class ExpoStub(BaseHTTPRequestHandler):
+    """
+    Minimal stand-in for Expo's push and receipts endpoints. Tokens and
+    ticket ids containing "dead" get DeviceNotRegistered, ids containing
+    "pending" have no receipt yet; the first `fail_next` requests get a 503.
+    """
+
+    batches: list[list[dict[str, Any]]] = []
+    fail_next = 0
+
+    def do_POST(self) -> None:
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = type(self)
+        if cls.fail_next:
+            cls.fail_next -= 1
+            self._reply(503, {"errors": [{"code": "UNAVAILABLE"}]})
+            return
+        if self.path.endswith("/getReceipts"):
+            self._reply(200, {"data": self._receipts(payload["ids"])})
+            return
+        cls.batches.append(payload)
+        tickets = []
+        for message in payload:
+            if "dead" in message["to"]:
+                tickets.append(
+                    {
+                        "status": "error",
+                        "message": "not a registered push notification recipient",
+                        "details": {"error": "DeviceNotRegistered"},
+                    }
+                )
+            else:
+                tickets.append({"status": "ok", "id": f"ticket-{message['to']}"})
+        self._reply(200, {"data": tickets})
+
+    @staticmethod
+    def _receipts(ticket_ids: list[str]) -> dict[str, Any]:
+        receipts: dict[str, Any] = {}
+        for ticket_id in ticket_ids:
+            if "pending" in ticket_id:
+                continue
+            if "dead" in ticket_id:
+                receipts[ticket_id] = {
+                    "status": "error",
+                    "details": {"error": "DeviceNotRegistered"},
+                }
+            else:
+                receipts[ticket_id] = {"status": "ok"}
+        return receipts
+
+    def _reply(self, status: int, body: dict[str, Any]) -> None:
+        raw = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def expo_url() -> Generator[str, None, None]:
+    ExpoStub.batches = []
+    ExpoStub.fail_next = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ExpoStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/push/send"
+    server.shutdown()
+    server.server_close()
+
+
+def test_push_client_sends_batches_of_100(expo_url: str) -> None:
+    client = PushClient(url=expo_url, concurrency=3, rate_per_second=0)
+    messages = [PushMessage(f"token-{i}", "t", "b") for i in range(250)]
+    messages[7].to = "dead-token"
+
+    results = client.send(messages)
+    client.close()
+
+    assert sorted(len(batch) for batch in ExpoStub.batches) == [50, 100, 100]
+    assert [r.to for r in results] == [m.to for m in messages]
+    assert results[0].ok and results[0].ticket_id == "ticket-token-0"
+    assert not results[7].ok and results[7].error == "DeviceNotRegistered"
+    assert sum(r.ok for r in results) == 249
+
+
+def test_push_client_retries_unavailable(expo_url: str) -> None:
+    ExpoStub.fail_next = 1
+    client = PushClient(url=expo_url, rate_per_second=0, max_retries=1)
+    [result] = client.send([PushMessage("token", "t", "b")])
+    client.close()
+    assert result.ok
+
+
+def test_token_bucket_limits_rate() -> None:
+    bucket = TokenBucket(rate=100, capacity=10)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire(10)
+    # The first 10 are the initial burst, the next 20 take 0.2s to refill
+    assert time.monotonic() - start >= 0.18
+
+
+def test_push_client_gets_receipts(expo_url: str) -> None:
+    receipts_url = expo_url.replace("/push/send", "/push/getReceipts")
+    client = PushClient(url=expo_url, receipts_url=receipts_url, rate_per_second=0)
+    receipts = client.get_receipts(["ticket-a", "ticket-dead", "ticket-pending"])
+    client.close()
+
+    assert set(receipts) == {"ticket-a", "ticket-dead"}
+    assert receipts["ticket-a"].ok
+    assert receipts["ticket-dead"].error == "DeviceNotRegistered"
+
+
+def test_push_receipts_prune_unregistered_tokens(db: Session) -> None:
+    db.add_all(
+        [
+            PushToken(user_id=create_random_user(db).id, expo_token="token-live"),
+            PushToken(user_id=create_random_user(db).id, expo_token="token-dead"),
+        ]
+    )
+    db.commit()
+    record_push_tickets(
+        session=db,
+        tickets=[("ticket-live", "token-live"), ("ticket-dead", "token-dead")],
+    )
+
+    # Nothing is due until the receipt delay has passed
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert get_unchecked_push_tickets(session=db, sent_before=past) == []
+    later = datetime.now(timezone.utc) + timedelta(minutes=1)
+    tickets = get_unchecked_push_tickets(session=db, sent_before=later)
+    assert [t.id for t in tickets] == ["ticket-dead", "ticket-live"]
+    after = (tickets[0].created_at, tickets[0].id)
+    assert len(get_unchecked_push_tickets(session=db, sent_before=later, after=after)) == 1
+
+    record_push_receipts(
+        session=db,
+        receipts={
+            "ticket-live": ("ok", None),
+            "ticket-dead": ("error", "DeviceNotRegistered"),
+        },
+    )
+    assert get_unchecked_push_tickets(session=db, sent_before=later) == []
+    assert db.get(PushTicket, "ticket-dead").receipt_error == "DeviceNotRegistered"
+
+    assert delete_push_tokens(session=db, expo_tokens=["token-dead"]) == 1
+    remaining = db.exec(select(PushToken.expo_token)).all()
+    assert remaining == ["token-live"]
+
+
+def test_push_token_batches_page_by_id(db: Session) -> None:
+    for i in range(5):
+        db.add(PushToken(user_id=create_random_user(db).id, expo_token=f"token-{i}"))
+    db.commit()
+
+    assert count_push_tokens(session=db) == 5
+    batches, after = [], None
+    while batch := get_push_token_batch(session=db, after=after, limit=2):
+        batches.append(batch)
+        after = batch[-1][0]
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    ids = [token_id for batch in batches for token_id, _ in batch]
+    assert ids == sorted(ids)
+    assert {token for batch in batches for _, token in batch} == {
+        f"token-{i}" for i in range(5)
+    }
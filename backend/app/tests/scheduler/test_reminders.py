@@ -0,0 +1,69 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import Session
+
+from app.crudFuncs import claim_due_custom_reminders, schedule_custom_reminder
+from app.models import CustomReminder
+from app.reminders import ReminderDispatcher
+from app.tests.utils.user import create_random_user
+
+
+def test_claim_due_custom_reminders(db: Session) -> None:
+    user = create_random_user(db)
+    now = datetime.now(timezone.utc)
+    due = [
+        schedule_custom_reminder(
+            session=db,
+            user_id=user.id,
+            expo_token="token",
+            remind_time=now - timedelta(minutes=i + 1),
+            message=f"due {i}",
+        )
+        for i in range(3)
+    ]
+    future = schedule_custom_reminder(
+        session=db,
+        user_id=user.id,
+        expo_token="token",
+        remind_time=now + timedelta(hours=1),
+        message="later",
+    )
+
+    # Oldest first, in batches, and each reminder only once
+    first = claim_due_custom_reminders(session=db, limit=2)
+    assert {r.message for r in first} == {"due 2", "due 1"}
+    assert all(r.sent_at is not None for r in first)
+    second = claim_due_custom_reminders(session=db, limit=2)
+    assert [r.id for r in second] == [due[0].id]
+    assert claim_due_custom_reminders(session=db, limit=2) == []
+
+    assert db.get(CustomReminder, future.id).sent_at is None
+
+
+def test_reminder_dispatcher_wakes_at_due_time(db: Session) -> None:
+    user = create_random_user(db)
+    fired = threading.Event()
+    due_at = datetime.now(timezone.utc) + timedelta(seconds=0.3)
+    schedule_custom_reminder(
+        session=db,
+        user_id=user.id,
+        expo_token="token",
+        remind_time=due_at,
+        message="soon",
+    )
+    dispatcher = ReminderDispatcher(
+        engine=db.get_bind(), dispatch=fired.set, window_seconds=60
+    )
+    dispatcher.start()
+    try:
+        assert fired.wait(2)
+        assert datetime.now(timezone.utc) >= due_at
+
+        # A reminder scheduled later is picked up without waiting for the
+        # window to be reloaded
+        fired.clear()
+        dispatcher.notify(datetime.now(timezone.utc) + timedelta(seconds=0.1))
+        assert fired.wait(1)
+    finally:
+        dispatcher.stop()
@@ -7,9 +7,9 @@ from typing import Dict, List, Type, Any, Optional
 
 from sqlmodel import Session, SQLModel, select
 
-from app.models import User, Item, WorkoutPost, UserFollow, Workout, Exercise
+from app.models import User, Item, WorkoutPost, UserFollow, Workout, Exercise, FeedItem, PersonalBest, WorkoutStats
 from app.models.user import UserCreate
-from app.crud import create_user
+from app.crud import create_user, create_workout_post, follow_user
 
 
 def create_test_db_and_tables(engine):
@@ -19,7 +19,7 @@ def create_test_db_and_tables(engine):
 
 def clear_test_db(db: Session):
     """Clear all data from the test database."""
-    for model in [Exercise, Workout, WorkoutPost, UserFollow, Item, User]:
+    for model in [Exercise, Workout, WorkoutStats, PersonalBest, FeedItem, WorkoutPost, UserFollow, Item, User]:
         db.exec(f"DELETE FROM {model.__tablename__}")
     db.commit()
 
@@ -50,21 +50,17 @@ def create_test_workout_post(
     calories_burned: Optional[int] = 300,
     description: Optional[str] = "Test workout description"
 ) -> WorkoutPost:
-    """Create a test workout post in the database."""
-    from app.models.social import WorkoutPost
+    """Create a test workout post in the database (fanned out to follower feeds)."""
+    from app.models.social import WorkoutPostCreate
     
-    workout_post = WorkoutPost(
-        user_id=user_id,
+    post_in = WorkoutPostCreate(
         title=title,
         workout_type=workout_type,
         duration_minutes=duration_minutes,
         calories_burned=calories_burned,
         description=description
     )
-    db.add(workout_post)
-    db.commit()
-    db.refresh(workout_post)
-    return workout_post
+    return create_workout_post(session=db, post_in=post_in, user_id=user_id)
 
 
 def create_test_follow_relationship(
@@ -72,15 +68,8 @@ def create_test_follow_relationship(
     follower_id: str, 
     followed_id: str
 ) -> UserFollow:
-    """Create a test follow relationship in the database."""
-    follow = UserFollow(
-        follower_id=follower_id,
-        followed_id=followed_id
-    )
-    db.add(follow)
-    db.commit()
-    db.refresh(follow)
-    return follow
+    """Create a test follow relationship in the database (backfilling feeds)."""
+    return follow_user(session=db, follower_id=follower_id, followed_id=followed_id)
 
 
 def get_test_object_count(db: Session, model: Type[SQLModel]) -> int:
@@ -0,0 +1,83 @@
+"""
+Measure how many password verifications (i.e. logins) one API worker can
+sustain, and how much they slow down unrelated requests.
+
+Run from the backend directory with the usual settings in the environment:
+
+    python scripts/benchmark_password_hashing.py --rounds 12 --workers 2
+
+--workers 0 hashes in the request threads, as the app did before hashing
+moved to a process pool.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost factor")
+    parser.add_argument(
+        "--workers", type=int, default=2, help="hashing processes (0 = inline)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=40,
+        help="concurrent request threads (Starlette's default threadpool size)",
+    )
+    parser.add_argument("--logins", type=int, default=200, help="logins to run")
+    args = parser.parse_args()
+
+    # Settings are read at import time
+    os.environ["BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_MAX_PENDING"] = str(args.logins)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from app.core.security import get_password_hash, verify_password
+
+    hashed = get_password_hash("benchmark-password")
+    verify_password("benchmark-password", hashed)  # warm up the process pool
+
+    # A cheap request running alongside the logins, to show their effect on
+    # the latency of everything else served by the worker
+    probe_latencies = []
+    done = False
+
+    def probe() -> None:
+        while not done:
+            start = time.perf_counter()
+            sum(range(10_000))
+            probe_latencies.append(time.perf_counter() - start)
+            time.sleep(0.005)
+
+    with ThreadPoolExecutor(max_workers=args.threads + 1) as pool:
+        probe_future = pool.submit(probe)
+        start = time.perf_counter()
+        results = list(
+            pool.map(
+                lambda _: verify_password("benchmark-password", hashed),
+                range(args.logins),
+            )
+        )
+        elapsed = time.perf_counter() - start
+        done = True
+        probe_future.result()
+
+    assert all(results)
+    print(f"bcrypt rounds:        {args.rounds}")
+    print(f"hashing processes:    {args.workers or 'inline'}")
+    print(f"logins:               {args.logins} in {elapsed:.2f}s")
+    print(f"logins/sec/worker:    {args.logins / elapsed:.1f}")
+    if probe_latencies:
+        probe_latencies.sort()
+        p99 = probe_latencies[int(len(probe_latencies) * 0.99) - 1]
+        print(f"other request median: {statistics.median(probe_latencies) * 1000:.2f}ms")
+        print(f"other request p99:    {p99 * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()